@@ -0,0 +1,50 @@
+"""
+Natural deduction for propositional logic, classical and intuitionistic.
+
+    from naturaldeduction import LogicRules, Resolver, parse_formula
+
+Names are loaded on first use. Importing the package loads nothing; the first core name
+(formulas, parser, Contexto, Paso, Resolver) loads the core, and the heavier parts (the
+prover, the SAT solver, the truth tables and their NumPy backend, G4ip, the proof files)
+are only imported when one of their names is. `python -m naturaldeduction` is the
+command line front end (see cli.py).
+"""
+import importlib
+
+_EXPORTS = {
+    'formulas': ('AND', 'BOTTOM', 'IMPLIES', 'NEG', 'OR', 'VAR', 'Prop', 'clear_render_cache',
+                 'formula_table_size', 'pretty_print', 'write_formula'),
+    'rules': ('REGLAS_CLASICAS', 'RULES_BY_TOKEN', 'LogicMode', 'LogicRules', 'reglasPermitidas'),
+    'parser': ('parse_formula', 'parse_formula_list', 'parse_many', 'parse_sequent'),
+    'contexto': ('ContextIndex', 'Contexto'),
+    'proof': ('REGLAS_CON_TESTIGOS', 'Paso', 'PasosView', 'ProofStore', 'Suggestion', 'esReglaAplicable',
+              'suggest'),
+    'resolver': ('Checkpoint', 'PrintObserver', 'ProofRenderer', 'Resolver', 'RuleEvent', 'RuleObserver',
+                 'RuleOutcome'),
+    'proof_script': ('ProofScript', 'check', 'parse_script', 'replay', 'testigos_for', 'to_script'),
+    'prover': ('ProofSearchTimeout', 'Prover', 'build_resolver', 'prove'),
+    'normalize': ('LemmaCache', 'normalize_resolver', 'proof_tree'),
+    'sat': ('entails',),
+    'truth_table': ('check_validity', 'is_classically_valid'),
+    'g4ip': ('is_intuitionistically_valid',),
+    'proof_file': ('ProofLibrary',),
+    'limits': ('TaskTimeout', 'time_limit'),
+    'instrumentation': ('JsonTraceObserver', 'RuleStats'),
+}
+_MODULES = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = sorted(_MODULES)
+
+
+def __getattr__(name: str):
+    module = _MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    # La próxima vez el nombre se encuentra sin pasar por acá
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *_MODULES})
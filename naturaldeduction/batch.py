@@ -0,0 +1,192 @@
+"""
+Batch prover / checker over JSON-lines files of sequents.
+
+Every input line is one JSON object:
+
+    {"contexto": ["P → Q", "P"], "resolvente": "Q"}      (prove)
+    {"script": "P → Q, P ⊢ Q\\n0 →E P\\n1 Axiom\\n2 Axiom"}  (check)
+
+and every output line reports one of them, in completion order:
+
+    {"line": 1, "status": "proved", "steps": 3, "time": 0.0004}
+
+The input is streamed in chunks of lines that are fanned out to a process pool. Lines
+travel to the workers as the raw JSON text (the most compact encoding we have, and it
+keeps all parsing in the workers) and only the small result records come back.
+
+Usage:
+    python -m naturaldeduction.batch prove sequents.jsonl -o results.jsonl --workers 8 --timeout 5
+    python -m naturaldeduction.batch check proofs.jsonl
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from .limits import TaskTimeout, time_limit
+from .parser import parse_formula
+from .proof_script import replay, to_script
+from .prover import ProofSearchTimeout, Prover
+from .rules import LogicMode
+
+PROVED = "proved"
+FAILED = "failed"
+TIMEOUT = "timeout"
+ERROR = "error"
+
+Chunk = Tuple[int, List[str]]
+
+
+def _text_field(record: dict, name: str) -> str:
+    value = record[name]
+    if not isinstance(value, str):
+        raise TypeError(f"'{name}' must be a string, got {type(value).__name__}")
+    return value
+
+
+def _prove_record(record: dict, options: dict) -> dict:
+    contexto = record.get('contexto', [])
+    if not isinstance(contexto, list) or not all(isinstance(formula, str) for formula in contexto):
+        raise TypeError("'contexto' must be a list of strings")
+    contexto = [parse_formula(formula) for formula in contexto]
+    resolvente = parse_formula(_text_field(record, 'resolvente'))
+    prover = Prover(tiempo_max=options['timeout'], max_nodos=options['max_nodes'],
+                    clasico=options['clasico'])
+    resolver = prover.prove(contexto, resolvente)
+    if resolver is None:
+        return {"status": FAILED}
+    result = {"status": PROVED, "steps": len(resolver.lista_de_pasos)}
+    if options['emit_proofs']:
+        result["script"] = to_script(resolver)
+    return result
+
+
+def _check_record(record: dict, options: dict) -> dict:
+    modo = LogicMode.CLASSICAL if options['clasico'] else LogicMode.INTUITIONISTIC
+    resolver = replay(_text_field(record, 'script'), modo)
+    status = PROVED if resolver.isProofComplete() else FAILED
+    return {"status": status, "steps": len(resolver.lista_de_pasos)}
+
+
+_HANDLERS = {'prove': _prove_record, 'check': _check_record}
+
+
+def run_chunk(mode: str, chunk: Chunk, options: dict) -> List[dict]:
+    """
+    Processes one chunk of raw input lines. Runs inside the worker processes.
+    """
+    handler = _HANDLERS[mode]
+    first_line, lines = chunk
+    results = []
+    for line_number, line in enumerate(lines, start=first_line):
+        if not line.strip():
+            continue
+        start = time.perf_counter()
+        try:
+            # El límite duro queda por encima del presupuesto propio del prover
+            with time_limit(options['timeout'] and options['timeout'] * 1.5):
+                record = json.loads(line)
+                if not isinstance(record, dict):
+                    raise TypeError(f"expected a JSON object, got {type(record).__name__}")
+                result = handler(record, options)
+        except (ProofSearchTimeout, TaskTimeout):
+            result = {"status": TIMEOUT}
+        except Exception as e:
+            # Una línea mala se reporta en su registro; nunca corta el resto de la corrida
+            result = {"status": ERROR, "error": f"{type(e).__name__}: {e}"}
+        result["line"] = line_number
+        result["time"] = round(time.perf_counter() - start, 6)
+        results.append(result)
+    return results
+
+
+def _chunks(lines: Iterable[str], size: int) -> Iterator[Chunk]:
+    lines = iter(lines)
+    first_line = 1
+    while True:
+        chunk = list(islice(lines, size))
+        if not chunk:
+            return
+        yield first_line, chunk
+        first_line += len(chunk)
+
+
+def run_batch(mode: str, source: Iterable[str], sink: TextIO, workers: int = 0,
+              chunk_size: int = 64, timeout: Optional[float] = 10.0, max_nodes: int = 200_000,
+              clasico: bool = True, emit_proofs: bool = False) -> Dict[str, int]:
+    """
+    Runs every line of `source` through the prover ('prove') or the proof checker
+    ('check') and writes one JSON result per line into `sink` as soon as its chunk
+    finishes. With `workers=0` everything runs in this process.
+
+    Returns:
+        dict: The number of results per status.
+    """
+    if mode not in _HANDLERS:
+        raise ValueError(f"unknown mode {mode!r}, expected one of {sorted(_HANDLERS)}")
+    options = {'timeout': timeout, 'max_nodes': max_nodes, 'clasico': clasico,
+               'emit_proofs': emit_proofs}
+    totals = {PROVED: 0, FAILED: 0, TIMEOUT: 0, ERROR: 0}
+
+    def write(results: List[dict]) -> None:
+        for result in results:
+            totals[result["status"]] += 1
+            sink.write(json.dumps(result, ensure_ascii=False) + "\n")
+
+    if workers == 0:
+        for chunk in _chunks(source, chunk_size):
+            write(run_chunk(mode, chunk, options))
+        return totals
+
+    # Pocos chunks en vuelo por worker: la entrada se lee a medida que se procesa
+    max_in_flight = workers * 4
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for chunk in _chunks(source, chunk_size):
+            pending.add(pool.submit(run_chunk, mode, chunk, options))
+            if len(pending) >= max_in_flight:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    write(future.result())
+        for future in pending:
+            write(future.result())
+    return totals
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Prove or check a JSON-lines file of sequents in parallel.")
+    parser.add_argument('mode', choices=sorted(_HANDLERS))
+    parser.add_argument('input', help="JSON-lines input file ('-' for stdin)")
+    parser.add_argument('-o', '--output', default='-', help="JSON-lines output file ('-' for stdout)")
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 1,
+                        help="worker processes (0 runs everything in this process)")
+    parser.add_argument('--chunk-size', type=int, default=64, help="lines per task")
+    parser.add_argument('--timeout', type=float, default=10.0, help="seconds per sequent")
+    parser.add_argument('--max-nodes', type=int, default=200_000, help="search nodes per sequent")
+    parser.add_argument('--intuitionistic', action='store_true', help="prove and check in intuitionistic logic (no ¬¬E, LEM or PBC)")
+    parser.add_argument('--emit-proofs', action='store_true', help="include the proof script of proved sequents")
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8')
+    sink = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    start = time.perf_counter()
+    try:
+        totals = run_batch(args.mode, source, sink, workers=args.workers, chunk_size=args.chunk_size,
+                           timeout=args.timeout, max_nodes=args.max_nodes,
+                           clasico=not args.intuitionistic, emit_proofs=args.emit_proofs)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+    summary = ', '.join(f"{status}: {count}" for status, count in totals.items())
+    print(f"{summary} ({time.perf_counter() - start:.2f}s)", file=sys.stderr)
+    return 0 if totals[ERROR] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,550 @@
+"""
+Benchmarks for the hot paths of the project over generated, scalable formula families.
+
+Every benchmark is timed at several sizes (best of a few repeats, with the number of
+loops picked by `timeit`), reports its throughput and its peak memory (measured in a
+separate run under tracemalloc), and gets a scaling exponent: the slope of log(time)
+against log(size), so ~1 is linear and ~2 quadratic. The "startup" benchmarks time a
+fresh interpreter running the command line front end, so a change that makes it import
+more than it needs shows up in `--compare`.
+
+Usage:
+    python -m naturaldeduction bench                        # all benchmarks, table on stdout
+    python -m naturaldeduction bench --quick -k parse       # small sizes, names containing 'parse'
+    python -m naturaldeduction bench -o run.json            # save the results as JSON
+    python -m naturaldeduction bench --compare base.json    # exit 1 if anything got slower than base
+"""
+import argparse
+import io
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+import timeit
+import tracemalloc
+from contextlib import redirect_stdout
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from .contexto import Contexto
+from .formulas import AND, BOTTOM, IMPLIES, NEG, OR, VAR, Prop, clear_render_cache, pretty_print
+from .parser import parse_formula
+from .proof import Paso, esReglaAplicable, suggest
+from .resolver import Resolver
+from .rules import LogicRules
+
+# --- Formula families ---
+
+def deep_and(n: int) -> Prop:
+    """A0 ∧ A1 ∧ ... ∧ An-1, nested to the left as the parser builds it."""
+    formula = VAR("A0")
+    for i in range(1, n):
+        formula = AND(formula, VAR(f"A{i}"))
+    return formula
+
+
+def deep_or(n: int) -> Prop:
+    """A0 ∨ A1 ∨ ... ∨ An-1, nested to the left."""
+    formula = VAR("A0")
+    for i in range(1, n):
+        formula = OR(formula, VAR(f"A{i}"))
+    return formula
+
+
+def right_implications(n: int) -> Prop:
+    """A0 → (A1 → ... → An-1)."""
+    formula = VAR(f"A{n - 1}")
+    for i in range(n - 2, -1, -1):
+        formula = IMPLIES(VAR(f"A{i}"), formula)
+    return formula
+
+
+def pigeonhole(n: int) -> Tuple[List[Prop], Prop]:
+    """n + 1 pigeons in n holes: the context is classically inconsistent."""
+    def p(i: int, j: int) -> Prop:
+        return VAR(f"p{i}_{j}")
+    contexto = []
+    for i in range(n + 1):
+        somewhere = p(i, 0)
+        for j in range(1, n):
+            somewhere = OR(somewhere, p(i, j))
+        contexto.append(somewhere)
+    for j in range(n):
+        for i in range(n + 1):
+            for k in range(i + 1, n + 1):
+                contexto.append(NEG(AND(p(i, j), p(k, j))))
+    return contexto, BOTTOM()
+
+
+def _iff(a: Prop, b: Prop) -> Prop:
+    return AND(IMPLIES(a, b), IMPLIES(b, a))
+
+
+def de_bruijn(n: int) -> Prop:
+    """
+    De Bruijn's formula over 2n + 1 variables arranged in a cycle: if any two
+    neighbours being equivalent forces every variable, every variable holds. Valid in
+    intuitionistic logic.
+    """
+    m = 2 * n + 1
+    atoms = [VAR(f"p{i}") for i in range(m)]
+    conclusion = atoms[0]
+    for atom in atoms[1:]:
+        conclusion = AND(conclusion, atom)
+    premises = None
+    for i in range(m):
+        premise = IMPLIES(_iff(atoms[i], atoms[(i + 1) % m]), conclusion)
+        premises = premise if premises is None else AND(premises, premise)
+    return IMPLIES(premises, conclusion)
+
+
+def wide_context(n: int) -> Tuple[List[Prop], Prop]:
+    """n atoms plus n implications Ai → Bi; the goal is the last Bi."""
+    contexto = [VAR(f"A{i}") for i in range(n)]
+    contexto += [IMPLIES(VAR(f"A{i}"), VAR(f"B{i}")) for i in range(n)]
+    return contexto, VAR(f"B{n - 1}")
+
+
+FAMILIES = {
+    'deep_and': deep_and,
+    'deep_or': deep_or,
+    'right_implications': right_implications,
+    'pigeonhole': pigeonhole,
+    'de_bruijn': de_bruijn,
+    'wide_context': wide_context,
+}
+
+
+def _subformulas(formula: Prop) -> List[Prop]:
+    seen = {}
+    stack = [formula]
+    while stack:
+        node = stack.pop()
+        if node in seen:
+            continue
+        seen[node] = None
+        stack.extend(getattr(node, field) for field in node._fields if field != 'name')
+    return list(seen)
+
+
+# --- Benchmarks ---
+
+# Una preparación devuelve la función a medir y cuántas operaciones hace cada llamada
+Prepared = Tuple[Callable[[], object], int]
+
+
+@dataclass
+class Benchmark:
+    name: str
+    family: str
+    sizes: Tuple[int, ...]
+    quick_sizes: Tuple[int, ...]
+    prepare: Callable[[int], Prepared]
+
+
+BENCHMARKS: Dict[str, Benchmark] = {}
+
+_FORMULA_SIZES = (100, 1_000, 10_000, 100_000)
+_FORMULA_QUICK = (100, 1_000, 10_000)
+
+
+def benchmark(name: str, family: str, sizes: Sequence[int] = _FORMULA_SIZES,
+              quick_sizes: Sequence[int] = _FORMULA_QUICK):
+    def register(prepare: Callable[[int], Prepared]) -> Callable[[int], Prepared]:
+        BENCHMARKS[name] = Benchmark(name, family, tuple(sizes), tuple(quick_sizes), prepare)
+        return prepare
+    return register
+
+
+def _register_parse(family: str) -> None:
+    @benchmark(f"parse_formula/{family}", family)
+    def prepare(n: int) -> Prepared:
+        # La fórmula no se conserva: cada parseo vuelve a construir (e internar) los nodos
+        text = pretty_print(FAMILIES[family](n), minimal=True)
+        return (lambda: parse_formula(text)), n
+
+
+def _register_pretty_print(family: str, minimal: bool) -> None:
+    suffix = "_minimal" if minimal else ""
+    @benchmark(f"pretty_print{suffix}/{family}", family)
+    def prepare(n: int) -> Prepared:
+        formula = FAMILIES[family](n)
+        def run():
+            clear_render_cache()  # medir el render en frío, sin la caché
+            return pretty_print(formula, minimal)
+        return run, n
+
+
+for _family in ('deep_and', 'deep_or', 'right_implications'):
+    _register_parse(_family)
+    _register_pretty_print(_family, minimal=False)
+    _register_pretty_print(_family, minimal=True)
+
+
+@benchmark("intern_lookup/deep_and", "deep_and")
+def _prepare_intern(n: int) -> Prepared:
+    # Reconstruir una fórmula viva: cada constructor encuentra el nodo en la tabla
+    formula = deep_and(n)
+    def run():
+        rebuilt = deep_and(n)
+        assert rebuilt is formula
+    return run, n
+
+
+@benchmark("hash_eq/deep_and", "deep_and")
+def _prepare_hash_eq(n: int) -> Prepared:
+    nodes = _subformulas(deep_and(n))
+    shifted = nodes[1:] + nodes[:1]
+    def run():
+        for a, b in zip(nodes, shifted):
+            hash(a)
+            a == a
+            a == b
+    return run, len(nodes)
+
+
+_CONTEXT_SIZES = (10, 100, 1_000, 10_000)
+_CONTEXT_QUICK = (10, 100, 1_000)
+
+
+@benchmark("paso/wide_context", "wide_context", _CONTEXT_SIZES, _CONTEXT_QUICK)
+def _prepare_paso(n: int) -> Prepared:
+    contexto, goal = wide_context(n)
+    return (lambda: Paso(contexto, goal)), 1
+
+
+@benchmark("esReglaAplicable/wide_context", "wide_context", _CONTEXT_SIZES, _CONTEXT_QUICK)
+def _prepare_aplicable(n: int) -> Prepared:
+    contexto, goal = wide_context(n)
+    pasos = [Paso(contexto, goal), Paso(contexto, NEG(goal)), Paso(contexto, AND(goal, goal)),
+             Paso(contexto, OR(goal, NEG(goal))), Paso(contexto, IMPLIES(goal, goal))]
+    reglas = list(LogicRules)
+    def run():
+        for paso in pasos:
+            for regla in reglas:
+                esReglaAplicable(paso, regla)
+    return run, len(pasos) * len(reglas)
+
+
+@benchmark("suggest/wide_context", "wide_context", _CONTEXT_SIZES, _CONTEXT_QUICK)
+def _prepare_suggest(n: int) -> Prepared:
+    # Cada paso extiende el contexto con una asunción nueva, como lo hace →I. Las celdas
+    # se crean en cada llamada: una celda nueva todavía no tiene su índice y lo arma
+    # sobre el de `base`, que ya está indexado
+    contexto, goal = wide_context(n)
+    base = Contexto(contexto)
+    base.rule_index
+    nuevas = [VAR(f"C{i}") for i in range(10)]
+    def run():
+        for prop in nuevas:
+            suggest(Paso(base.extend(prop), goal))
+    return run, len(nuevas)
+
+
+def _record_proof(contexto: List[Prop], goal: Prop) -> List[Tuple[int, LogicRules]]:
+    """
+    Proves `goal` with Axiom, ∧I and →I only, and returns the applied (step, rule) pairs.
+    """
+    resolver = Resolver(contexto, goal)
+    aplicados = []
+    idx = 0
+    while idx < len(resolver.lista_de_pasos):
+        paso = resolver.lista_de_pasos[idx][0]
+        if paso.isInTheContext(paso.resolvente):
+            regla = LogicRules.AXIOM
+        elif type(paso.resolvente) is AND:
+            regla = LogicRules.AND_INTRODUCTION
+        else:
+            regla = LogicRules.IMPLICATION_INTRODUCTION
+        if not resolver.aplicarRegla(idx, regla):
+            raise RuntimeError(f"cannot apply {regla.value} to step {idx}")
+        aplicados.append((idx, regla))
+        idx += 1
+    return aplicados
+
+
+def _proof_workload(family: str, n: int) -> Tuple[List[Prop], Prop]:
+    if family == 'deep_and':
+        return [VAR(f"A{i}") for i in range(n)], deep_and(n)
+    return [VAR(f"A{n - 1}")], right_implications(n)
+
+
+_PROOF_SIZES = (100, 1_000, 10_000)
+_PROOF_QUICK = (100, 1_000)
+
+
+def _register_aplicar(family: str) -> None:
+    @benchmark(f"aplicarRegla/{family}", family, _PROOF_SIZES, _PROOF_QUICK)
+    def prepare(n: int) -> Prepared:
+        contexto, goal = _proof_workload(family, n)
+        aplicados = _record_proof(contexto, goal)
+        def run():
+            resolver = Resolver(contexto, goal)
+            for idx, regla in aplicados:
+                resolver.aplicarRegla(idx, regla)
+        return run, len(aplicados)
+
+
+def _register_mostrar(family: str) -> None:
+    @benchmark(f"mostrar_prueba/{family}", family, (10, 100, 1_000), (10, 100))
+    def prepare(n: int) -> Prepared:
+        contexto, goal = _proof_workload(family, n)
+        resolver = Resolver(contexto, goal)
+        for idx, regla in _record_proof(contexto, goal):
+            resolver.aplicarRegla(idx, regla)
+        def run():
+            with redirect_stdout(io.StringIO()):
+                resolver.mostrar_prueba()
+        return run, len(resolver.lista_de_pasos)
+
+
+def _register_session(family: str) -> None:
+    # Una sesión interactiva: cada regla aplicada va seguida de mostrar los cambios
+    @benchmark(f"render_session/{family}", family, (10, 100, 1_000), (10, 100))
+    def prepare(n: int) -> Prepared:
+        contexto, goal = _proof_workload(family, n)
+        aplicados = _record_proof(contexto, goal)
+        def run():
+            resolver = Resolver(contexto, goal)
+            with redirect_stdout(io.StringIO()):
+                resolver.mostrar_prueba()
+                for idx, regla in aplicados:
+                    resolver.aplicarRegla(idx, regla)
+                    resolver.mostrar_prueba(solo_cambios=True)
+        return run, len(aplicados)
+
+
+@benchmark("render_window/deep_and", "deep_and", (1_000, 10_000, 50_000), (1_000, 10_000))
+def _prepare_render_window(n: int) -> Prepared:
+    # Tras cada regla se pide una página de 50 filas del árbol y del layout de Fitch
+    contexto, goal = _proof_workload('deep_and', n)
+    aplicados = _record_proof(contexto, goal)
+    resolver = Resolver(contexto, goal)
+    for idx, regla in aplicados[:-1]:
+        resolver.aplicarRegla(idx, regla)
+    renderer = resolver.renderer
+    ultimo = aplicados[-1]
+    def run():
+        resolver.aplicarRegla(*ultimo)
+        renderer.tree(0, 50)
+        renderer.fitch(0, 50)
+        resolver.undo()
+    return run, 1
+
+
+@benchmark("render_tree_session/right_implications", "right_implications", (100, 1_000, 5_000), (100, 1_000))
+def _prepare_render_tree_session(n: int) -> Prepared:
+    # La vista de árbol queda abierta: cada regla inserta sus hijos en el orden ya armado
+    contexto, goal = _proof_workload('right_implications', n)
+    aplicados = _record_proof(contexto, goal)
+    def run():
+        resolver = Resolver(contexto, goal)
+        renderer = resolver.renderer
+        for idx, regla in aplicados:
+            resolver.aplicarRegla(idx, regla)
+            renderer.tree(0, 0)
+    return run, len(aplicados)
+
+
+@benchmark("normalize/right_implications", "right_implications", (100, 1_000, 5_000), (100, 1_000))
+def _prepare_normalize(n: int) -> Prepared:
+    # Cada →I de la prueba va dentro de un desvío ∧E1/∧I con sus dos premisas
+    # compartidas: 2^n pasos como árbol, 3n nodos como DAG
+    from .normalize import normalize
+    contexto, goal = _proof_workload('right_implications', n)
+    proof = (LogicRules.AXIOM, (), ())
+    metas = []
+    while type(goal) is IMPLIES:
+        metas.append(goal)
+        goal = goal.conclusion
+    for meta in reversed(metas):
+        intro = (LogicRules.IMPLICATION_INTRODUCTION, (), (proof,))
+        proof = (LogicRules.AND_ELIMINATION_1, (meta,), ((LogicRules.AND_INTRODUCTION, (), (intro, intro)),))
+    return (lambda: normalize(contexto, metas[0], proof)), n
+
+
+for _family in ('deep_and', 'right_implications'):
+    _register_aplicar(_family)
+    _register_mostrar(_family)
+    _register_session(_family)
+
+
+@benchmark("sat_entails/pigeonhole", "pigeonhole", (4, 5, 6, 7), (4, 5))
+def _prepare_sat(n: int) -> Prepared:
+    from .sat import entails
+    contexto, goal = pigeonhole(n)
+    return (lambda: entails(contexto, goal)), 1
+
+
+@benchmark("truth_table/deep_or", "deep_or", (8, 12, 16, 20), (8, 12, 16))
+def _prepare_truth_table(n: int) -> Prepared:
+    from .truth_table import is_classically_valid
+    goal = deep_or(n)
+    return (lambda: is_classically_valid([], goal)), 1
+
+
+@benchmark("g4ip/de_bruijn", "de_bruijn", (1, 2, 3, 4), (1, 2))
+def _prepare_g4ip(n: int) -> Prepared:
+    from .g4ip import is_intuitionistically_valid
+    goal = de_bruijn(n)
+    return (lambda: is_intuitionistically_valid([], goal)), 1
+
+
+def _register_startup(name: str, args: Sequence[str], stdin: bytes = b"") -> None:
+    # Un intérprete nuevo por llamada: mide lo que espera quien usa la línea de comandos
+    @benchmark(f"startup/{name}", "startup", (1,), (1,))
+    def prepare(n: int) -> Prepared:
+        command = [sys.executable, *args]
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        def run():
+            subprocess.run(command, input=stdin, cwd=root, stdout=subprocess.DEVNULL, check=True)
+        return run, 1
+
+
+_register_startup("python", ["-c", "pass"])
+_register_startup("help", ["-m", "naturaldeduction", "--help"])
+_register_startup("import_core", ["-c", "from naturaldeduction import Resolver"])
+_register_startup("check", ["-m", "naturaldeduction", "check", "-"], "P → Q, P ⊢ Q\n0 →E P\n1 Axiom\n2 Axiom\n".encode())
+_register_startup("prove", ["-m", "naturaldeduction", "prove", "P → Q, P ⊢ Q"])
+
+
+# --- Runner ---
+
+def _time(run: Callable[[], object], repeat: int, min_time: float) -> float:
+    # Como Timer.autorange, pero hasta `min_time`; la calibración cuenta como una repetición
+    timer = timeit.Timer(run)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time:
+            break
+        number = max(number + 1, math.ceil(number * min_time * 1.2 / max(elapsed, 1e-9)))
+    return min([elapsed, *timer.repeat(repeat=repeat - 1, number=number)]) / number
+
+
+def _peak_memory(run: Callable[[], object]) -> int:
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        run()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _scaling_exponent(points: List[dict]) -> Optional[float]:
+    # Pendiente por mínimos cuadrados de log(tiempo) contra log(tamaño)
+    if len(points) < 2:
+        return None
+    xs = [math.log(p["size"]) for p in points]
+    ys = [math.log(p["seconds"]) for p in points]
+    mx, my = sum(xs) / len(xs), sum(ys) / len(ys)
+    sxx = sum((x - mx) ** 2 for x in xs)
+    if sxx == 0:
+        return None
+    return round(sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / sxx, 3)
+
+
+def run_benchmarks(names: Optional[Sequence[str]] = None, quick: bool = False,
+                   repeat: int = 5, min_time: float = 0.2, log: Optional[io.TextIOBase] = None) -> dict:
+    """
+    Runs the selected benchmarks (all by default) and returns the report that
+    `--output` saves and `compare` reads.
+    """
+    results = {}
+    for name, bench in BENCHMARKS.items():
+        if names is not None and name not in names:
+            continue
+        points = []
+        for size in (bench.quick_sizes if quick else bench.sizes):
+            run, ops = bench.prepare(size)
+            seconds = _time(run, repeat, min_time)
+            point = {"size": size, "seconds": seconds, "ops": ops,
+                     "ops_per_second": ops / seconds, "peak_bytes": _peak_memory(run)}
+            points.append(point)
+            if log is not None:
+                log.write(f"{name:<42} {size:>8} {seconds * 1e3:>12.3f} ms {point['ops_per_second']:>14,.0f} ops/s"
+                          f" {point['peak_bytes'] / 1024:>12,.1f} KiB\n")
+                log.flush()
+        results[name] = {"family": bench.family, "points": points,
+                         "scaling_exponent": _scaling_exponent(points)}
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "quick": quick,
+        },
+        "results": results,
+    }
+
+
+def compare(baseline: dict, current: dict, tolerance: float = 0.25,
+            min_delta: float = 1e-4) -> List[str]:
+    """
+    Returns one message per (benchmark, size) measured in both reports that is more
+    than `tolerance` (a fraction) and more than `min_delta` seconds slower in `current`.
+    The absolute floor keeps timer noise on microsecond-sized points out of the gate.
+    """
+    regressions = []
+    for name, result in current["results"].items():
+        old = baseline["results"].get(name)
+        if old is None:
+            continue
+        old_times = {p["size"]: p["seconds"] for p in old["points"]}
+        for point in result["points"]:
+            before = old_times.get(point["size"])
+            if before and point["seconds"] > before * (1 + tolerance) and point["seconds"] - before > min_delta:
+                regressions.append(f"{name} at size {point['size']}: {before * 1e3:.3f} ms -> "
+                                   f"{point['seconds'] * 1e3:.3f} ms ({point['seconds'] / before:.2f}x)")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the natural deduction hot paths.")
+    parser.add_argument('-k', '--filter', action='append', default=[],
+                        help="only run benchmarks whose name contains this text (repeatable)")
+    parser.add_argument('--quick', action='store_true', help="smaller sizes and fewer repeats")
+    parser.add_argument('-o', '--output', help="write the results as JSON to this file")
+    parser.add_argument('--compare', metavar='BASELINE', help="JSON results to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="allowed slowdown against the baseline, as a fraction (default 0.25)")
+    parser.add_argument('--min-delta', type=float, default=1e-4,
+                        help="ignore slowdowns smaller than this many seconds (default 0.0001)")
+    parser.add_argument('--list', action='store_true', help="list the benchmarks and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name, bench in BENCHMARKS.items():
+            print(f"{name:<42} sizes {', '.join(map(str, bench.sizes))}")
+        return 0
+
+    names = None
+    if args.filter:
+        names = [name for name in BENCHMARKS if any(text in name for text in args.filter)]
+    report = run_benchmarks(names, quick=args.quick, repeat=3 if args.quick else 5,
+                            min_time=0.05 if args.quick else 0.2, log=sys.stdout)
+    for name, result in report["results"].items():
+        if result['scaling_exponent'] is not None:
+            print(f"{name:<42} scaling exponent {result['scaling_exponent']}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, report, args.tolerance, args.min_delta)
+        for message in regressions:
+            print(f"REGRESSION {message}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
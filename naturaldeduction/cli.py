@@ -0,0 +1,124 @@
+"""
+Command line front end.
+
+    python -m naturaldeduction                              # interactive session
+    python -m naturaldeduction check proof.txt other.txt    # check proof scripts
+    python -m naturaldeduction prove "P → Q, P ⊢ Q"         # find a proof, print its script
+    python -m naturaldeduction bench --quick -k parse       # benchmarks (see bench.py)
+
+Every subcommand imports only what it uses: `--help` needs nothing but argparse, and
+`check` does not load the prover. The batch prover and the session server have their
+own entry points, `python -m naturaldeduction.batch` and `python -m naturaldeduction.server`.
+"""
+import argparse
+import sys
+from typing import List, Optional
+
+_VIEWS = ('script', 'flat', 'tree', 'fitch')
+
+
+def _interactive(args: argparse.Namespace) -> int:
+    from .interactive import main as session
+    session()
+    return 0
+
+
+def _check(args: argparse.Namespace) -> int:
+    from .proof_script import replay
+    from .rules import LogicMode
+
+    modo = LogicMode.INTUITIONISTIC if args.intuitionistic else LogicMode.CLASSICAL
+    failures = 0
+    for path in args.scripts:
+        try:
+            if path == '-':
+                resolver = replay(sys.stdin, modo)
+            else:
+                with open(path, encoding='utf-8') as f:
+                    resolver = replay(f, modo)
+        except (OSError, ValueError) as e:
+            print(f"{path}: error: {e}")
+            failures += 1
+            continue
+        if resolver.isProofComplete():
+            print(f"{path}: ok ({len(resolver.pasos)} steps)")
+        else:
+            print(f"{path}: incomplete, open steps {sorted(resolver.pasos_a_resolver)}")
+            failures += 1
+    return 1 if failures else 0
+
+
+def _prove(args: argparse.Namespace) -> int:
+    from .parser import parse_sequent
+    from .prover import ProofSearchTimeout, Prover
+
+    try:
+        contexto, resolvente = parse_sequent(args.sequent)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    lemas = None
+    if args.lemmas is not None:
+        from .normalize import LemmaCache
+        lemas = LemmaCache(args.lemmas)
+    prover = Prover(tiempo_max=args.timeout, max_nodos=args.max_nodes,
+                    clasico=not args.intuitionistic, lemas=lemas)
+    try:
+        resolver = prover.prove(contexto, resolvente)
+    except ProofSearchTimeout as e:
+        print(f"timeout: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if lemas is not None:
+            lemas.close()
+    if resolver is None:
+        print("no proof found", file=sys.stderr)
+        return 1
+    if args.view == 'script':
+        from .proof_script import to_script
+        sys.stdout.write(to_script(resolver))
+    else:
+        for line in resolver.renderer.render(args.view):
+            print(line)
+    return 0
+
+
+def _bench(args: argparse.Namespace, extra: List[str]) -> int:
+    from .bench import main as bench
+    return bench(extra)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="naturaldeduction",
+                                     description="Natural deduction proofs for propositional logic.")
+    commands = parser.add_subparsers(dest='command', metavar='command')
+    commands.add_parser('interactive', help="build a proof step by step (the default)")
+
+    check = commands.add_parser('check', help="check proof scripts")
+    check.add_argument('scripts', nargs='+', help="proof script files ('-' reads stdin)")
+    check.add_argument('--intuitionistic', action='store_true', help="without the classical rules")
+
+    prove = commands.add_parser('prove', help="search a proof of a sequent")
+    prove.add_argument('sequent', help="the sequent, as 'Γ ⊢ σ' (or 'Γ |- σ')")
+    prove.add_argument('--intuitionistic', action='store_true', help="without the classical rules")
+    prove.add_argument('--timeout', type=float, default=10.0, help="seconds of search")
+    prove.add_argument('--max-nodes', type=int, default=200_000, help="search nodes")
+    prove.add_argument('--lemmas', metavar='PATH', help="lemma cache file to use and extend")
+    prove.add_argument('--view', choices=_VIEWS, default='script', help="how to print the proof")
+
+    commands.add_parser('bench', help="run the benchmarks (options as in bench.py)", add_help=False)
+
+    args, extra = parser.parse_known_args(argv)
+    if args.command == 'bench':
+        return _bench(args, extra)
+    if extra:
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    if args.command == 'check':
+        return _check(args)
+    if args.command == 'prove':
+        return _prove(args)
+    return _interactive(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,419 @@
+"""
+Persistent contexts of assumptions and the indexes the rules look them up with.
+"""
+from typing import Iterable, Iterator, Union
+
+from .formulas import AND, BOTTOM, IMPLIES, NEG, OR, Prop
+
+# --- Persistent Hash Trie ---
+# Conjunto persistente (HAMT): cada inserción copia a lo sumo un nodo de 32 entradas
+# por nivel y comparte el resto con la versión anterior.
+_HAMT_BITS = 5
+_HAMT_MASK = (1 << _HAMT_BITS) - 1
+_HASH_BITS = 64
+_HASH_MASK = (1 << _HASH_BITS) - 1
+
+
+class _HamtNode:
+    __slots__ = ('bitmap', 'entries')
+
+    def __init__(self, bitmap: int, entries: tuple):
+        self.bitmap = bitmap
+        self.entries = entries
+
+
+class _HamtCollision:
+    # Elementos distintos con los mismos 64 bits de hash
+    __slots__ = ('items',)
+
+    def __init__(self, items: tuple):
+        self.items = items
+
+
+_EMPTY_HAMT = _HamtNode(0, ())
+
+
+def _hamt_contains(node: _HamtNode, h: int, item) -> bool:
+    shift = 0
+    while True:
+        bit = 1 << ((h >> shift) & _HAMT_MASK)
+        if not node.bitmap & bit:
+            return False
+        entry = node.entries[(node.bitmap & (bit - 1)).bit_count()]
+        entry_type = type(entry)
+        if entry_type is _HamtNode:
+            node = entry
+            shift += _HAMT_BITS
+        elif entry_type is _HamtCollision:
+            return item in entry.items
+        else:
+            return entry is item or entry == item
+
+
+def _hamt_pair(a, ha: int, b, hb: int, shift: int):
+    if shift >= _HASH_BITS:
+        return _HamtCollision((a, b))
+    index_a = (ha >> shift) & _HAMT_MASK
+    index_b = (hb >> shift) & _HAMT_MASK
+    if index_a == index_b:
+        return _HamtNode(1 << index_a, (_hamt_pair(a, ha, b, hb, shift + _HAMT_BITS),))
+    entries = (a, b) if index_a < index_b else (b, a)
+    return _HamtNode((1 << index_a) | (1 << index_b), entries)
+
+
+def _hamt_insert(node: _HamtNode, h: int, item, shift: int = 0) -> _HamtNode:
+    """
+    Returns a trie that also contains `item` (whose masked hash is `h`). If the item was
+    already present the very same node is returned.
+    """
+    bit = 1 << ((h >> shift) & _HAMT_MASK)
+    index = (node.bitmap & (bit - 1)).bit_count()
+    entries = node.entries
+    if not node.bitmap & bit:
+        return _HamtNode(node.bitmap | bit, entries[:index] + (item,) + entries[index:])
+    entry = entries[index]
+    entry_type = type(entry)
+    if entry_type is _HamtNode:
+        child = _hamt_insert(entry, h, item, shift + _HAMT_BITS)
+        if child is entry:
+            return node
+    elif entry_type is _HamtCollision:
+        if item in entry.items:
+            return node
+        child = _HamtCollision(entry.items + (item,))
+    else:
+        if entry is item or entry == item:
+            return node
+        child = _hamt_pair(entry, hash(entry) & _HASH_MASK, item, h, shift + _HAMT_BITS)
+    return _HamtNode(node.bitmap, entries[:index] + (child,) + entries[index + 1:])
+
+
+# El mismo trie sirve de mapa persistente guardando pares (clave, valor) como elementos
+def _hamt_get(node: _HamtNode, h: int, key, default=None):
+    shift = 0
+    while True:
+        bit = 1 << ((h >> shift) & _HAMT_MASK)
+        if not node.bitmap & bit:
+            return default
+        entry = node.entries[(node.bitmap & (bit - 1)).bit_count()]
+        entry_type = type(entry)
+        if entry_type is _HamtNode:
+            node = entry
+            shift += _HAMT_BITS
+        elif entry_type is _HamtCollision:
+            for known, value in entry.items:
+                if known == key:
+                    return value
+            return default
+        else:
+            return entry[1] if entry[0] == key else default
+
+
+def _hamt_assoc(node: _HamtNode, h: int, key, value, shift: int = 0) -> _HamtNode:
+    """
+    Returns a map trie where `key` (whose masked hash is `h`) is bound to `value`.
+    """
+    bit = 1 << ((h >> shift) & _HAMT_MASK)
+    index = (node.bitmap & (bit - 1)).bit_count()
+    entries = node.entries
+    if not node.bitmap & bit:
+        return _HamtNode(node.bitmap | bit, entries[:index] + ((key, value),) + entries[index:])
+    entry = entries[index]
+    entry_type = type(entry)
+    if entry_type is _HamtNode:
+        child = _hamt_assoc(entry, h, key, value, shift + _HAMT_BITS)
+    elif entry_type is _HamtCollision:
+        child = _HamtCollision(tuple(pair for pair in entry.items if pair[0] != key) + ((key, value),))
+    elif entry[0] == key:
+        child = (key, value)
+    else:
+        child = _hamt_pair(entry, hash(entry[0]) & _HASH_MASK, (key, value), h, shift + _HAMT_BITS)
+    return _HamtNode(node.bitmap, entries[:index] + (child,) + entries[index + 1:])
+
+
+def _cons_iter(cell: Union[tuple, None]) -> Iterator:
+    # Listas persistentes como pares (valor, resto), terminadas en None
+    while cell is not None:
+        yield cell[0]
+        cell = cell[1]
+
+
+# --- Contexto Class ---
+# Por debajo de este tamaño la pertenencia se resuelve recorriendo las celdas, que es
+# más barato que mantener el trie para los contextos chicos habituales.
+_CONTEXT_INDEX_THRESHOLD = 8
+
+
+class Contexto:
+    """
+    Persistent context of assumptions.
+
+    A Contexto is a cell holding its newest formula and the context it extends, so
+    `extend` never copies the assumptions and sibling steps share their common tail.
+    Past a handful of formulas a hash trie over the same formulas makes membership
+    independent of the context size. Iterating yields the formulas in the order they
+    were assumed; a formula that is already in the context is not added twice.
+    """
+    __slots__ = ('_head', '_tail', '_size', '_index', '_hash', '_rule_index')
+
+    def __init__(self, formulas: Iterable[Prop] = ()):
+        cell = _EMPTY_CONTEXTO if formulas else None
+        for prop in formulas:
+            cell = cell.extend(prop)
+        if cell is None or cell._size == 0:
+            self._head, self._tail, self._size, self._index, self._hash = None, None, 0, None, 0
+            self._rule_index = None
+        else:
+            self._head, self._tail, self._size, self._index, self._hash = \
+                cell._head, cell._tail, cell._size, cell._index, cell._hash
+            self._rule_index = cell._rule_index
+
+    def extend(self, prop: Prop) -> "Contexto":
+        """
+        Returns this context plus the assumption `prop`. The new assumption is the only
+        one validated.
+        """
+        if not isinstance(prop, Prop):
+            raise TypeError("All elements in 'contexto' must be instances of Prop.")
+        h = hash(prop) & _HASH_MASK
+        if self._index is not None:
+            index = _hamt_insert(self._index, h, prop)
+            if index is self._index:
+                return self
+        elif prop in self:
+            return self
+        elif self._size + 1 >= _CONTEXT_INDEX_THRESHOLD:
+            index = _EMPTY_HAMT
+            for known in self:
+                index = _hamt_insert(index, hash(known) & _HASH_MASK, known)
+            index = _hamt_insert(index, h, prop)
+        else:
+            index = None
+        cell = Contexto.__new__(Contexto)
+        cell._head = prop
+        cell._tail = self
+        cell._size = self._size + 1
+        cell._index = index
+        # Suma de los hashes: no depende del orden en que se asumieron las fórmulas
+        cell._hash = (self._hash + h) & _HASH_MASK
+        cell._rule_index = None
+        return cell
+
+    def __contains__(self, prop) -> bool:
+        if self._index is not None:
+            return isinstance(prop, Prop) and _hamt_contains(self._index, hash(prop) & _HASH_MASK, prop)
+        cell = self
+        while cell._size:
+            if cell._head is prop:
+                return True
+            cell = cell._tail
+        return False
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def head(self) -> Union[Prop, None]:
+        """
+        The newest assumption (None for the empty context).
+        """
+        return self._head
+
+    @property
+    def tail(self) -> Union["Contexto", None]:
+        """
+        The context this one extends (None for the empty context).
+        """
+        return self._tail
+
+    def __iter__(self) -> Iterator[Prop]:
+        formulas = []
+        cell = self
+        while cell._size:
+            formulas.append(cell._head)
+            cell = cell._tail
+        return reversed(formulas)
+
+    def __getitem__(self, index):
+        # Vista tipo lista: O(n), pensado para inspección y no para el camino caliente
+        return list(self)[index]
+
+    def __add__(self, formulas: Iterable[Prop]) -> "Contexto":
+        cell = self
+        for prop in formulas:
+            cell = cell.extend(prop)
+        return cell
+
+    def __radd__(self, formulas: Iterable[Prop]) -> "Contexto":
+        # `[P, Q] + contexto`: primero las fórmulas de la izquierda, después las propias
+        return Contexto(formulas) + self
+
+    def __eq__(self, other) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, Contexto):
+            return NotImplemented
+        return self._size == other._size and self._hash == other._hash and all(prop in other for prop in self)
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __repr__(self) -> str:
+        return f"Contexto({list(self)!r})"
+
+    @property
+    def rule_index(self) -> "ContextIndex":
+        """
+        The ContextIndex of this context. It is built from the index of the nearest
+        context this one extends that already has one, and kept in the cell, so a step
+        pays only for the assumptions its own rule added.
+        """
+        if self._rule_index is not None:
+            return self._rule_index
+        pending = []
+        cell = self
+        while cell._size and cell._rule_index is None:
+            pending.append(cell._head)
+            cell = cell._tail
+        index = cell._rule_index if cell._size else _EMPTY_RULE_INDEX
+        # Las celdas intermedias no guardan su índice: sólo se paga memoria por los pedidos
+        for prop in reversed(pending):
+            index = index.extend(prop)
+        if self._size:
+            self._rule_index = index
+        return index
+
+
+_EMPTY_CONTEXTO = Contexto()
+
+
+class ContextIndex:
+    """
+    Persistent index of what the eliminations can get out of a context.
+
+    The formulas reachable by eliminations are the assumptions, both sides of their
+    conjunctions and the conclusions of their implications, closed transitively. The
+    index maps them by shape: implications by conclusion, conjunctions by each side,
+    and the negated formulas and disjunctions among them. It also counts, for every
+    subformula of the assumptions, how many assumptions it occurs in. `extend` returns
+    a new index that shares everything else with this one, so a lookup costs
+    O(log n + matches) no matter how the context was built.
+    """
+    __slots__ = ('_reachable', '_by_conclusion', '_conj_left', '_conj_right',
+                 '_negations', '_disjunctions', '_occurrences')
+
+    def __init__(self):
+        self._reachable = _EMPTY_HAMT
+        self._by_conclusion = _EMPTY_HAMT    # B -> lista de A por cada A → B
+        self._conj_left = _EMPTY_HAMT        # A -> lista de B por cada A ∧ B
+        self._conj_right = _EMPTY_HAMT       # B -> lista de A por cada A ∧ B
+        self._negations = None               # lista de A por cada ¬A
+        self._disjunctions = None
+        self._occurrences = _EMPTY_HAMT      # subfórmula -> cantidad de asunciones
+
+    def extend(self, prop: Prop) -> "ContextIndex":
+        """
+        Returns the index of the context plus the assumption `prop`.
+        """
+        index = ContextIndex.__new__(ContextIndex)
+        reachable, by_conclusion = self._reachable, self._by_conclusion
+        conj_left, conj_right = self._conj_left, self._conj_right
+        negations, disjunctions = self._negations, self._disjunctions
+        pending = [prop]
+        while pending:
+            formula = pending.pop()
+            updated = _hamt_insert(reachable, hash(formula) & _HASH_MASK, formula)
+            if updated is reachable:
+                continue
+            reachable = updated
+            cls = type(formula)
+            if cls is AND:
+                left, right = formula.left, formula.right
+                h = hash(left) & _HASH_MASK
+                conj_left = _hamt_assoc(conj_left, h, left, (right, _hamt_get(conj_left, h, left)))
+                h = hash(right) & _HASH_MASK
+                conj_right = _hamt_assoc(conj_right, h, right, (left, _hamt_get(conj_right, h, right)))
+                pending.append(left)
+                pending.append(right)
+            elif cls is IMPLIES:
+                conclusion = formula.conclusion
+                h = hash(conclusion) & _HASH_MASK
+                by_conclusion = _hamt_assoc(by_conclusion, h, conclusion,
+                                            (formula.premise, _hamt_get(by_conclusion, h, conclusion)))
+                pending.append(conclusion)
+            elif cls is NEG:
+                negations = (formula.prop, negations)
+            elif cls is OR:
+                disjunctions = (formula, disjunctions)
+
+        occurrences = self._occurrences
+        seen = set()
+        pending = [prop]
+        while pending:
+            formula = pending.pop()
+            if formula in seen:
+                continue
+            seen.add(formula)
+            h = hash(formula) & _HASH_MASK
+            occurrences = _hamt_assoc(occurrences, h, formula, _hamt_get(occurrences, h, formula, 0) + 1)
+            cls = type(formula)
+            if cls is NEG:
+                pending.append(formula.prop)
+            elif cls is IMPLIES:
+                pending.append(formula.premise)
+                pending.append(formula.conclusion)
+            elif cls is AND or cls is OR:
+                pending.append(formula.left)
+                pending.append(formula.right)
+
+        index._reachable, index._by_conclusion = reachable, by_conclusion
+        index._conj_left, index._conj_right = conj_left, conj_right
+        index._negations, index._disjunctions = negations, disjunctions
+        index._occurrences = occurrences
+        return index
+
+    def reaches(self, formula: Prop) -> bool:
+        """
+        Whether `formula` can be reached from the assumptions by eliminations.
+        """
+        return _hamt_contains(self._reachable, hash(formula) & _HASH_MASK, formula)
+
+    def premises_of(self, conclusion: Prop) -> Iterator[Prop]:
+        """
+        The A of every reachable implication A → `conclusion`.
+        """
+        return _cons_iter(_hamt_get(self._by_conclusion, hash(conclusion) & _HASH_MASK, conclusion))
+
+    def right_conjuncts_of(self, left: Prop) -> Iterator[Prop]:
+        """
+        The B of every reachable conjunction `left` ∧ B.
+        """
+        return _cons_iter(_hamt_get(self._conj_left, hash(left) & _HASH_MASK, left))
+
+    def left_conjuncts_of(self, right: Prop) -> Iterator[Prop]:
+        """
+        The A of every reachable conjunction A ∧ `right`.
+        """
+        return _cons_iter(_hamt_get(self._conj_right, hash(right) & _HASH_MASK, right))
+
+    def negated(self) -> Iterator[Prop]:
+        """
+        The A of every reachable negation ¬A.
+        """
+        return _cons_iter(self._negations)
+
+    def disjunctions(self) -> Iterator[OR]:
+        return _cons_iter(self._disjunctions)
+
+    def occurrences(self, formula: Prop) -> int:
+        """
+        Number of assumptions `formula` is a subformula of.
+        """
+        return _hamt_get(self._occurrences, hash(formula) & _HASH_MASK, formula, 0)
+
+    def can_reach_bottom(self) -> bool:
+        return self._negations is not None or self.reaches(BOTTOM()) or \
+            _hamt_get(self._by_conclusion, hash(BOTTOM()) & _HASH_MASK, BOTTOM()) is not None
+
+
+_EMPTY_RULE_INDEX = ContextIndex()
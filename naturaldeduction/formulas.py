@@ -0,0 +1,422 @@
+"""
+Propositional formulas: the interned Prop classes and their rendering to text.
+"""
+import threading
+import weakref
+from collections import OrderedDict
+from dataclasses import FrozenInstanceError
+from typing import Dict, List, Optional, TextIO, Tuple
+
+# --- Formula Table (hash-consing) ---
+# Toda fórmula se construye a través de esta tabla: dos fórmulas estructuralmente
+# iguales son el mismo objeto, de modo que hash y == son O(1). Las entradas son
+# referencias débiles, así que una fórmula desaparece cuando ya nadie la usa.
+# Un callback escrito en Python por cada nodo duplicaría el costo de crearlo: el
+# callback es list.append, que sólo anota la referencia muerta, y las entradas
+# muertas se barren juntas cuando llegan a la mitad de la tabla.
+_FORMULA_TABLE: Dict[tuple, weakref.ref] = {}
+_FORMULA_TABLE_LOCK = threading.Lock()
+_DEAD_REFS: List[weakref.ref] = []
+_note_dead_ref = _DEAD_REFS.append
+_MIN_SWEEP = 1024
+_sweep_at = _MIN_SWEEP
+
+
+def _sweep_formula_table() -> None:
+    global _sweep_at
+    with _FORMULA_TABLE_LOCK:
+        _DEAD_REFS.clear()
+        # Se copia de una vez: otros hilos pueden seguir agregando entradas
+        for key, ref in list(_FORMULA_TABLE.items()):
+            if ref() is None and _FORMULA_TABLE.get(key) is ref:
+                del _FORMULA_TABLE[key]
+        _sweep_at = max(len(_FORMULA_TABLE) // 2, _MIN_SWEEP)
+
+
+def formula_table_size() -> int:
+    """
+    Returns the number of distinct formulas currently alive in the formula table.
+    """
+    if _DEAD_REFS:
+        _sweep_formula_table()
+    return len(_FORMULA_TABLE)
+
+
+def _insert(key: tuple, node: "Prop") -> "Prop":
+    # La búsqueda no toma el lock. setdefault es atómico, así que dos hilos que crean
+    # la misma fórmula se quedan con el mismo nodo; el lock sólo hace falta para
+    # reemplazar una entrada muerta.
+    new_ref = weakref.ref(node, _note_dead_ref)
+    ref = _FORMULA_TABLE.setdefault(key, new_ref)
+    if ref is not new_ref:
+        with _FORMULA_TABLE_LOCK:
+            ref = _FORMULA_TABLE.get(key)
+            existing = ref() if ref is not None else None
+            if existing is not None:
+                return existing
+            _FORMULA_TABLE[key] = new_ref
+    if len(_DEAD_REFS) > _sweep_at:
+        _sweep_formula_table()
+    return node
+
+
+_set = object.__setattr__
+
+
+# Los constructores de cada aridad. Los hijos ya están internados, así que las claves
+# usan sus ids (y el id de la clase): mientras un nodo vive mantiene vivos a sus hijos,
+# y una entrada muerta nunca devuelve nada. Buscar no llama a ningún __hash__ escrito
+# en Python, y las claves sólo tienen enteros y cadenas, que el GC deja de recorrer.
+def _new_binary(cls: type, first: "Prop", second: "Prop") -> "Prop":
+    key = (id(cls), id(first), id(second))
+    ref = _FORMULA_TABLE.get(key)
+    if ref is not None:
+        node = ref()
+        if node is not None:
+            return node
+    try:
+        hash_, size = hash((key[0], first._hash, second._hash)), 1 + first._size + second._size
+    except AttributeError:
+        raise TypeError(f"the arguments of {cls.__name__}() must be formulas") from None
+    node = object.__new__(cls)
+    first_field, second_field = cls._fields
+    _set(node, first_field, first)
+    _set(node, second_field, second)
+    _set(node, '_hash', hash_)
+    _set(node, '_size', size)
+    return _insert(key, node)
+
+
+def _new_unary(cls: type, prop: "Prop") -> "Prop":
+    key = (id(cls), id(prop))
+    ref = _FORMULA_TABLE.get(key)
+    if ref is not None:
+        node = ref()
+        if node is not None:
+            return node
+    try:
+        hash_, size = hash((key[0], prop._hash)), 1 + prop._size
+    except AttributeError:
+        raise TypeError(f"the argument of {cls.__name__}() must be a formula") from None
+    node = object.__new__(cls)
+    _set(node, 'prop', prop)
+    _set(node, '_hash', hash_)
+    _set(node, '_size', size)
+    return _insert(key, node)
+
+
+def _new_atom(cls: type, key: tuple) -> "Prop":
+    ref = _FORMULA_TABLE.get(key)
+    if ref is not None:
+        node = ref()
+        if node is not None:
+            return node
+    node = object.__new__(cls)
+    if len(key) == 2:
+        _set(node, 'name', key[1])
+    _set(node, '_hash', hash(key))
+    _set(node, '_size', 1)
+    return _insert(key, node)
+
+
+class Prop:
+    """
+    Base class of every proposition.
+
+    Instances are interned: calling a constructor such as ``VAR("P")`` twice
+    returns the same object, so equality is identity and the hash (and the size)
+    are computed once, when the node is created.
+    """
+    __slots__ = ('_hash', '_size', '__weakref__')
+    _fields: Tuple[str, ...] = ()
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    @property
+    def size(self) -> int:
+        """
+        Number of atoms and connectives of the formula, counted as a tree.
+        """
+        return self._size
+
+    def __eq__(self, other) -> bool:
+        return self is other
+
+    def __ne__(self, other) -> bool:
+        return self is not other
+
+    def __setattr__(self, name, value):
+        raise FrozenInstanceError(f"cannot assign to field '{name}'")
+
+    def __delattr__(self, name):
+        raise FrozenInstanceError(f"cannot delete field '{name}'")
+
+    def __repr__(self) -> str:
+        args = ', '.join(f"{field}={getattr(self, field)!r}" for field in self._fields)
+        return f"{type(self).__name__}({args})"
+
+    def __reduce__(self):
+        # Al deserializar se vuelve a pasar por el constructor, que re-interna el nodo
+        return (type(self), tuple(getattr(self, field) for field in self._fields))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    # Constructores abreviados, como en main.js
+    def neg(self) -> "Prop":
+        return NEG(self)
+
+    def and_(self, other: "Prop") -> "Prop":
+        return AND(self, other)
+
+    def or_(self, other: "Prop") -> "Prop":
+        return OR(self, other)
+
+    def impl(self, other: "Prop") -> "Prop":
+        return IMPLIES(self, other)
+
+
+class NEG(Prop):
+    __slots__ = ('prop',)
+    __match_args__ = _fields = ('prop',)
+
+    def __new__(cls, prop: Prop) -> "NEG":
+        return _new_unary(cls, prop)
+
+class AND(Prop):
+    __slots__ = ('left', 'right')
+    __match_args__ = _fields = ('left', 'right')
+
+    def __new__(cls, left: Prop, right: Prop) -> "AND":
+        return _new_binary(cls, left, right)
+
+class OR(Prop):
+    __slots__ = ('left', 'right')
+    __match_args__ = _fields = ('left', 'right')
+
+    def __new__(cls, left: Prop, right: Prop) -> "OR":
+        return _new_binary(cls, left, right)
+
+class IMPLIES(Prop):
+    __slots__ = ('premise', 'conclusion')
+    __match_args__ = _fields = ('premise', 'conclusion')
+
+    def __new__(cls, premise: Prop, conclusion: Prop) -> "IMPLIES":
+        return _new_binary(cls, premise, conclusion)
+
+class BOTTOM(Prop):
+    __slots__ = ()
+    __match_args__ = _fields = ()
+
+    def __new__(cls) -> "BOTTOM":
+        return _new_atom(cls, (id(cls),))
+
+class VAR(Prop):
+    __slots__ = ('name',)
+    __match_args__ = _fields = ('name',)
+
+    def __new__(cls, name: str) -> "VAR":
+        return _new_atom(cls, (id(cls), name))
+
+# --- Pretty Print Function ---
+# Textos ya renderizados de fórmulas y subfórmulas, indexados por (id, minimal). Cada
+# entrada guarda una referencia débil a su fórmula: la caché no mantiene viva a
+# ninguna, y una entrada cuyo id se reusó no coincide. El tamaño se limita por la
+# cantidad total de caracteres, desalojando las menos usadas.
+_RENDER_CACHE_CHARS = 1 << 20
+# Una entrada más larga que esto no se guarda
+_RENDER_ENTRY_CHARS = _RENDER_CACHE_CHARS // 16
+_render_cache: "OrderedDict[Tuple[int, bool], Tuple[weakref.ref, str]]" = OrderedDict()
+_render_cache_chars = 0
+_RENDER_CACHE_LOCK = threading.Lock()
+
+# Conectivo binario -> (símbolo, precedencia). VAR y ⊥ tienen precedencia 5, ¬ 4.
+_BINARY_SYMBOLS = {AND: (" ∧ ", 3), OR: (" ∨ ", 2), IMPLIES: (" → ", 1)}
+_ATOM_PRECEDENCE = 5
+_NEG_PRECEDENCE = 4
+
+
+def _print_precedence(p: Prop) -> int:
+    cls = type(p)
+    if cls is NEG:
+        return _NEG_PRECEDENCE
+    if cls in _BINARY_SYMBOLS:
+        return _BINARY_SYMBOLS[cls][1]
+    return _ATOM_PRECEDENCE
+
+
+def _render(p: Prop, minimal: bool, emit, spans: Optional[list] = None, count=None) -> None:
+    """
+    Emits the text of `p` piece by piece through `emit`, walking the formula with an
+    explicit stack. Plain strings on the stack are pending output, Props are pending
+    subformulas and ints mark where a subformula ends.
+
+    With `spans`, the subformulas rendered here (not found in the cache) are recorded
+    there, in preorder, as [formula, first piece, end piece], where `count()` gives the
+    number of pieces emitted so far. Only while their sizes add up to at most twice the
+    size of `p`: taking every one would make a deep formula copy each of its suffixes.
+    """
+    cache_get = _render_cache.get
+    move_to_end = _render_cache.move_to_end
+    stack: list = [p]
+    pop = stack.pop
+    push = stack.append
+    budget = 2 * p._size if spans is not None else 0
+    while stack:
+        item = pop()
+        cls = type(item)
+        if cls is str:
+            emit(item)
+            continue
+        if cls is int:
+            spans[item][2] = count()
+            continue
+        if cls is VAR:
+            emit(item.name)
+            continue
+        if cls is BOTTOM:
+            emit("⊥")
+            continue
+        key = (id(item), minimal)
+        cached = cache_get(key)
+        if cached is not None and cached[0]() is item:
+            emit(cached[1])
+            try:
+                move_to_end(key)
+            except KeyError:
+                pass  # otro hilo acaba de desalojarla
+            continue
+        if item._size <= budget:
+            budget -= item._size
+            push(len(spans))
+            spans.append([item, count(), None])
+        if cls is NEG:
+            if minimal and _print_precedence(item.prop) >= _NEG_PRECEDENCE:
+                emit("¬")
+                push(item.prop)
+            else:
+                emit("¬(")
+                push(")")
+                push(item.prop)
+        elif cls in _BINARY_SYMBOLS:
+            symbol, precedence = _BINARY_SYMBOLS[cls]
+            if cls is IMPLIES:
+                left, right = item.premise, item.conclusion
+            else:
+                left, right = item.left, item.right
+            if not minimal:
+                emit("(")
+                push(")")
+                push(right)
+                push(symbol)
+                push(left)
+                continue
+            # → asocia a derecha, ∧ y ∨ a izquierda (igual que parse_formula)
+            left_precedence = _print_precedence(left)
+            right_precedence = _print_precedence(right)
+            if right_precedence < precedence or (right_precedence == precedence and cls is not IMPLIES):
+                push(")")
+                push(right)
+                push("(")
+            else:
+                push(right)
+            push(symbol)
+            if left_precedence < precedence or (left_precedence == precedence and cls is IMPLIES):
+                push(")")
+                push(left)
+                push("(")
+            else:
+                push(left)
+        else:
+            emit("UNKNOWN_PROP_TYPE")  # Fallback for unexpected types
+
+
+def clear_render_cache() -> None:
+    """
+    Empties the cache of rendered formulas, e.g. to time rendering from a cold start.
+    """
+    global _render_cache_chars
+    with _RENDER_CACHE_LOCK:
+        _render_cache.clear()
+        _render_cache_chars = 0
+
+
+def _cached_render(p: Prop, minimal: bool) -> Optional[str]:
+    key = (id(p), minimal)
+    cached = _render_cache.get(key)
+    if cached is None or cached[0]() is not p:
+        return None
+    try:
+        _render_cache.move_to_end(key)
+    except KeyError:
+        pass  # otro hilo acaba de desalojarla
+    return cached[1]
+
+
+def _remember_renders(spans: list, parts: List[str], text: str, minimal: bool) -> None:
+    """
+    Caches the text of the subformulas recorded in `spans` by `_render`, as long as the
+    copied text stays within twice the length of `text`.
+    """
+    global _render_cache_chars
+    budget = 2 * len(text)
+    entries = []
+    for formula, first, end in spans:
+        rendered = text if end - first == len(parts) else ''.join(parts[first:end])
+        if len(rendered) <= _RENDER_ENTRY_CHARS and len(rendered) <= budget:
+            budget -= len(rendered)
+            entries.append(((id(formula), minimal), weakref.ref(formula), rendered))
+    with _RENDER_CACHE_LOCK:
+        for key, ref, rendered in entries:
+            old = _render_cache.pop(key, None)
+            if old is not None:
+                _render_cache_chars -= len(old[1])
+            _render_cache[key] = (ref, rendered)
+            _render_cache_chars += len(rendered)
+        while _render_cache_chars > _RENDER_CACHE_CHARS:
+            _, (_, dropped) = _render_cache.popitem(last=False)
+            _render_cache_chars -= len(dropped)
+
+
+def pretty_print(p: Prop, minimal: bool = False) -> str:
+    """
+    Renders `p` with the Unicode connectives. By default every binary connective and
+    every negation is parenthesized; with `minimal=True` only the parentheses needed by
+    the precedence rules of `parse_formula` are kept. Runs in linear time and constant
+    recursion depth.
+    """
+    cached = _cached_render(p, minimal)
+    if cached is not None:
+        return cached
+    parts: List[str] = []
+    spans: list = []
+    _render(p, minimal, parts.append, spans, parts.__len__)
+    text = ''.join(parts)
+    _remember_renders(spans, parts, text, minimal)
+    return text
+
+
+def write_formula(p: Prop, sink: TextIO, minimal: bool = False, chunk_size: int = 8192) -> None:
+    """
+    Streams the text of `p` (as `pretty_print` would render it) into the file-like
+    object `sink`, in chunks of about `chunk_size` pieces, without building the whole
+    string in memory.
+    """
+    cached = _cached_render(p, minimal)
+    if cached is not None:
+        sink.write(cached)
+        return
+    buffer: List[str] = []
+
+    def emit(piece: str) -> None:
+        buffer.append(piece)
+        if len(buffer) >= chunk_size:
+            sink.write(''.join(buffer))
+            buffer.clear()
+
+    _render(p, minimal, emit)
+    sink.write(''.join(buffer))
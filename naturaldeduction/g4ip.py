@@ -0,0 +1,184 @@
+"""
+Decision procedure for intuitionistic propositional logic, based on Dyckhoff's
+contraction-free sequent calculus G4ip (LJT).
+
+In G4ip every backward rule application makes the sequent smaller in a well-founded
+order, so the search always terminates without loop checking. Negations are read as
+A → ⊥. All the invertible rules are applied in one saturation pass per sequent; only
+∨R and the (C → D) → B left rule are real choices.
+
+The search uses an explicit stack of generators (each one asks for the provability of
+its premises by yielding them), so formulas with thousands of connectives do not hit
+the recursion limit, and every decided sequent is memoized.
+"""
+from typing import Dict, FrozenSet, Generator, Iterable, List, Optional, Set, Tuple
+
+from .formulas import AND, BOTTOM, IMPLIES, NEG, OR, VAR, Prop
+
+Sequent = Tuple[FrozenSet[Prop], Prop]
+
+
+def _immediate(goal: Prop, context: Set[Prop]) -> bool:
+    # El objetivo está en el contexto, o es una disyunción con un lado en el contexto
+    while True:
+        if goal in context:
+            return True
+        if type(goal) is not OR:
+            return False
+        if goal.left in context:
+            return True
+        goal = goal.right
+
+
+class IntuitionisticDecider:
+    """
+    Decides `contexto ⊢ resolvente` in intuitionistic logic. The memo of decided
+    sequents is kept between calls, so a prover can reuse one decider for all of its
+    subgoals.
+    """
+    def __init__(self):
+        self._memo: Dict[Sequent, bool] = {}
+        self._normal: Dict[Prop, Prop] = {}
+
+    def clear(self) -> None:
+        self._memo.clear()
+        self._normal.clear()
+
+    def is_provable(self, contexto: Iterable[Prop], resolvente: Prop) -> bool:
+        normalize = self._normalize
+        root = (frozenset(normalize(f) for f in contexto), normalize(resolvente))
+        memo = self._memo
+        if root in memo:
+            return memo[root]
+
+        stack: List[Tuple[Sequent, Generator]] = [(root, self._search(*root))]
+        value: Optional[bool] = None
+        while stack:
+            sequent, search = stack[-1]
+            try:
+                premise = search.send(value)
+            except StopIteration as stop:
+                stack.pop()
+                value = memo[sequent] = stop.value
+                continue
+            value = memo.get(premise)
+            if value is None:
+                stack.append((premise, self._search(*premise)))
+        return value
+
+    def _normalize(self, formula: Prop) -> Prop:
+        # ¬A pasa a ser A → ⊥; recorrido iterativo sobre el DAG de la fórmula
+        normal = self._normal
+        bottom = BOTTOM()
+        stack = [formula]
+        while stack:
+            node = stack[-1]
+            if node in normal:
+                stack.pop()
+                continue
+            cls = type(node)
+            if cls is VAR or cls is BOTTOM:
+                normal[node] = node
+            elif cls is NEG:
+                if node.prop not in normal:
+                    stack.append(node.prop)
+                    continue
+                normal[node] = IMPLIES(normal[node.prop], bottom)
+            else:
+                left, right = (node.premise, node.conclusion) if cls is IMPLIES else (node.left, node.right)
+                if left not in normal or right not in normal:
+                    stack.append(right)
+                    stack.append(left)
+                    continue
+                normal[node] = cls(normal[left], normal[right])
+            stack.pop()
+        return normal[formula]
+
+    def _search(self, gamma: FrozenSet[Prop], goal: Prop) -> Generator[Sequent, bool, bool]:
+        bottom = BOTTOM()
+        context: Set[Prop] = set()
+        waiting: Dict[Prop, List[Prop]] = {}   # átomo P -> implicaciones P → B pendientes
+        pending = list(gamma)
+
+        # Las reglas →R invertibles mueven premisas al contexto
+        while type(goal) is IMPLIES:
+            pending.append(goal.premise)
+            goal = goal.conclusion
+
+        # Saturación con las reglas izquierdas invertibles que no ramifican
+        while pending:
+            f = pending.pop()
+            if f in context:
+                continue
+            cls = type(f)
+            if cls is BOTTOM:
+                return True
+            if cls is AND:
+                pending.append(f.left)
+                pending.append(f.right)
+            elif cls is IMPLIES:
+                premise, conclusion = f.premise, f.conclusion
+                ptype = type(premise)
+                if ptype is BOTTOM or conclusion in context:
+                    continue  # ⊥ → B y A → B con B disponible no aportan nada
+                if ptype is VAR:
+                    if premise in context:
+                        pending.append(conclusion)
+                    else:
+                        context.add(f)
+                        waiting.setdefault(premise, []).append(f)
+                elif ptype is AND:
+                    pending.append(IMPLIES(premise.left, IMPLIES(premise.right, conclusion)))
+                elif ptype is OR:
+                    pending.append(IMPLIES(premise.left, conclusion))
+                    pending.append(IMPLIES(premise.right, conclusion))
+                else:
+                    context.add(f)
+            else:
+                context.add(f)
+                if cls is VAR:
+                    for implication in waiting.pop(f, ()):
+                        context.discard(implication)
+                        pending.append(implication.conclusion)
+
+        if _immediate(goal, context):
+            return True
+        sequent = frozenset(context)
+
+        if type(goal) is AND:
+            # ∧R sobre toda la conjunción a la vez; las hojas ya presentes no generan secuentes
+            conjuncts = [goal]
+            while conjuncts:
+                conjunct = conjuncts.pop()
+                if type(conjunct) is AND:
+                    conjuncts.append(conjunct.right)
+                    conjuncts.append(conjunct.left)
+                elif not _immediate(conjunct, context) and not (yield (sequent, conjunct)):
+                    return False
+            return True
+
+        for f in context:
+            if type(f) is OR:
+                rest = sequent - {f}
+                return (yield (rest | {f.left}, goal)) and (yield (rest | {f.right}, goal))
+
+        # Reglas no invertibles
+        if type(goal) is OR:
+            if (yield (sequent, goal.left)):
+                return True
+            if (yield (sequent, goal.right)):
+                return True
+        for f in context:
+            if type(f) is IMPLIES and type(f.premise) is IMPLIES:
+                c, d, b = f.premise.premise, f.premise.conclusion, f.conclusion
+                rest = sequent - {f}
+                if (yield (rest | {c, IMPLIES(d, b)}, d)) and (yield (rest | {b}, goal)):
+                    return True
+        return False
+
+
+def is_intuitionistically_valid(contexto: Iterable[Prop], resolvente: Prop) -> bool:
+    """
+    Returns True if `contexto ⊢ resolvente` is provable in intuitionistic logic.
+    """
+    return IntuitionisticDecider().is_provable(contexto, resolvente)
@@ -0,0 +1,152 @@
+"""
+Observers that turn the RuleEvents of `Resolver.aplicarRegla` into metrics and traces.
+
+    stats = RuleStats()
+    resolver = Resolver(contexto, resolvente, observadores=[stats])
+    ...
+    print(to_prometheus(stats))
+
+`RuleStats` keeps, per `LogicRules` member, a counter per outcome and histograms of the
+duration, the size of the resolvent and the size of the context. `to_json` and
+`to_prometheus` export them; `JsonTraceObserver` writes every event as one JSON line.
+"""
+import json
+from bisect import bisect_left
+from typing import Dict, List, Sequence, TextIO, Tuple
+
+from .formulas import pretty_print
+from .resolver import RuleEvent, RuleObserver, RuleOutcome
+from .rules import LogicRules
+
+# Límites superiores de los buckets (el último, +Inf, es implícito)
+DURATION_BUCKETS = (1e-6, 5e-6, 1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 5e-3, 1e-2, 0.1, 1.0)
+SIZE_BUCKETS = (1, 4, 16, 64, 256, 1024, 4096, 16384, 65536)
+
+
+class Histogram:
+    """
+    Cumulative-style histogram with fixed bucket bounds, as Prometheus defines them.
+    """
+    __slots__ = ('bounds', 'counts', 'sum', 'count')
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """
+        Returns (upper bound, observations <= bound) pairs, ending with '+Inf'.
+        """
+        result = []
+        running = 0
+        for bound, count in zip((*self.bounds, float('inf')), self.counts):
+            running += count
+            result.append(('+Inf' if bound == float('inf') else repr(bound), running))
+        return result
+
+    def to_dict(self) -> dict:
+        return {"buckets": dict(self.cumulative()), "sum": self.sum, "count": self.count}
+
+
+class RuleStats(RuleObserver):
+    """
+    Counters and histograms per rule, fed by the Resolvers it is subscribed to.
+    """
+    def __init__(self):
+        self.counts: Dict[LogicRules, Dict[RuleOutcome, int]] = {}
+        self.durations: Dict[LogicRules, Histogram] = {}
+        self.formula_sizes: Dict[LogicRules, Histogram] = {}
+        self.context_sizes: Dict[LogicRules, Histogram] = {}
+
+    def on_rule(self, event: RuleEvent) -> None:
+        regla = event.regla
+        counts = self.counts.get(regla)
+        if counts is None:
+            counts = self.counts[regla] = {}
+            self.durations[regla] = Histogram(DURATION_BUCKETS)
+            self.formula_sizes[regla] = Histogram(SIZE_BUCKETS)
+            self.context_sizes[regla] = Histogram(SIZE_BUCKETS)
+        counts[event.outcome] = counts.get(event.outcome, 0) + 1
+        self.durations[regla].observe(event.duration)
+        self.formula_sizes[regla].observe(event.formula_size)
+        self.context_sizes[regla].observe(event.context_size)
+
+    def total(self, outcome: RuleOutcome = None) -> int:
+        """
+        Number of recorded applications, optionally only those with `outcome`.
+        """
+        return sum(count for counts in self.counts.values()
+                   for o, count in counts.items() if outcome is None or o is outcome)
+
+    def reset(self) -> None:
+        self.__init__()
+
+
+class JsonTraceObserver(RuleObserver):
+    """
+    Writes every RuleEvent to `sink` as one JSON object per line.
+    """
+    def __init__(self, sink: TextIO):
+        self.sink = sink
+
+    def on_rule(self, event: RuleEvent) -> None:
+        record = {
+            "rule": event.regla.name,
+            "step": event.num_pos,
+            "outcome": event.outcome.value,
+            "resolvente": None if event.resolvente is None else pretty_print(event.resolvente, minimal=True),
+            "formula_size": event.formula_size,
+            "context_size": event.context_size,
+            "new_steps": event.nuevos_pasos,
+            "duration": event.duration,
+        }
+        self.sink.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def to_json(stats: RuleStats) -> dict:
+    """
+    Returns the stats as a JSON-serializable dict keyed by rule name.
+    """
+    return {
+        regla.name: {
+            "outcomes": {outcome.value: count for outcome, count in counts.items()},
+            "duration_seconds": stats.durations[regla].to_dict(),
+            "formula_size": stats.formula_sizes[regla].to_dict(),
+            "context_size": stats.context_sizes[regla].to_dict(),
+        }
+        for regla, counts in stats.counts.items()
+    }
+
+
+def _prometheus_histogram(lines: List[str], name: str, histograms: Dict[LogicRules, Histogram]) -> None:
+    for regla, histogram in histograms.items():
+        for bound, count in histogram.cumulative():
+            lines.append(f'{name}_bucket{{rule="{regla.name}",le="{bound}"}} {count}')
+        lines.append(f'{name}_sum{{rule="{regla.name}"}} {histogram.sum!r}')
+        lines.append(f'{name}_count{{rule="{regla.name}"}} {histogram.count}')
+
+
+def to_prometheus(stats: RuleStats, prefix: str = "natural_deduction") -> str:
+    """
+    Returns the stats in the Prometheus text exposition format.
+    """
+    lines = [f"# HELP {prefix}_rule_applications_total Rule applications by rule and outcome.",
+             f"# TYPE {prefix}_rule_applications_total counter"]
+    for regla, counts in stats.counts.items():
+        for outcome, count in counts.items():
+            lines.append(f'{prefix}_rule_applications_total{{rule="{regla.name}",outcome="{outcome.value}"}} {count}')
+    for suffix, help_text, histograms in (
+            ("rule_duration_seconds", "Time spent applying a rule.", stats.durations),
+            ("rule_formula_size", "Size of the resolvent a rule was applied to.", stats.formula_sizes),
+            ("rule_context_size", "Number of assumptions of the step a rule was applied to.", stats.context_sizes)):
+        lines.append(f"# HELP {prefix}_{suffix} {help_text}")
+        lines.append(f"# TYPE {prefix}_{suffix} histogram")
+        _prometheus_histogram(lines, f"{prefix}_{suffix}", histograms)
+    return "\n".join(lines) + "\n"
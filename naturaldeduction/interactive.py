@@ -0,0 +1,72 @@
+"""
+The interactive proof session: reads a sequent and lets the user apply rules step by
+step.
+"""
+from .formulas import pretty_print
+from .parser import getContext, getLogicMode, getResolvent
+from .resolver import PrintObserver, Resolver
+from .rules import LogicRules, reglasPermitidas
+
+def main():
+    """
+    Main function to manage the natural deduction proof process.
+    """
+    print("Welcome to the Natural Deduction Resolver!")
+    
+    # Get context and resolvent from the user
+    contexto = getContext()
+    resolvente = getResolvent()
+    modo = getLogicMode()
+    resolver = Resolver(contexto, resolvente, interactivo=True, modo=modo,
+                        observadores=[PrintObserver()])
+
+    # La prueba completa se imprime una vez; después sólo los pasos que cambiaron
+    solo_cambios = False
+    while not resolver.isProofComplete():
+        resolver.mostrar_prueba(solo_cambios)
+        solo_cambios = True
+        print("\nSteps to resolve:", sorted(resolver.pasos_a_resolver))
+        
+        try:
+            # Prompt user to select a step and a rule
+            entrada = input("Enter the step number to apply a rule (or 'undo', 'show', 'tree', 'fitch'): ").strip()
+            comando = entrada.lower()
+            if comando == "undo":
+                if resolver.undo():
+                    print("Last rule application undone.")
+                else:
+                    print("Nothing to undo.")
+                continue
+            if comando == "show":
+                solo_cambios = False
+                continue
+            if comando in ("tree", "fitch"):
+                for line in resolver.renderer.render(comando):
+                    print(line)
+                continue
+            num_pos = int(entrada)
+            sugerencias = resolver.suggest(num_pos)
+            if sugerencias:
+                # Las reglas aplicables, con los mejores testigos del contexto
+                print("Applicable rules:")
+                for sugerencia in sugerencias:
+                    testigos = "; ".join(", ".join(pretty_print(t) for t in candidato)
+                                         for candidato in sugerencia.testigos[:3])
+                    print(f"- {sugerencia.regla.value}" + (f"  (witnesses: {testigos})" if testigos else ""))
+            else:
+                print("Available rules:")
+                for rule in reglasPermitidas(resolver.modo):
+                    print(f"- {rule.value}")
+            regla_input = input("Enter the rule to apply: ").strip()
+            regla = LogicRules(regla_input)
+
+            # Apply the rule
+            if resolver.aplicarRegla(num_pos, regla):
+                print(f"Rule '{regla.value}' applied successfully to step {num_pos}.")
+            else:
+                print(f"Failed to apply rule '{regla.value}' to step {num_pos}.")
+        except (ValueError, KeyError):
+            print("Invalid input. Please try again.")
+
+    print("\nProof complete!")
+    resolver.mostrar_prueba()
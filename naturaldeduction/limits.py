@@ -0,0 +1,36 @@
+"""
+Hard time limits for work that has no budget of its own (parsing, replay, decision
+procedures), shared by the batch runner and the session server.
+"""
+import signal
+from contextlib import contextmanager
+from typing import Optional
+
+
+class TaskTimeout(Exception):
+    """
+    Raised inside a `time_limit` block when its time runs out.
+    """
+
+
+def _on_alarm(signum, frame):
+    raise TaskTimeout()
+
+
+@contextmanager
+def time_limit(seconds: Optional[float]):
+    """
+    Raises TaskTimeout in the block if it runs for more than `seconds`. Only available
+    where SIGALRM exists, and only in the main thread; elsewhere, and with `seconds`
+    None or 0, the block runs unlimited.
+    """
+    if not seconds or not hasattr(signal, 'setitimer'):
+        yield
+        return
+    previous = signal.signal(signal.SIGALRM, _on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
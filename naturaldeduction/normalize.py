@@ -0,0 +1,507 @@
+"""
+Proof normalization and a persistent cache of proven sequents (lemmas).
+
+`normalize` shrinks a proof tree (see `prover.ProofTree`) in three ways:
+
+- Detours, an introduction whose conclusion is eliminated right away, are removed:
+  ∧E of ∧I, →E of →I, ¬E of ¬I, ∨E of ∨I, ¬¬E of ¬¬I and MT of →I. When the
+  introduction discharged a hypothesis, the proof of the eliminated premise takes the
+  place of the Axiom steps that used it.
+- A subgoal whose resolvent is in its context is closed with Axiom.
+- Subgoals that repeat a sequent (same context and resolvent) all get the smallest of
+  their proofs, and equal subproofs are shared, so the result is a DAG. `dag_size`
+  counts its distinct nodes and `tree_size` the steps of the Resolver it replays into.
+
+`LemmaCache` keeps proofs by sequent, optionally in a JSON-lines file, so that a later
+search closes a goal proven before, under the same or a larger context, at once:
+
+    with LemmaCache("lemmas.jsonl") as lemas:
+        resolver = Prover(lemas=lemas).prove(contexto, resolvente)
+"""
+import json
+import os
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .contexto import Contexto
+from .formulas import AND, BOTTOM, IMPLIES, NEG, OR, Prop, pretty_print
+from .parser import parse_formula
+from .proof import REGLAS_CON_TESTIGOS
+from .proof_script import testigos_for
+from .prover import ProofTree, build_resolver
+from .resolver import Resolver
+from .rules import REGLAS_CLASICAS, RULES_BY_TOKEN, LogicMode, LogicRules
+
+Sequent = Tuple[Contexto, Prop]
+
+# Se normaliza de nuevo mientras la prueba siga achicándose, hasta esta cantidad de veces
+_MAX_ROUNDS = 8
+
+
+def _premisas(regla: LogicRules, testigos: Tuple[Prop, ...], contexto: Contexto, goal: Prop,
+              extend: Callable[[Contexto, Prop], Contexto] = Contexto.extend) -> List[Sequent]:
+    # Los secuentes que abre la regla, en el orden en que aplicarRegla agrega los pasos
+    match regla:
+        case LogicRules.AND_INTRODUCTION:
+            return [(contexto, goal.left), (contexto, goal.right)]
+        case LogicRules.AND_ELIMINATION_1:
+            return [(contexto, AND(goal, testigos[0]))]
+        case LogicRules.AND_ELIMINATION_2:
+            return [(contexto, AND(testigos[0], goal))]
+        case LogicRules.IMPLICATION_INTRODUCTION:
+            return [(extend(contexto, goal.premise), goal.conclusion)]
+        case LogicRules.IMPLICATION_ELIMINATION:
+            return [(contexto, testigos[0]), (contexto, IMPLIES(testigos[0], goal))]
+        case LogicRules.OR_INTRODUCTION_1:
+            return [(contexto, goal.left)]
+        case LogicRules.OR_INTRODUCTION_2:
+            return [(contexto, goal.right)]
+        case LogicRules.OR_ELIMINATION:
+            a, b = testigos
+            return [(contexto, OR(a, b)), (extend(contexto, a), goal), (extend(contexto, b), goal)]
+        case LogicRules.NEGATION_INTRODUCTION:
+            return [(extend(contexto, goal.prop), BOTTOM())]
+        case LogicRules.NEGATION_ELIMINATION:
+            return [(contexto, testigos[0]), (contexto, NEG(testigos[0]))]
+        case LogicRules.BOTTOM_ELIMINATION:
+            return [(contexto, BOTTOM())]
+        case LogicRules.MODUS_TOLLENS:
+            return [(contexto, IMPLIES(goal.prop, BOTTOM()))]
+        case LogicRules.NEGATION_NEGATION_INTRODUCTION:
+            return [(contexto, goal.prop.prop)]
+        case LogicRules.NEGATION_NEGATION_ELIMINATION:
+            return [(contexto, NEG(NEG(goal)))]
+        case LogicRules.PBC:
+            return [(extend(contexto, NEG(goal)), BOTTOM())]
+        case _:
+            return []
+
+
+def tree_size(proof: ProofTree) -> int:
+    """
+    Returns the number of steps `proof` replays into: a shared subproof counts once per
+    use.
+    """
+    sizes: Dict[int, int] = {}
+    stack = [proof]
+    while stack:
+        node = stack[-1]
+        if id(node) in sizes:
+            stack.pop()
+            continue
+        pendientes = [hijo for hijo in node[2] if id(hijo) not in sizes]
+        if pendientes:
+            stack.extend(pendientes)
+            continue
+        stack.pop()
+        sizes[id(node)] = 1 + sum(sizes[id(hijo)] for hijo in node[2])
+    return sizes[id(proof)]
+
+
+def dag_size(proof: ProofTree) -> int:
+    """
+    Returns the number of distinct nodes of `proof`: a shared subproof counts once.
+    """
+    seen = {id(proof)}
+    stack = [proof]
+    while stack:
+        for hijo in stack.pop()[2]:
+            if id(hijo) not in seen:
+                seen.add(id(hijo))
+                stack.append(hijo)
+    return len(seen)
+
+
+def uses_classical_rules(proof: ProofTree) -> bool:
+    """
+    Returns True if `proof` applies any of REGLAS_CLASICAS.
+    """
+    seen = set()
+    stack = [proof]
+    while stack:
+        node = stack.pop()
+        if node[0] in REGLAS_CLASICAS:
+            return True
+        for hijo in node[2]:
+            if id(hijo) not in seen:
+                seen.add(id(hijo))
+                stack.append(hijo)
+    return False
+
+
+class _Normalizer:
+    """
+    The nodes built during one `normalize` call. Every node goes through `node`, which
+    shares equal nodes and records their tree size.
+    """
+    def __init__(self):
+        self._nodes: Dict[tuple, ProofTree] = {}
+        self._sizes: Dict[int, int] = {}
+        self._extensions: Dict[tuple, Contexto] = {}
+        self.axiom = self.node(LogicRules.AXIOM, (), ())
+
+    def extend(self, contexto: Contexto, prop: Prop) -> Contexto:
+        # Un mismo contexto extendido dos veces da el mismo objeto, y las claves de
+        # los secuentes se comparan por identidad en lugar de fórmula por fórmula
+        key = (id(contexto), prop)
+        entry = self._extensions.get(key)
+        if entry is None:
+            entry = self._extensions[key] = (contexto, contexto.extend(prop))
+        return entry[1]
+
+    def node(self, regla: LogicRules, testigos: Tuple[Prop, ...], hijos: Tuple[ProofTree, ...]) -> ProofTree:
+        key = (regla, testigos, tuple(map(id, hijos)))
+        node = self._nodes.get(key)
+        if node is None:
+            node = self._nodes[key] = (regla, testigos, hijos)
+            self._sizes[id(node)] = 1 + sum(self._sizes[id(hijo)] for hijo in hijos)
+        return node
+
+    def size(self, node: ProofTree) -> int:
+        return self._sizes[id(node)]
+
+    def run(self, contexto: Contexto, resolvente: Prop, proof: ProofTree) -> ProofTree:
+        """
+        One round: reduces the detours bottom-up, keeps the smallest proof of every
+        sequent and then rebuilds the proof with those.
+        """
+        best: Dict[Sequent, ProofTree] = {}
+        bottom = BOTTOM()
+        done: Dict[tuple, ProofTree] = {}
+        stack = [(proof, contexto, resolvente, False)]
+        while stack:
+            node, ctx, goal, expanded = stack.pop()
+            key = (id(node), ctx, goal)
+            if key in done:
+                continue
+            regla, testigos, hijos = node
+            premisas = _premisas(regla, testigos, ctx, goal, self.extend)
+            if len(premisas) != len(hijos):
+                raise ValueError(f"rule '{regla.value}' opens {len(premisas)} steps, "
+                                 f"the proof gives {len(hijos)}")
+            if not expanded:
+                stack.append((node, ctx, goal, True))
+                stack.extend((hijo, c, g, False) for hijo, (c, g) in zip(hijos, premisas))
+                continue
+            nuevos = tuple(done[(id(hijo), c, g)] for hijo, (c, g) in zip(hijos, premisas))
+            result = self._reduce(regla, testigos, nuevos, ctx, goal)
+            if goal in ctx:
+                result = self.axiom
+            elif goal is not bottom and bottom in ctx and self.size(result) > 2:
+                result = self.node(LogicRules.BOTTOM_ELIMINATION, (), (self.axiom,))
+            current = best.get((ctx, goal))
+            if current is None or self.size(result) < self.size(current):
+                best[(ctx, goal)] = result
+            else:
+                result = current
+            done[key] = result
+        return self._rebuild(contexto, resolvente, done[(id(proof), contexto, resolvente)], best)
+
+    def _rebuild(self, contexto: Contexto, resolvente: Prop, proof: ProofTree,
+                 best: Dict[Sequent, ProofTree]) -> ProofTree:
+        # Cada secuente toma la prueba más chica que se vio de él, salvo que esa prueba
+        # pase otra vez por el mismo secuente (se usa entonces la que ya tenía)
+        done: Dict[tuple, ProofTree] = {}
+        activos = set()
+        stack = [(proof, contexto, resolvente, False)]
+        while stack:
+            node, ctx, goal, expanded = stack.pop()
+            if not expanded:
+                candidate = best.get((ctx, goal), node)
+                if (ctx, goal) not in activos:
+                    node = candidate
+                if (id(node), ctx, goal) in done:
+                    continue
+                activos.add((ctx, goal))
+                stack.append((node, ctx, goal, True))
+                regla, testigos, hijos = node
+                stack.extend((hijo, c, g, False)
+                             for hijo, (c, g) in zip(hijos, _premisas(regla, testigos, ctx, goal, self.extend)))
+                continue
+            activos.discard((ctx, goal))
+            regla, testigos, hijos = node
+            premisas = _premisas(regla, testigos, ctx, goal, self.extend)
+            nuevos = []
+            for hijo, (c, g) in zip(hijos, premisas):
+                elegido = best.get((c, g), hijo)
+                nuevos.append(done.get((id(elegido), c, g)) or done[(id(hijo), c, g)])
+            done[(id(node), ctx, goal)] = self.node(regla, testigos, tuple(nuevos))
+        root = best.get((contexto, resolvente), proof)
+        return done[(id(root), contexto, resolvente)]
+
+    def _reduce(self, regla: LogicRules, testigos: Tuple[Prop, ...], hijos: Tuple[ProofTree, ...],
+                contexto: Contexto, goal: Prop) -> ProofTree:
+        original = self.node(regla, testigos, hijos)
+        reduced = None
+        match regla:
+            case LogicRules.AND_ELIMINATION_1 if hijos[0][0] is LogicRules.AND_INTRODUCTION:
+                reduced = hijos[0][2][0]
+            case LogicRules.AND_ELIMINATION_2 if hijos[0][0] is LogicRules.AND_INTRODUCTION:
+                reduced = hijos[0][2][1]
+            case LogicRules.IMPLICATION_ELIMINATION if hijos[1][0] is LogicRules.IMPLICATION_INTRODUCTION:
+                tau, = testigos
+                reduced = self._substitute(hijos[1][2][0], contexto, goal, tau, hijos[0])
+            case LogicRules.NEGATION_ELIMINATION if hijos[1][0] is LogicRules.NEGATION_INTRODUCTION:
+                a, = testigos
+                reduced = self._substitute(hijos[1][2][0], contexto, goal, a, hijos[0])
+            case LogicRules.OR_ELIMINATION if hijos[0][0] is LogicRules.OR_INTRODUCTION_1:
+                reduced = self._substitute(hijos[1], contexto, goal, testigos[0], hijos[0][2][0])
+            case LogicRules.OR_ELIMINATION if hijos[0][0] is LogicRules.OR_INTRODUCTION_2:
+                reduced = self._substitute(hijos[2], contexto, goal, testigos[1], hijos[0][2][0])
+            case LogicRules.NEGATION_NEGATION_ELIMINATION if hijos[0][0] is LogicRules.NEGATION_NEGATION_INTRODUCTION:
+                reduced = hijos[0][2][0]
+            case LogicRules.MODUS_TOLLENS if hijos[0][0] is LogicRules.IMPLICATION_INTRODUCTION:
+                reduced = self.node(LogicRules.NEGATION_INTRODUCTION, (), hijos[0][2])
+        if reduced is not None and self.size(reduced) < self.size(original):
+            return reduced
+        return original
+
+    def _substitute(self, body: ProofTree, contexto: Contexto, goal: Prop, hipotesis: Prop,
+                    replacement: ProofTree) -> ProofTree:
+        """
+        Turns `body`, a proof of `contexto, hipotesis ⊢ goal`, into a proof of
+        `contexto ⊢ goal` by putting `replacement` (a proof of `contexto ⊢ hipotesis`)
+        in place of its Axiom steps on `hipotesis`. The contexts only grow going up
+        the proof, so `replacement` is valid wherever it lands.
+        """
+        if hipotesis in contexto:
+            return body
+        done: Dict[tuple, ProofTree] = {}
+        extendido = self.extend(contexto, hipotesis)
+        stack = [(body, extendido, goal, False)]
+        while stack:
+            node, ctx, g, expanded = stack.pop()
+            key = (id(node), ctx, g)
+            if key in done:
+                continue
+            regla, testigos, hijos = node
+            if regla is LogicRules.AXIOM and g is hipotesis:
+                done[key] = replacement
+                continue
+            premisas = _premisas(regla, testigos, ctx, g, self.extend)
+            if not expanded:
+                stack.append((node, ctx, g, True))
+                stack.extend((hijo, c, p, False) for hijo, (c, p) in zip(hijos, premisas))
+                continue
+            done[key] = self.node(regla, testigos,
+                                  tuple(done[(id(hijo), c, p)] for hijo, (c, p) in zip(hijos, premisas)))
+        return done[(id(body), extendido, goal)]
+
+
+def normalize(contexto: Iterable[Prop], resolvente: Prop, proof: ProofTree) -> ProofTree:
+    """
+    Returns a proof of `contexto ⊢ resolvente` no larger than `proof`, without
+    detours and with the repeated subgoals merged (see the module docstring).
+
+    Raises:
+        ValueError: If a rule of `proof` has the wrong number of premises.
+    """
+    contexto = contexto if isinstance(contexto, Contexto) else Contexto(contexto)
+    normalizer = _Normalizer()
+    size = tree_size(proof)
+    for _ in range(_MAX_ROUNDS):
+        nuevo = normalizer.run(contexto, resolvente, proof)
+        nuevo_size = normalizer.size(nuevo)
+        if nuevo_size > size:
+            break
+        proof, size, changed = nuevo, nuevo_size, nuevo_size < size
+        if not changed:
+            break
+    return proof
+
+
+def proof_tree(resolver: Resolver, num_pos: int = 0) -> ProofTree:
+    """
+    Returns the proof below step `num_pos` of `resolver` as a ProofTree.
+
+    Raises:
+        ValueError: If a step of that proof is still open.
+    """
+    store = resolver.pasos
+    subarbol = []
+    stack = [num_pos]
+    while stack:
+        idx = stack.pop()
+        if store.regla(idx) is None:
+            raise ValueError(f"step {idx} is still open")
+        subarbol.append(idx)
+        stack.extend(store.hijos(idx))
+    # Los hijos siempre tienen índices mayores que su padre
+    nodes: Dict[int, ProofTree] = {}
+    for idx in sorted(subarbol, reverse=True):
+        regla = store.regla(idx)
+        testigos = ()
+        if regla in REGLAS_CON_TESTIGOS:
+            testigos = testigos_for(regla, store.resolvente(store.first_child[idx]))
+        nodes[idx] = (regla, testigos, tuple(nodes[hijo] for hijo in store.hijos(idx)))
+    return nodes[num_pos]
+
+
+def normalize_resolver(resolver: Resolver) -> Resolver:
+    """
+    Returns a new, normalized Resolver with the proof of a complete `resolver`.
+
+    Raises:
+        ValueError: If `resolver` has open steps.
+    """
+    store = resolver.pasos
+    contexto, resolvente = store.contexto(0), store.resolvente(0)
+    proof = normalize(contexto, resolvente, proof_tree(resolver))
+    return build_resolver(contexto, resolvente, proof, resolver.modo)
+
+
+# --- Lemma cache ---
+@dataclass(frozen=True)
+class Lemma:
+    """
+    A proof of `contexto ⊢ resolvente`, which also proves the same resolvent under any
+    larger context.
+    """
+    contexto: Tuple[Prop, ...]
+    resolvente: Prop
+    proof: ProofTree
+    size: int
+    clasico: bool
+
+
+def _encode(proof: ProofTree) -> List[list]:
+    # Nodos en postorden, cada uno con los índices de sus hijos: el DAG se conserva
+    indices: Dict[int, int] = {}
+    nodes = []
+    stack = [(proof, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if id(node) in indices:
+            continue
+        if not expanded:
+            stack.append((node, True))
+            stack.extend((hijo, False) for hijo in node[2] if id(hijo) not in indices)
+            continue
+        regla, testigos, hijos = node
+        indices[id(node)] = len(nodes)
+        nodes.append([regla.value, [pretty_print(t, minimal=True) for t in testigos],
+                      [indices[id(hijo)] for hijo in hijos]])
+    return nodes
+
+
+def _decode(nodes: List[list]) -> ProofTree:
+    built = []
+    for regla, testigos, hijos in nodes:
+        if not all(0 <= hijo < len(built) for hijo in hijos):
+            raise ValueError("a node refers to a later one")
+        built.append((RULES_BY_TOKEN[regla], tuple(parse_formula(t) for t in testigos),
+                      tuple(built[hijo] for hijo in hijos)))
+    return built[-1]
+
+
+class LemmaCache:
+    """
+    Proven sequents, looked up by resolvent.
+
+    A lemma `Γ ⊢ φ` closes every goal `Δ ⊢ φ` with Γ ⊆ Δ. Lemmas are normalized when
+    added. With a `path`, the lemmas in the file are loaded and every new one is
+    appended to it; the lemmas of a resolvent are parsed, and replayed to check them,
+    the first time that resolvent is looked up.
+
+    Args:
+        path (str): JSON-lines file to load from and append to, or None to keep the
+            lemmas in memory only.
+    """
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.hits = 0
+        self._lemmas: Dict[Prop, List[Lemma]] = {}
+        self._pending: Dict[str, List[dict]] = {}
+        self._file = None
+        if path is not None and os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # Una línea cortada (p. ej. por una escritura interrumpida)
+                        continue
+                    if isinstance(record, dict) and isinstance(record.get("resolvente"), str):
+                        self._pending.setdefault(record["resolvente"], []).append(record)
+
+    def __len__(self) -> int:
+        return sum(map(len, self._lemmas.values())) + sum(map(len, self._pending.values()))
+
+    def lookup(self, contexto: Iterable[Prop], resolvente: Prop, clasico: bool = True) -> Optional[ProofTree]:
+        """
+        Returns the smallest known proof of `resolvente` under a part of `contexto`, or
+        None. Without `clasico`, lemmas that use REGLAS_CLASICAS are skipped.
+        """
+        lemma = self._find(contexto, resolvente, clasico)
+        if lemma is None:
+            return None
+        self.hits += 1
+        return lemma.proof
+
+    def add(self, contexto: Iterable[Prop], resolvente: Prop, proof: ProofTree) -> ProofTree:
+        """
+        Normalizes `proof` and keeps it as a lemma, unless a proof at least as small is
+        already known. Returns the proof kept.
+        """
+        contexto = contexto if isinstance(contexto, Contexto) else Contexto(contexto)
+        proof = normalize(contexto, resolvente, proof)
+        lemma = Lemma(tuple(contexto), resolvente, proof, tree_size(proof), uses_classical_rules(proof))
+        known = self._find(contexto, resolvente, lemma.clasico)
+        if known is not None and known.size <= lemma.size:
+            return known.proof
+        self._insert(lemma)
+        if self.path is not None:
+            if self._file is None:
+                self._file = open(self.path, 'a', encoding='utf-8')
+            record = {"contexto": [pretty_print(f, minimal=True) for f in lemma.contexto],
+                      "resolvente": pretty_print(resolvente, minimal=True),
+                      "clasico": lemma.clasico, "nodos": _encode(proof)}
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._file.flush()
+        return proof
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "LemmaCache":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _find(self, contexto: Iterable[Prop], resolvente: Prop, clasico: bool) -> Optional[Lemma]:
+        if self._pending:
+            records = self._pending.pop(pretty_print(resolvente, minimal=True), None)
+            if records:
+                self._load(resolvente, records)
+        candidates = self._lemmas.get(resolvente)
+        if not candidates:
+            return None
+        if not isinstance(contexto, Contexto):
+            contexto = Contexto(contexto)
+        for lemma in candidates:
+            if (clasico or not lemma.clasico) and all(f in contexto for f in lemma.contexto):
+                return lemma
+        return None
+
+    def _insert(self, lemma: Lemma) -> None:
+        # De menor a mayor, así la primera que sirve es la más chica
+        lemmas = self._lemmas.setdefault(lemma.resolvente, [])
+        lemmas.append(lemma)
+        lemmas.sort(key=lambda l: l.size)
+
+    def _load(self, resolvente: Prop, records: List[dict]) -> None:
+        for record in records:
+            try:
+                contexto = [parse_formula(f) for f in record["contexto"]]
+                proof = _decode(record["nodos"])
+                clasico = uses_classical_rules(proof)
+                modo = LogicMode.CLASSICAL if clasico else LogicMode.INTUITIONISTIC
+                if not build_resolver(contexto, resolvente, proof, modo).isProofComplete():
+                    continue
+            except (KeyError, TypeError, ValueError, RuntimeError):
+                # Un lema que no se puede leer o no se reproduce no se usa
+                continue
+            self._insert(Lemma(tuple(contexto), resolvente, proof, tree_size(proof), clasico))
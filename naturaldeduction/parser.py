@@ -0,0 +1,282 @@
+"""
+Parsing of formulas, formula lists and sequents, and the prompts that read them.
+"""
+import os
+import re
+from typing import Iterable, Iterator, List, Tuple, Union
+
+from .formulas import AND, BOTTOM, IMPLIES, NEG, OR, VAR, Prop
+from .rules import LogicMode
+
+# --- Helper Functions for User Input Parsing (from previous interactions) ---
+_TOKEN_RE = re.compile(r"""\s*(?:
+    (?P<op>¬|~|!|∧|&|∨|\||→|⇒|->|=>|⊥|\(|\)|,)
+  | (?P<str>"[^"]*"|'[^']*')
+  | (?P<ident>[\w']+)
+)""", re.VERBOSE)
+
+_TURNSTILE_RE = re.compile(r"⊢|\|-")
+
+# Alias ASCII aceptados por el tokenizador
+_OP_ALIASES = {'~': '¬', '!': '¬', '&': '∧', '|': '∨', '⇒': '→', '->': '→', '=>': '→'}
+
+# Precedencia de los conectivos: ¬ liga más fuerte, → es asociativo a derecha
+_PRECEDENCE = {'¬': 4, '∧': 3, '∨': 2, '→': 1}
+_BINARY_CONSTRUCTORS = {'∧': AND, '∨': OR, '→': IMPLIES}
+_CALL_CONSTRUCTORS = {'NEG': (NEG, 1), 'AND': (AND, 2), 'OR': (OR, 2), 'IMPLIES': (IMPLIES, 2)}
+
+
+def _abbreviate(expr: str, limit: int = 80) -> str:
+    return expr if len(expr) <= limit else expr[:limit - 3] + '...'
+
+
+def _tokenize(expr: str) -> List[Tuple[str, str, int]]:
+    """
+    Splits `expr` into (kind, value, position) tokens, where kind is 'op', 'str' or 'ident'.
+    """
+    tokens = []
+    pos = 0
+    end = len(expr.rstrip())
+    match_token = _TOKEN_RE.match
+    while pos < end:
+        m = match_token(expr, pos)
+        if m is None:
+            pos = end - len(expr[pos:end].lstrip())
+            raise ValueError(f"unexpected character {expr[pos]!r} at position {pos}")
+        kind = m.lastgroup
+        value = m.group(kind)
+        if kind == 'op':
+            value = _OP_ALIASES.get(value, value)
+        elif kind == 'str':
+            value = value[1:-1]
+        tokens.append((kind, value, m.start(kind)))
+        pos = m.end()
+    return tokens
+
+
+def _reduce(op: str, operands: List[Prop]) -> None:
+    if op == '¬':
+        operands[-1] = NEG(operands[-1])
+    else:
+        right = operands.pop()
+        operands[-1] = _BINARY_CONSTRUCTORS[op](operands[-1], right)
+
+
+def _parse_tokens(tokens: List[Tuple[str, str, int]], as_list: bool = False):
+    """
+    Operator-precedence parser over the token list. It keeps explicit operand and
+    operator stacks, so its depth is not bounded by the recursion limit and it runs
+    in time linear in the number of tokens. With `as_list=True` top-level commas
+    separate formulas and the list of all of them is returned.
+
+    Entries of the operator stack are connectives ('¬', '∧', '∨', '→'), '(' for a
+    parenthesized group, or a list [constructor, arity, operand_base] for a
+    constructor call such as IMPLIES(..., ...).
+    """
+    operands: List[Prop] = []
+    ops: list = []
+    expect_operand = True
+    i = 0
+    n = len(tokens)
+
+    def expect(value: str, at: int) -> None:
+        if at >= n or tokens[at][0] != 'op' or tokens[at][1] != value:
+            where = f"position {tokens[at][2]}" if at < n else "end of input"
+            raise ValueError(f"expected '{value}' at {where}")
+
+    while i < n:
+        kind, value, pos = tokens[i]
+        if expect_operand:
+            if kind == 'ident':
+                followed_by_paren = i + 1 < n and tokens[i + 1][0] == 'op' and tokens[i + 1][1] == '('
+                if followed_by_paren and value == 'VAR':
+                    if i + 2 >= n or tokens[i + 2][0] == 'op':
+                        raise ValueError(f"expected a variable name at position {pos}")
+                    expect(')', i + 3)
+                    operands.append(VAR(tokens[i + 2][1]))
+                    i += 4
+                    expect_operand = False
+                    continue
+                if followed_by_paren and value == 'BOTTOM':
+                    expect(')', i + 2)
+                    operands.append(BOTTOM())
+                    i += 3
+                    expect_operand = False
+                    continue
+                if followed_by_paren and value in _CALL_CONSTRUCTORS:
+                    constructor, arity = _CALL_CONSTRUCTORS[value]
+                    ops.append([constructor, arity, len(operands)])
+                    i += 2
+                    continue
+                operands.append(VAR(value))
+                expect_operand = False
+            elif kind == 'op' and value == '⊥':
+                operands.append(BOTTOM())
+                expect_operand = False
+            elif kind == 'op' and value in ('¬', '('):
+                ops.append(value)
+            else:
+                raise ValueError(f"expected a formula at position {pos}, found {value!r}")
+        else:
+            if kind == 'op' and value in _BINARY_CONSTRUCTORS:
+                prec = _PRECEDENCE[value]
+                right_assoc = value == '→'
+                while ops and type(ops[-1]) is str and ops[-1] != '(':
+                    top_prec = _PRECEDENCE[ops[-1]]
+                    if top_prec < prec or (top_prec == prec and right_assoc):
+                        break
+                    _reduce(ops.pop(), operands)
+                ops.append(value)
+                expect_operand = True
+            elif kind == 'op' and value in (')', ','):
+                while ops and type(ops[-1]) is str and ops[-1] != '(':
+                    _reduce(ops.pop(), operands)
+                if not ops and value == ',' and as_list:
+                    expect_operand = True
+                    i += 1
+                    continue
+                if not ops or (value == ',' and ops[-1] == '('):
+                    raise ValueError(f"unexpected {value!r} at position {pos}")
+                if ops[-1] == '(':
+                    ops.pop()
+                else:
+                    constructor, arity, base = ops[-1]
+                    count = len(operands) - base
+                    if value == ',':
+                        if count >= arity:
+                            raise ValueError(f"too many arguments for {constructor.__name__} at position {pos}")
+                        expect_operand = True
+                    else:
+                        if count != arity:
+                            raise ValueError(f"{constructor.__name__} expects {arity} arguments, got {count}")
+                        args = operands[base:]
+                        del operands[base:]
+                        operands.append(constructor(*args))
+                        ops.pop()
+            else:
+                raise ValueError(f"expected a connective or ')' at position {pos}, found {value!r}")
+        i += 1
+
+    if expect_operand:
+        if as_list and not tokens:
+            return []
+        raise ValueError("unexpected end of input")
+    while ops:
+        op = ops.pop()
+        if type(op) is not str or op == '(':
+            raise ValueError("missing ')'")
+        _reduce(op, operands)
+    return operands if as_list else operands[0]
+
+
+def parse_formula(expr: str) -> Prop:
+    """
+    Parses a formula written either with the constructors (e.g. 'IMPLIES(VAR("P"), VAR("Q"))')
+    or in the infix notation produced by `pretty_print` (e.g. '(P → Q)'), or a mix of both.
+
+    Connectives, from tightest to loosest: ¬ (also ~, !), ∧ (&), ∨ (|), → (->, =>, ⇒).
+    ∧ and ∨ associate to the left and → to the right. ⊥ or BOTTOM() is falsity and any
+    other identifier is a propositional variable.
+    """
+    try:
+        return _parse_tokens(_tokenize(expr))
+    except ValueError as e:
+        raise ValueError(f"Error parsing formula '{_abbreviate(expr)}': {e}") from None
+
+
+def parse_formula_list(expr: str) -> List[Prop]:
+    """
+    Parses a comma-separated list of formulas, such as the context printed by
+    `Paso.toString`. An empty (or blank) string is the empty list.
+    """
+    try:
+        return _parse_tokens(_tokenize(expr), as_list=True)
+    except ValueError as e:
+        raise ValueError(f"Error parsing formulas '{_abbreviate(expr)}': {e}") from None
+
+
+def parse_sequent(expr: str) -> Tuple[List[Prop], Prop]:
+    """
+    Parses a sequent 'Γ ⊢ σ' (or 'Γ |- σ') in the format of `Paso.toString` and returns
+    the context as a list together with the resolvent.
+    """
+    parts = _TURNSTILE_RE.split(expr)
+    if len(parts) != 2:
+        raise ValueError(f"Error parsing sequent '{_abbreviate(expr)}': expected exactly one '⊢'")
+    return parse_formula_list(parts[0]), parse_formula(parts[1])
+
+
+def parse_many(source: Union[str, os.PathLike, Iterable[str]]) -> Iterator[Prop]:
+    """
+    Lazily parses one formula per line. `source` is either a path to a text file or any
+    iterable of lines (an open file, a list of strings...). Blank lines and lines starting
+    with '#' are skipped.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, encoding='utf-8') as f:
+            yield from parse_many(f)
+        return
+    for line_number, line in enumerate(source, start=1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        try:
+            yield parse_formula(line)
+        except ValueError as e:
+            raise ValueError(f"line {line_number}: {e}") from None
+
+def getContext() -> List[Prop]:
+    print("Enter context propositions (e.g., 'P', 'P → Q', 'IMPLIES(VAR(\"P\"), VAR(\"Q\"))'). Empty line to finish:")
+    context = []
+    while True:
+        try:
+            user_input = input("> ").strip()
+            if not user_input:
+                break
+            prop = parse_formula(user_input)
+            context.append(prop)
+        except ValueError as e:
+            print(f"Invalid input: {e}. Please try again.")
+    return context
+
+def getResolvent() -> Prop:
+    print("Enter the resolvent proposition (e.g., 'R', 'A ∧ ¬B', 'AND(VAR(\"A\"), NEG(VAR(\"B\")))'):")
+    while True:
+        try:
+            user_input = input("> ").strip()
+            if not user_input:
+                print("Resolvent cannot be empty.")
+                continue
+            prop = parse_formula(user_input)
+            return prop
+        except ValueError as e:
+            print(f"Invalid input: {e}. Please try again.")
+
+def getFormula() -> Prop:
+    """
+    Prompts the user to input a formula and parses it into a Prop object.
+    """
+    print("Enter a formula (e.g., 'P', 'A ∧ B', 'AND(VAR(\"A\"), VAR(\"B\"))'):")
+    while True:
+        try:
+            user_input = input("> ").strip()
+            if not user_input:
+                print("Formula cannot be empty.")
+                continue
+            return parse_formula(user_input)
+        except ValueError as e:
+            print(f"Invalid input: {e}. Please try again.")
+
+def getLogicMode() -> LogicMode:
+    """
+    Prompts the user for the logic of the proof; classical by default.
+    """
+    print("Enter the logic ('classical' or 'intuitionistic', empty for classical):")
+    while True:
+        user_input = input("> ").strip().lower()
+        if not user_input:
+            return LogicMode.CLASSICAL
+        for modo in LogicMode:
+            if modo.value.startswith(user_input):
+                return modo
+        print("Invalid logic. Please try again.")
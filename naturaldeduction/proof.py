@@ -0,0 +1,362 @@
+"""
+Proof steps: Paso, the columnar ProofStore that holds them, the applicability check of
+the rules and the rule suggestions.
+"""
+from array import array
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Dict, List, Tuple, Union
+
+from .contexto import Contexto
+from .formulas import AND, BOTTOM, IMPLIES, NEG, OR, Prop, pretty_print
+from .rules import LogicMode, LogicRules, reglasPermitidas
+
+# --- Paso Class (as per your previous context) ---
+@dataclass
+class Paso:
+    contexto: Contexto
+    resolvente: Prop
+
+    def __post_init__(self):
+        # Las asunciones se validan una sola vez, al agregarlas al Contexto
+        if not isinstance(self.contexto, Contexto):
+            self.contexto = Contexto(self.contexto)
+        # Ensure resolvente is a Prop
+        if not isinstance(self.resolvente, Prop):
+            raise TypeError("'resolvente' must be an instance of Prop.")
+
+    def toString(self) -> str:
+        contexto_str = ', '.join(pretty_print(prop) for prop in self.contexto)
+        return f"{contexto_str} ⊢ {pretty_print(self.resolvente)}"
+
+    def isInTheContext(self, proposition: Prop) -> bool:
+        # Devuelve true si la proposición está en el contexto
+        return proposition in self.contexto
+
+# --- Proof Store ---
+_RULES = tuple(LogicRules)
+# Indexado por id(): los miembros del Enum son únicos y Enum.__hash__ es Python puro
+_RULE_CODES = {id(regla): code for code, regla in enumerate(_RULES)}
+_NO_RULE = -1
+
+
+class ProofStore:
+    """
+    Columnar storage for the steps of a proof.
+
+    Every distinct resolvent and context is stored once, in a table, and each step is
+    one row of `array` columns: its parent, the code of the rule applied to it, the ids
+    of its resolvent and context, and the range of its children. A rule application
+    always appends its premises together, so a step's children are the contiguous rows
+    `first_child .. first_child + num_children - 1`. A step costs 18 bytes plus its
+    share of the distinct formulas and contexts.
+    """
+    __slots__ = ('_formulas', '_formula_ids', '_contexts', '_context_ids',
+                 'parent', 'rule', 'resolvent', 'context', 'first_child', 'num_children')
+
+    def __init__(self):
+        # Fórmulas y contextos se indexan por id(): las fórmulas están internadas, las
+        # celdas de contexto compartidas ya se reutilizan, y las tablas las mantienen vivas
+        self._formulas: List[Prop] = []
+        self._formula_ids: Dict[int, int] = {}
+        self._contexts: List[Contexto] = []
+        self._context_ids: Dict[int, int] = {}
+        self.parent = array('i')
+        self.rule = array('b')
+        self.resolvent = array('i')
+        self.context = array('i')
+        self.first_child = array('i')
+        self.num_children = array('b')
+
+    def __len__(self) -> int:
+        return len(self.parent)
+
+    @classmethod
+    def from_columns(cls, formulas: List[Prop], contextos: List[Contexto], parent: array, rule: array,
+                     resolvent: array, context: array, first_child: array, num_children: array) -> "ProofStore":
+        """
+        Builds a store from already encoded columns, whose resolvent and context ids
+        index `formulas` and `contextos`.
+        """
+        store = cls()
+        store._formulas = list(formulas)
+        store._formula_ids = {id(prop): fid for fid, prop in enumerate(store._formulas)}
+        store._contexts = list(contextos)
+        store._context_ids = {id(contexto): cid for cid, contexto in enumerate(store._contexts)}
+        store.parent, store.rule, store.resolvent = parent, rule, resolvent
+        store.context, store.first_child, store.num_children = context, first_child, num_children
+        return store
+
+    @property
+    def formulas(self) -> List[Prop]:
+        """
+        The formula table: resolvent id -> Prop.
+        """
+        return self._formulas
+
+    @property
+    def contextos(self) -> List[Contexto]:
+        """
+        The context table: context id -> Contexto.
+        """
+        return self._contexts
+
+    def append(self, contexto: Contexto, resolvente: Prop, padre: int) -> int:
+        """
+        Adds an open step (no rule applied yet) and returns its index. The root's
+        parent is -1.
+        """
+        fid = self._formula_ids.get(id(resolvente))
+        if fid is None:
+            fid = self._formula_ids[id(resolvente)] = len(self._formulas)
+            self._formulas.append(resolvente)
+        cid = self._context_ids.get(id(contexto))
+        if cid is None:
+            cid = self._context_ids[id(contexto)] = len(self._contexts)
+            self._contexts.append(contexto)
+        self.parent.append(padre)
+        self.rule.append(_NO_RULE)
+        self.resolvent.append(fid)
+        self.context.append(cid)
+        self.first_child.append(-1)
+        self.num_children.append(0)
+        return len(self.parent) - 1
+
+    def expand(self, idx: int, regla: LogicRules, nuevos_pasos: List[Paso]) -> range:
+        """
+        Records that `regla` was applied to step `idx` and appends one open step per
+        premise in `nuevos_pasos`. Returns the indices of the new steps.
+        """
+        first = len(self.parent)
+        self.rule[idx] = _RULE_CODES[id(regla)]
+        if nuevos_pasos:
+            self.first_child[idx] = first
+            self.num_children[idx] = len(nuevos_pasos)
+        formulas, formula_ids = self._formulas, self._formula_ids
+        contexts, context_ids = self._contexts, self._context_ids
+        for paso in nuevos_pasos:
+            resolvente, contexto = paso.resolvente, paso.contexto
+            fid = formula_ids.get(id(resolvente))
+            if fid is None:
+                fid = formula_ids[id(resolvente)] = len(formulas)
+                formulas.append(resolvente)
+            cid = context_ids.get(id(contexto))
+            if cid is None:
+                cid = context_ids[id(contexto)] = len(contexts)
+                contexts.append(contexto)
+            self.parent.append(idx)
+            self.rule.append(_NO_RULE)
+            self.resolvent.append(fid)
+            self.context.append(cid)
+            self.first_child.append(-1)
+            self.num_children.append(0)
+        return range(first, len(self.parent))
+
+    def reopen(self, idx: int) -> None:
+        """
+        Forgets the rule applied to step `idx`. The steps it opened stay until `truncate`
+        removes them.
+        """
+        self.rule[idx] = _NO_RULE
+        self.first_child[idx] = -1
+        self.num_children[idx] = 0
+
+    def truncate(self, length: int, formulas: int, contextos: int) -> None:
+        """
+        Drops every step from `length` on, and the formulas and contexts past the first
+        `formulas` and `contextos` entries of their tables.
+        """
+        for column in (self.parent, self.rule, self.resolvent, self.context, self.first_child, self.num_children):
+            del column[length:]
+        for table, ids, keep in ((self._formulas, self._formula_ids, formulas),
+                                 (self._contexts, self._context_ids, contextos)):
+            for dropped in table[keep:]:
+                del ids[id(dropped)]
+            del table[keep:]
+
+    def resolvente(self, idx: int) -> Prop:
+        return self._formulas[self.resolvent[idx]]
+
+    def contexto(self, idx: int) -> Contexto:
+        return self._contexts[self.context[idx]]
+
+    def regla(self, idx: int) -> Union[LogicRules, None]:
+        code = self.rule[idx]
+        return None if code == _NO_RULE else _RULES[code]
+
+    def padre(self, idx: int) -> int:
+        return self.parent[idx]
+
+    def hijos(self, idx: int) -> range:
+        """
+        Indices of the steps opened by the rule applied to `idx`.
+        """
+        first = self.first_child[idx]
+        return range(first, first + self.num_children[idx]) if first >= 0 else range(0)
+
+    def paso(self, idx: int) -> Paso:
+        # Lo guardado ya fue validado al crear el paso: no se repite __post_init__
+        paso = object.__new__(Paso)
+        paso.contexto = self._contexts[self.context[idx]]
+        paso.resolvente = self._formulas[self.resolvent[idx]]
+        return paso
+
+    def nbytes(self) -> int:
+        """
+        Bytes used by the step columns (the formulas and contexts are not counted).
+        """
+        return sum(column.itemsize * len(column) for column in
+                   (self.parent, self.rule, self.resolvent, self.context, self.first_child, self.num_children))
+
+
+class PasosView(Sequence):
+    """
+    Read-only view of a ProofStore as the historical list of (Paso, parent_index,
+    rule_applied) tuples, built on access. The root's parent reads as 0.
+    """
+    __slots__ = ('_store',)
+
+    def __init__(self, store: ProofStore):
+        self._store = store
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def __getitem__(self, index):
+        store = self._store
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(store)))]
+        if index < 0:
+            index += len(store)
+        if not 0 <= index < len(store):
+            raise IndexError("step index out of range")
+        return (store.paso(index), max(store.parent[index], 0), store.regla(index))
+
+
+def esReglaAplicable(paso: Paso, regla: LogicRules) -> bool:
+    """
+    Checks if a given step 'paso' has the correct structure
+    to be the conclusion of the specified 'regla' (rule).
+    It also checks if the proposition in 'paso.resolvente' itself is an axiom within the given context.
+    """
+    prop = paso.resolvente
+    context = paso.contexto
+
+    match regla:
+        case LogicRules.AXIOM:
+            return prop in context  # Check if the proposition is in the provided context
+
+        case LogicRules.AND_INTRODUCTION:
+            return isinstance(prop, AND)
+
+        case LogicRules.AND_ELIMINATION_1 | LogicRules.AND_ELIMINATION_2 | \
+             LogicRules.IMPLICATION_ELIMINATION | LogicRules.OR_ELIMINATION | \
+             LogicRules.BOTTOM_ELIMINATION | LogicRules.NEGATION_NEGATION_ELIMINATION | \
+             LogicRules.PBC:
+            # These rules can conclude any proposition type, so their conclusion's structure
+            # itself doesn't restrict applicability. The actual premises are key.
+            return True
+
+        case LogicRules.IMPLICATION_INTRODUCTION:
+            return isinstance(prop, IMPLIES)
+
+        case LogicRules.OR_INTRODUCTION_1 | LogicRules.OR_INTRODUCTION_2:
+            return isinstance(prop, OR)
+
+        case LogicRules.NEGATION_INTRODUCTION | LogicRules.MODUS_TOLLENS:
+            return isinstance(prop, NEG)
+
+        case LogicRules.NEGATION_ELIMINATION:
+            return isinstance(prop, BOTTOM)
+
+        case LogicRules.NEGATION_NEGATION_INTRODUCTION:
+            return isinstance(prop, NEG) and isinstance(prop.prop, NEG)
+
+        case LogicRules.EXCLUDED_MIDDLE:
+            return isinstance(prop, OR) and \
+                   isinstance(prop.right, NEG) and \
+                   prop.left == prop.right.prop
+
+        case _:
+            raise ValueError(f"Regla no reconocida o no implementada: {regla.value}")
+
+
+# Cantidad de fórmulas testigo que necesita cada regla (las demás no necesitan ninguna)
+REGLAS_CON_TESTIGOS = {
+    LogicRules.AND_ELIMINATION_1: 1,
+    LogicRules.AND_ELIMINATION_2: 1,
+    LogicRules.IMPLICATION_ELIMINATION: 1,
+    LogicRules.OR_ELIMINATION: 2,
+    LogicRules.NEGATION_ELIMINATION: 1,
+}
+
+
+# --- Rule Suggestions ---
+@dataclass(frozen=True)
+class Suggestion:
+    """
+    A rule that can be applied to a step.
+
+    Attributes:
+        regla (LogicRules): The rule.
+        testigos (tuple): For the rules in REGLAS_CON_TESTIGOS, the candidate witness
+            tuples, best first; each one can be passed as `*testigos` to
+            `Resolver.aplicarRegla`. Empty for the other rules.
+    """
+    regla: LogicRules
+    testigos: Tuple[Tuple[Prop, ...], ...] = ()
+
+
+# Orden de las sugerencias: primero lo que cierra el paso, después las introducciones
+# dictadas por la forma del resolvente, las eliminaciones con testigos en el contexto y
+# por último las reglas que siempre se pueden intentar
+_CIERRAN = (LogicRules.AXIOM, LogicRules.EXCLUDED_MIDDLE)
+_GENERICAS = (LogicRules.BOTTOM_ELIMINATION, LogicRules.NEGATION_NEGATION_ELIMINATION, LogicRules.PBC)
+
+
+def suggest(paso: Paso, modo: LogicMode = LogicMode.CLASSICAL) -> List[Suggestion]:
+    """
+    Returns the rules of `modo` that are structurally applicable to `paso`, with
+    ranked witness candidates for the rules that need them.
+
+    The candidates come from the step's `Contexto.rule_index`, so the cost depends on
+    the number of matches and not on the size of the context: →E offers every τ with
+    a reachable τ → σ, ∧E1/∧E2 the other side of every reachable conjunction with σ,
+    ¬E every A with a reachable ¬A, and ∨E the sides of every reachable disjunction.
+    Candidates that are assumptions come first, then those reachable by eliminations,
+    then those that occur in more assumptions, then the smaller ones.
+    """
+    contexto, sigma = paso.contexto, paso.resolvente
+    index = contexto.rule_index
+
+    def rank(formula: Prop) -> tuple:
+        return (formula not in contexto, not index.reaches(formula), -index.occurrences(formula), formula.size)
+
+    candidatos: Dict[LogicRules, list] = {
+        LogicRules.AND_ELIMINATION_1: sorted(((b,) for b in index.right_conjuncts_of(sigma)),
+                                             key=lambda t: rank(AND(sigma, t[0]))),
+        LogicRules.AND_ELIMINATION_2: sorted(((a,) for a in index.left_conjuncts_of(sigma)),
+                                             key=lambda t: rank(AND(t[0], sigma))),
+        LogicRules.IMPLICATION_ELIMINATION: sorted(((tau,) for tau in index.premises_of(sigma)),
+                                                   key=lambda t: (*rank(t[0]), IMPLIES(t[0], sigma) not in contexto)),
+        LogicRules.OR_ELIMINATION: [(d.left, d.right) for d in sorted(index.disjunctions(), key=rank)],
+        LogicRules.NEGATION_ELIMINATION: sorted(((a,) for a in index.negated()), key=lambda t: rank(t[0]))
+        if type(sigma) is BOTTOM else [],
+    }
+
+    sugerencias = []
+    for regla in reglasPermitidas(modo):
+        if not esReglaAplicable(paso, regla):
+            continue
+        testigos = tuple(candidatos.get(regla, ()))
+        if regla in _CIERRAN:
+            orden = 0
+        elif regla in REGLAS_CON_TESTIGOS:
+            orden = 2 if testigos else 4
+        elif regla in _GENERICAS:
+            orden = 3 if regla is not LogicRules.BOTTOM_ELIMINATION or index.can_reach_bottom() else 4
+        else:
+            orden = 1
+        sugerencias.append((orden, Suggestion(regla, testigos)))
+    sugerencias.sort(key=lambda par: par[0])
+    return [sugerencia for _, sugerencia in sugerencias]
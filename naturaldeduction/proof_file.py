@@ -0,0 +1,402 @@
+"""
+Binary proof libraries: many proofs in one file, loaded through a memory map.
+
+Layout (little-endian, every section 8-byte aligned):
+
+    header      magic, version and the count and offset of every section
+    formulas    3 int32 per node (tag, a, b), children before parents; VAR points
+                to the string table, NEG/AND/OR/IMPLIES to other nodes
+    strings     int64 offsets (count + 1) and one UTF-8 blob
+    contexts    2 int32 per cell (newest formula, cell it extends or -1), as in
+                `Contexto`, so contexts that share a tail share its cells
+    proofs      one record per proof (name, step count, logic, column offsets)
+                followed by the ProofStore columns of every proof
+
+The formula DAG and the context cells are shared by the whole library. Opening a
+library only reads the header; formulas, contexts and steps are decoded from the
+mapped pages when they are first accessed.
+"""
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Sequence
+from typing import Dict, Iterable, List, Optional, Union
+
+from .contexto import Contexto
+from .formulas import AND, BOTTOM, IMPLIES, NEG, OR, VAR, Prop
+from .proof import Paso, ProofStore
+from .resolver import Resolver
+from .rules import LogicMode, LogicRules
+
+MAGIC = b"NDPROOF\x00"
+VERSION = 1
+
+TAG_VAR, TAG_BOTTOM, TAG_NEG, TAG_AND, TAG_OR, TAG_IMPLIES = range(6)
+_TAGS = {VAR: TAG_VAR, BOTTOM: TAG_BOTTOM, NEG: TAG_NEG, AND: TAG_AND, OR: TAG_OR, IMPLIES: TAG_IMPLIES}
+_BINARY = {TAG_AND: AND, TAG_OR: OR, TAG_IMPLIES: IMPLIES}
+_MODES = (LogicMode.CLASSICAL, LogicMode.INTUITIONISTIC)
+_RULES = tuple(LogicRules)
+
+_HEADER = struct.Struct("<8sII9Q")
+_PROOF = struct.Struct("<qqq6Q")
+# (código de array, nombre) de las columnas de un ProofStore, en el orden del archivo
+_COLUMNS = (('i', 'parent'), ('b', 'rule'), ('i', 'resolvent'), ('i', 'context'),
+            ('i', 'first_child'), ('b', 'num_children'))
+
+PathLike = Union[str, os.PathLike]
+
+
+def _little_endian(data: array) -> bytes:
+    if sys.byteorder != 'little' and data.itemsize > 1:
+        data = array(data.typecode, data)
+        data.byteswap()
+    return data.tobytes()
+
+
+class _Writer:
+    """
+    Assigns file ids to formulas, strings and context cells, sharing everything that
+    is the same object.
+    """
+    def __init__(self):
+        self.nodes = array('i')
+        self.formula_ids: Dict[int, int] = {}
+        self.strings: Dict[str, int] = {}
+        self.cells = array('i')
+        self.cell_ids: Dict[int, int] = {}
+        # Mantener vivos los objetos cuyo id() se usa como clave
+        self._alive: list = []
+
+    def string(self, text: str) -> int:
+        sid = self.strings.get(text)
+        if sid is None:
+            sid = self.strings[text] = len(self.strings)
+        return sid
+
+    def formula(self, prop: Prop) -> int:
+        ids = self.formula_ids
+        stack = [prop]
+        while stack:
+            node = stack[-1]
+            if id(node) in ids:
+                stack.pop()
+                continue
+            cls = type(node)
+            if cls is VAR:
+                record = (TAG_VAR, self.string(node.name), 0)
+            elif cls is BOTTOM:
+                record = (TAG_BOTTOM, 0, 0)
+            else:
+                children = (node.prop,) if cls is NEG else \
+                    (node.premise, node.conclusion) if cls is IMPLIES else (node.left, node.right)
+                missing = [child for child in children if id(child) not in ids]
+                if missing:
+                    stack.extend(reversed(missing))
+                    continue
+                record = (_TAGS[cls], ids[id(children[0])], ids[id(children[-1])] if len(children) == 2 else 0)
+            ids[id(node)] = len(self.nodes) // 3
+            self.nodes.extend(record)
+            self._alive.append(node)
+            stack.pop()
+        return ids[id(prop)]
+
+    def context(self, contexto: Contexto) -> int:
+        ids = self.cell_ids
+        pending = []
+        cell = contexto
+        while len(cell) and id(cell) not in ids:
+            pending.append(cell)
+            cell = cell.tail
+        tail = ids[id(cell)] if len(cell) else -1
+        for cell in reversed(pending):
+            ids[id(cell)] = len(self.cells) // 2
+            self.cells.extend((self.formula(cell.head), tail))
+            self._alive.append(cell)
+            tail = ids[id(cell)]
+        return tail
+
+
+def save(path: PathLike, resolvers: Union[Resolver, Iterable[Resolver]],
+         names: Optional[Iterable[str]] = None) -> None:
+    """
+    Writes one or more Resolvers (finished or not) as a proof library.
+
+    Args:
+        path: The file to write.
+        resolvers: A Resolver or an iterable of them.
+        names: Optional names for the proofs, in the same order.
+    """
+    if isinstance(resolvers, Resolver):
+        resolvers = [resolvers]
+    resolvers = list(resolvers)
+    names = list(names) if names is not None else [None] * len(resolvers)
+    if len(names) != len(resolvers):
+        raise ValueError(f"got {len(names)} names for {len(resolvers)} proofs")
+
+    writer = _Writer()
+    proofs = []
+    for resolver, name in zip(resolvers, names):
+        store = resolver.pasos
+        formula_map = [writer.formula(prop) for prop in store.formulas]
+        context_map = [writer.context(contexto) for contexto in store.contextos]
+        columns = {
+            'parent': store.parent,
+            'rule': store.rule,
+            'resolvent': array('i', [formula_map[fid] for fid in store.resolvent]),
+            'context': array('i', [context_map[cid] for cid in store.context]),
+            'first_child': store.first_child,
+            'num_children': store.num_children,
+        }
+        name_id = -1 if name is None else writer.string(name)
+        proofs.append((name_id, len(store), _MODES.index(resolver.modo), columns))
+
+    strings = [text.encode('utf-8') for text in writer.strings]
+    string_offsets = array('q', [0])
+    for encoded in strings:
+        string_offsets.append(string_offsets[-1] + len(encoded))
+
+    with open(path, 'wb') as f:
+        def section(data: bytes) -> int:
+            # Cada sección empieza alineada a 8 bytes
+            f.write(b"\x00" * (-f.tell() % 8))
+            offset = f.tell()
+            f.write(data)
+            return offset
+
+        f.write(b"\x00" * _HEADER.size)
+        formulas_off = section(_little_endian(writer.nodes))
+        offsets_off = section(_little_endian(string_offsets))
+        blob_off = section(b"".join(strings))
+        cells_off = section(_little_endian(writer.cells))
+        proofs_off = section(b"\x00" * (_PROOF.size * len(proofs)))
+        records = []
+        for name_id, steps, mode, columns in proofs:
+            offsets = [section(_little_endian(columns[column])) for _, column in _COLUMNS]
+            records.append(_PROOF.pack(name_id, steps, mode, *offsets))
+        f.seek(proofs_off)
+        f.write(b"".join(records))
+        f.seek(0)
+        f.write(_HEADER.pack(MAGIC, VERSION, 0, len(writer.nodes) // 3, formulas_off,
+                             len(strings), offsets_off, blob_off, len(writer.cells) // 2, cells_off,
+                             len(proofs), proofs_off))
+
+
+class StoredProof(Sequence):
+    """
+    One proof of a ProofLibrary. As a sequence it reads like `Resolver.lista_de_pasos`:
+    (Paso, parent_index, rule_applied) tuples, decoded on access.
+    """
+    def __init__(self, library: "ProofLibrary", index: int):
+        name_id, steps, mode, *offsets = _PROOF.unpack_from(library._map, library._proofs_off + index * _PROOF.size)
+        self.library = library
+        self.index = index
+        self.name: Optional[str] = None if name_id < 0 else library._string(name_id)
+        self.modo: LogicMode = _MODES[mode]
+        self._steps = steps
+        self._rule_offset = offsets[1]
+        for (code, column), offset in zip(_COLUMNS, offsets):
+            setattr(self, column, library._view(offset, steps, code))
+
+    def __len__(self) -> int:
+        return self._steps
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._steps))]
+        if index < 0:
+            index += self._steps
+        if not 0 <= index < self._steps:
+            raise IndexError("step index out of range")
+        return (self.paso(index), max(self.parent[index], 0), self.regla(index))
+
+    def resolvente(self, idx: int) -> Prop:
+        return self.library.formula(self.resolvent[idx])
+
+    def contexto(self, idx: int) -> Contexto:
+        return self.library.contexto(self.context[idx])
+
+    def paso(self, idx: int) -> Paso:
+        return Paso(self.contexto(idx), self.resolvente(idx))
+
+    def regla(self, idx: int) -> Optional[LogicRules]:
+        code = self.rule[idx]
+        return None if code < 0 else _RULES[code]
+
+    def padre(self, idx: int) -> int:
+        return self.parent[idx]
+
+    def hijos(self, idx: int) -> range:
+        first = self.first_child[idx]
+        return range(first, first + self.num_children[idx]) if first >= 0 else range(0)
+
+    def isProofComplete(self) -> bool:
+        # Un paso abierto tiene la regla -1 (0xff): se busca directamente en las páginas
+        return self.library._map.find(b"\xff", self._rule_offset, self._rule_offset + self._steps) < 0
+
+    def to_resolver(self) -> Resolver:
+        """
+        Materializes the whole proof as a Resolver, which can then be extended with
+        `aplicarRegla` like any other.
+        """
+        formulas: List[Prop] = []
+        formula_ids: Dict[int, int] = {}
+        resolvent = array('i')
+        for fid in self.resolvent:
+            local = formula_ids.get(fid)
+            if local is None:
+                local = formula_ids[fid] = len(formulas)
+                formulas.append(self.library.formula(fid))
+            resolvent.append(local)
+        contextos: List[Contexto] = []
+        context_ids: Dict[int, int] = {}
+        context = array('i')
+        for cid in self.context:
+            local = context_ids.get(cid)
+            if local is None:
+                local = context_ids[cid] = len(contextos)
+                contextos.append(self.library.contexto(cid))
+            context.append(local)
+        store = ProofStore.from_columns(formulas, contextos, array('i', self.parent), array('b', self.rule),
+                                        resolvent, context, array('i', self.first_child),
+                                        array('b', self.num_children))
+        return Resolver.from_store(store, self.modo)
+
+
+class ProofLibrary(Sequence):
+    """
+    A proof library opened through a read-only memory map. Opening it only reads the
+    header; the formula DAG, the contexts and the steps of each proof are decoded
+    lazily, and the decoded formulas and contexts are cached.
+
+    Use it as a context manager, or call `close`, to release the mapping.
+    """
+    def __init__(self, path: PathLike):
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"{os.fspath(path)!r} is empty, not a proof library") from None
+        self._views: List[memoryview] = []
+        try:
+            (magic, version, _, self._n_formulas, formulas_off, self._n_strings, offsets_off, self._blob_off,
+             self._n_cells, cells_off, self._n_proofs, self._proofs_off) = _HEADER.unpack_from(self._map, 0)
+        except struct.error:
+            self.close()
+            raise ValueError(f"{os.fspath(path)!r} is too short to be a proof library") from None
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{os.fspath(path)!r} is not a version {VERSION} proof library")
+        self._nodes = self._view(formulas_off, 3 * self._n_formulas, 'i')
+        self._string_offsets = self._view(offsets_off, self._n_strings + 1, 'q')
+        self._cells = self._view(cells_off, 2 * self._n_cells, 'i')
+        self._formulas: Dict[int, Prop] = {}
+        self._contextos: Dict[int, Contexto] = {-1: Contexto()}
+        self._proofs: Dict[int, StoredProof] = {}
+
+    def _view(self, offset: int, count: int, code: str):
+        itemsize = array(code).itemsize
+        view = memoryview(self._map)[offset:offset + count * itemsize].cast(code)
+        self._views.append(view)
+        if sys.byteorder != 'little' and itemsize > 1:
+            swapped = array(code, view)
+            swapped.byteswap()
+            return swapped
+        return view
+
+    def _string(self, sid: int) -> str:
+        start = self._blob_off + self._string_offsets[sid]
+        end = self._blob_off + self._string_offsets[sid + 1]
+        return self._map[start:end].decode('utf-8')
+
+    def close(self) -> None:
+        for view in self._views:
+            view.release()
+        self._views.clear()
+        if not self._map.closed:
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "ProofLibrary":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._n_proofs
+
+    def __getitem__(self, index: int) -> StoredProof:
+        if index < 0:
+            index += self._n_proofs
+        if not 0 <= index < self._n_proofs:
+            raise IndexError("proof index out of range")
+        proof = self._proofs.get(index)
+        if proof is None:
+            proof = self._proofs[index] = StoredProof(self, index)
+        return proof
+
+    def find(self, name: str) -> Optional[StoredProof]:
+        """
+        Returns the first proof saved under `name`, or None.
+        """
+        for proof in self:
+            if proof.name == name:
+                return proof
+        return None
+
+    def formula(self, fid: int) -> Prop:
+        """
+        Returns formula `fid`, decoding it (and the subformulas it needs) if needed.
+        """
+        formulas = self._formulas
+        nodes = self._nodes
+        stack = [fid]
+        while stack:
+            current = stack[-1]
+            if current in formulas:
+                stack.pop()
+                continue
+            tag, a, b = nodes[3 * current], nodes[3 * current + 1], nodes[3 * current + 2]
+            if tag == TAG_VAR:
+                prop = VAR(self._string(a))
+            elif tag == TAG_BOTTOM:
+                prop = BOTTOM()
+            elif tag == TAG_NEG:
+                if a not in formulas:
+                    stack.append(a)
+                    continue
+                prop = NEG(formulas[a])
+            else:
+                if a not in formulas or b not in formulas:
+                    stack.append(b)
+                    stack.append(a)
+                    continue
+                prop = _BINARY[tag](formulas[a], formulas[b])
+            formulas[current] = prop
+            stack.pop()
+        return formulas[fid]
+
+    def contexto(self, cid: int) -> Contexto:
+        """
+        Returns context cell `cid` as a Contexto, rebuilding the cells it extends first.
+        """
+        contextos = self._contextos
+        pending = []
+        cell = cid
+        while cell not in contextos:
+            pending.append(cell)
+            cell = self._cells[2 * cell + 1]
+        contexto = contextos[cell]
+        for cell in reversed(pending):
+            contexto = contextos[cell] = contexto.extend(self.formula(self._cells[2 * cell]))
+        return contextos[cid]
+
+
+def load(path: PathLike) -> ProofLibrary:
+    """
+    Opens a proof library written by `save`.
+    """
+    return ProofLibrary(path)
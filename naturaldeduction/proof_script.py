@@ -0,0 +1,158 @@
+"""
+Proof scripts: a compact text format to record natural deduction proofs and check them
+without the interactive prompt.
+
+    # Los comentarios y las líneas en blanco se ignoran
+    P → Q, P ⊢ Q
+    0 →E P
+    1 Axiom
+    2 Axiom
+
+The first line is the sequent to prove, in the format of `Paso.toString`. Every other
+line applies a rule: the index of the step, the rule (its value as in `LogicRules`, or
+its name) and, for the rules in `REGLAS_CON_TESTIGOS`, the comma-separated witnesses.
+"""
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Tuple, Union
+
+from .formulas import Prop, pretty_print
+from .parser import parse_formula_list, parse_sequent
+from .proof import REGLAS_CON_TESTIGOS
+from .resolver import Resolver
+from .rules import RULES_BY_TOKEN, LogicMode, LogicRules
+
+ScriptStep = Tuple[int, LogicRules, Tuple[Prop, ...]]
+
+
+@dataclass
+class ProofScript:
+    contexto: List[Prop]
+    resolvente: Prop
+    pasos: List[ScriptStep]
+
+
+def _lines(source: Union[str, Iterable[str]]) -> Iterable[str]:
+    return source.splitlines() if isinstance(source, str) else source
+
+
+def _parse_step(line: str) -> ScriptStep:
+    parts = line.split(None, 2)
+    if len(parts) < 2:
+        raise ValueError(f"expected '<step> <rule> [witnesses]', got {line!r}")
+    try:
+        num_pos = int(parts[0])
+    except ValueError:
+        raise ValueError(f"invalid step number {parts[0]!r}") from None
+    regla = RULES_BY_TOKEN.get(parts[1])
+    if regla is None:
+        raise ValueError(f"unknown rule {parts[1]!r}")
+    testigos = tuple(parse_formula_list(parts[2])) if len(parts) == 3 else ()
+    return num_pos, regla, testigos
+
+
+def _iter_script(source: Union[str, Iterable[str]]) -> Iterator[Tuple[int, object]]:
+    """
+    Yields (line_number, item) for the meaningful lines of a script: first the parsed
+    sequent, then one ScriptStep per rule application.
+    """
+    header_seen = False
+    for line_number, line in enumerate(_lines(source), start=1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        try:
+            item = _parse_step(line) if header_seen else parse_sequent(line)
+        except ValueError as e:
+            raise ValueError(f"line {line_number}: {e}") from None
+        header_seen = True
+        yield line_number, item
+    if not header_seen:
+        raise ValueError("empty proof script: expected a sequent 'Γ ⊢ σ'")
+
+
+def parse_script(source: Union[str, Iterable[str]]) -> ProofScript:
+    """
+    Parses a whole script (a string or an iterable of lines) without applying it.
+    """
+    items = _iter_script(source)
+    _, (contexto, resolvente) = next(items)
+    return ProofScript(contexto, resolvente, [paso for _, paso in items])
+
+
+def replay(script: Union[str, Iterable[str], ProofScript],
+           modo: LogicMode = LogicMode.CLASSICAL) -> Resolver:
+    """
+    Applies every step of `script` to a fresh, silent Resolver in logic `modo` and
+    returns it. Whether the proof is finished is given by `isProofComplete()` on the
+    result.
+
+    Raises:
+        ValueError: If a line cannot be parsed or a rule cannot be applied.
+    """
+    if isinstance(script, ProofScript):
+        resolver = Resolver(script.contexto, script.resolvente, modo=modo)
+        numbered = enumerate(script.pasos, start=1)
+    else:
+        items = _iter_script(script)
+        _, (contexto, resolvente) = next(items)
+        resolver = Resolver(contexto, resolvente, modo=modo)
+        numbered = items
+
+    aplicar = resolver.aplicarRegla
+    for line_number, (num_pos, regla, testigos) in numbered:
+        if not aplicar(num_pos, regla, *testigos):
+            raise ValueError(f"line {line_number}: rule '{regla.value}' cannot be applied to step {num_pos}")
+    return resolver
+
+
+def check(script: Union[str, Iterable[str], ProofScript],
+          modo: LogicMode = LogicMode.CLASSICAL) -> bool:
+    """
+    Returns True if `script` replays without errors and proves its sequent.
+    """
+    try:
+        return replay(script, modo).isProofComplete()
+    except ValueError:
+        return False
+
+
+def testigos_for(regla: LogicRules, resolvente: Prop) -> Tuple[Prop, ...]:
+    """
+    Returns the witnesses that `regla` was applied with, recovered from `resolvente`, the
+    formula to prove in the first step the rule created. Rules without witnesses give ().
+    """
+    match regla:
+        case LogicRules.AND_ELIMINATION_1:
+            return (resolvente.right,)
+        case LogicRules.AND_ELIMINATION_2:
+            return (resolvente.left,)
+        case LogicRules.OR_ELIMINATION:
+            return (resolvente.left, resolvente.right)
+        case LogicRules.IMPLICATION_ELIMINATION | LogicRules.NEGATION_ELIMINATION:
+            return (resolvente,)
+        case _:
+            return ()
+
+
+def to_script(resolver: Resolver) -> str:
+    """
+    Writes the rules applied in `resolver` as a proof script that `replay` turns back
+    into the same list of steps.
+    """
+    store = resolver.pasos
+    aplicados = [idx for idx in range(len(store)) if store.regla(idx) is not None]
+
+    # Reaplicar en el orden en que se crearon los hijos reproduce los mismos índices;
+    # los pasos sin hijos van justo después del paso que los creó.
+    aplicados.sort(key=lambda idx: (store.first_child[idx], 0) if store.num_children[idx] else (idx, 1))
+
+    contexto = ', '.join(pretty_print(prop, minimal=True) for prop in store.contexto(0))
+    lines = [f"{contexto} ⊢ {pretty_print(store.resolvente(0), minimal=True)}".lstrip()]
+    for idx in aplicados:
+        regla = store.regla(idx)
+        line = f"{idx} {regla.value}"
+        if regla in REGLAS_CON_TESTIGOS:
+            testigos = testigos_for(regla, store.resolvente(store.first_child[idx]))
+            line += ' ' + ', '.join(pretty_print(t, minimal=True) for t in testigos)
+        lines.append(line)
+    return '\n'.join(lines) + '\n'
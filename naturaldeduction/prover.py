@@ -0,0 +1,297 @@
+"""
+Automatic backward proof search for the natural deduction rules of `LogicRules`.
+
+The prover works on sequents (Contexto, resolvente) and applies the rules of
+`Resolver.aplicarRegla` backwards, with iterative deepening on the number of rule
+applications. Solved and failed sequents are kept in a transposition table, and the
+witnesses for →E, ∧E, ∨E and ¬E are taken from the subformulas of the context that can
+be reached by eliminations.
+
+The result is replayed through `Resolver.aplicarRegla`, so what `prove` returns is an
+ordinary, complete `Resolver` that `mostrar_prueba` can display.
+"""
+import sys
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+from .contexto import Contexto
+from .formulas import AND, BOTTOM, IMPLIES, NEG, OR, Prop
+from .g4ip import IntuitionisticDecider
+from .resolver import Resolver
+from .rules import LogicMode, LogicRules
+from .sat import EntailmentChecker
+from .truth_table import compile_formulas, evaluate
+
+# Un árbol de prueba es (regla, testigos, hijos). Los hijos están en el mismo orden en
+# que aplicarRegla agrega los pasos nuevos.
+ProofTree = Tuple[LogicRules, Tuple[Prop, ...], tuple]
+
+_AXIOM: ProofTree = (LogicRules.AXIOM, (), ())
+
+# Profundidad registrada para los secuentes que fallaron sin tocar el límite
+_EXHAUSTED = sys.maxsize
+
+# Los secuentes con más variables se filtran con el SAT solver en vez de tablas de verdad
+_PRUNE_MAX_VARIABLES = 16
+
+
+class ProofSearchTimeout(Exception):
+    """
+    Raised when a search runs out of its node or time budget.
+    """
+
+
+class Prover:
+    """
+    Backward proof search with iterative deepening and a transposition table.
+
+    Args:
+        profundidad_max (int): Maximum number of nested rule applications.
+        max_nodos (int): Maximum number of sequents expanded before giving up.
+        tiempo_max (float): Maximum search time in seconds, or None for no limit.
+        clasico (bool): Whether PBC and LEM may be used. The proofs found without them
+            are replayed in `LogicMode.INTUITIONISTIC`.
+        poda_semantica (bool): Whether to discard, with a truth table or the SAT
+            solver, the subgoals that are not classically valid (and so cannot be proven).
+            Without `clasico`, subgoals that the G4ip decider finds intuitionistically
+            unprovable are discarded too.
+        lemas (LemmaCache): Proven sequents (see normalize.py) that close goals without
+            searching. Every proof found is normalized and added to it.
+    """
+    def __init__(self, profundidad_max: int = 40, max_nodos: int = 200_000,
+                 tiempo_max: Optional[float] = 10.0, clasico: bool = True,
+                 poda_semantica: bool = True, lemas: Optional["LemmaCache"] = None):
+        self.profundidad_max = profundidad_max
+        self.max_nodos = max_nodos
+        self.tiempo_max = tiempo_max
+        self.clasico = clasico
+        self.poda_semantica = poda_semantica
+        self.lemas = lemas
+        self.nodos = 0
+        self._solved: Dict[Tuple[Contexto, Prop], ProofTree] = {}
+        self._failed: Dict[Tuple[Contexto, Prop], int] = {}
+        self._sat: Optional[EntailmentChecker] = None
+        self._intuicionista: Optional[IntuitionisticDecider] = None
+        self._open: set = set()
+        self._cuts = 0
+        self._hit_depth_limit = False
+        self._deadline: Optional[float] = None
+
+    def search(self, contexto: Contexto, resolvente: Prop) -> Optional[ProofTree]:
+        """
+        Looks for a proof of `contexto ⊢ resolvente`.
+
+        Returns:
+            ProofTree or None: The proof tree, or None if there is no proof within
+            `profundidad_max`.
+
+        Raises:
+            ProofSearchTimeout: If the node or time budget runs out first.
+        """
+        if not isinstance(contexto, Contexto):
+            contexto = Contexto(contexto)
+        self.nodos = 0
+        self._deadline = None if self.tiempo_max is None else time.monotonic() + self.tiempo_max
+        for profundidad in range(1, self.profundidad_max + 1):
+            self._hit_depth_limit = False
+            proof = self._prove(contexto, resolvente, profundidad)
+            if proof is not None and self.lemas is not None:
+                proof = self.lemas.add(contexto, resolvente, proof)
+            # Si nunca se tocó el límite, la búsqueda fue exhaustiva
+            if proof is not None or not self._hit_depth_limit:
+                return proof
+        return None
+
+    def prove(self, contexto: Iterable[Prop], resolvente: Prop) -> Optional[Resolver]:
+        """
+        Same as `search`, but returns the proof as a complete Resolver.
+        """
+        contexto = contexto if isinstance(contexto, Contexto) else Contexto(contexto)
+        proof = self.search(contexto, resolvente)
+        if proof is None:
+            return None
+        modo = LogicMode.CLASSICAL if self.clasico else LogicMode.INTUITIONISTIC
+        return build_resolver(contexto, resolvente, proof, modo)
+
+    def _tick(self) -> None:
+        self.nodos += 1
+        if self.nodos > self.max_nodos:
+            raise ProofSearchTimeout(f"node budget of {self.max_nodos} exhausted")
+        if self._deadline is not None and self.nodos & 255 == 0 and time.monotonic() > self._deadline:
+            raise ProofSearchTimeout(f"time budget of {self.tiempo_max}s exhausted")
+
+    def _may_hold(self, contexto: Contexto, goal: Prop) -> bool:
+        # Sin contramodelo clásico el secuente puede tener prueba; con uno, no
+        program = compile_formulas([*contexto, goal])
+        if len(program.variables) <= _PRUNE_MAX_VARIABLES:
+            holds = evaluate(program) is None
+        else:
+            # Un solo solver por búsqueda: cada subfórmula se codifica una vez y el
+            # contexto de cada subobjetivo entra como suposiciones
+            if self._sat is None:
+                self._sat = EntailmentChecker()
+            holds = self._sat.entails(goal, extra=contexto)
+        if not holds or self.clasico:
+            return holds
+        # Sin reglas clásicas también hace falta validez intuicionista (p. ej. Peirce)
+        if self._intuicionista is None:
+            self._intuicionista = IntuitionisticDecider()
+        return self._intuicionista.is_provable(contexto, goal)
+
+    def _prove(self, contexto: Contexto, goal: Prop, profundidad: int) -> Optional[ProofTree]:
+        if goal in contexto:
+            return _AXIOM
+        key = (contexto, goal)
+        proof = self._solved.get(key)
+        if proof is not None:
+            return proof
+        if self.lemas is not None:
+            proof = self.lemas.lookup(contexto, goal, self.clasico)
+            if proof is not None:
+                self._solved[key] = proof
+                return proof
+        failed_at = self._failed.get(key, -1)
+        if profundidad <= failed_at:
+            if failed_at != _EXHAUSTED:
+                self._hit_depth_limit = True
+            return None
+        if key in self._open:
+            # El mismo secuente ya se está buscando más arriba: cortar el ciclo
+            self._cuts += 1
+            return None
+        if profundidad == 0:
+            self._hit_depth_limit = True
+            return None
+        if self.poda_semantica and not self._may_hold(contexto, goal):
+            self._failed[key] = _EXHAUSTED
+            return None
+
+        self._tick()
+        cuts = self._cuts
+        hit_before = self._hit_depth_limit
+        self._hit_depth_limit = False
+        self._open.add(key)
+        try:
+            proof = self._expand(contexto, goal, profundidad - 1)
+        finally:
+            self._open.discard(key)
+        limited = self._hit_depth_limit
+        self._hit_depth_limit = hit_before or limited
+        if proof is not None:
+            self._solved[key] = proof
+        elif cuts == self._cuts:
+            # Un fracaso debido a un ciclo depende del camino, no se recuerda
+            self._failed[key] = profundidad if limited else _EXHAUSTED
+        return proof
+
+    def _expand(self, contexto: Contexto, goal: Prop, profundidad: int) -> Optional[ProofTree]:
+        prove = self._prove
+        bottom = BOTTOM()
+        cls = type(goal)
+
+        if bottom in contexto and goal is not bottom:
+            return (LogicRules.BOTTOM_ELIMINATION, (), (_AXIOM,))
+
+        # Primero las introducciones invertibles. Si fallan se sigue con las demás
+        # reglas, porque el corte de ciclos puede haber podado la única prueba corta.
+        if cls is IMPLIES:
+            sub = prove(contexto.extend(goal.premise), goal.conclusion, profundidad)
+            if sub is not None:
+                return (LogicRules.IMPLICATION_INTRODUCTION, (), (sub,))
+        elif cls is NEG:
+            sub = prove(contexto.extend(goal.prop), bottom, profundidad)
+            if sub is not None:
+                return (LogicRules.NEGATION_INTRODUCTION, (), (sub,))
+        elif cls is AND:
+            left = prove(contexto, goal.left, profundidad)
+            right = None if left is None else prove(contexto, goal.right, profundidad)
+            if right is not None:
+                return (LogicRules.AND_INTRODUCTION, (), (left, right))
+
+        if self.clasico and cls is OR and type(goal.right) is NEG and goal.right.prop is goal.left:
+            return (LogicRules.EXCLUDED_MIDDLE, (), ())
+
+        index = contexto.rule_index
+
+        # Eliminaciones sobre subfórmulas del contexto
+        for other in index.right_conjuncts_of(goal):
+            sub = prove(contexto, AND(goal, other), profundidad)
+            if sub is not None:
+                return (LogicRules.AND_ELIMINATION_1, (other,), (sub,))
+        for other in index.left_conjuncts_of(goal):
+            sub = prove(contexto, AND(other, goal), profundidad)
+            if sub is not None:
+                return (LogicRules.AND_ELIMINATION_2, (other,), (sub,))
+        for tau in index.premises_of(goal):
+            sub_tau = prove(contexto, tau, profundidad)
+            if sub_tau is None:
+                continue
+            sub_impl = prove(contexto, IMPLIES(tau, goal), profundidad)
+            if sub_impl is not None:
+                return (LogicRules.IMPLICATION_ELIMINATION, (tau,), (sub_tau, sub_impl))
+        if goal is bottom:
+            for a in index.negated():
+                sub_a = prove(contexto, a, profundidad)
+                if sub_a is None:
+                    continue
+                sub_neg = prove(contexto, NEG(a), profundidad)
+                if sub_neg is not None:
+                    return (LogicRules.NEGATION_ELIMINATION, (a,), (sub_a, sub_neg))
+
+        if cls is OR:
+            sub = prove(contexto, goal.left, profundidad)
+            if sub is not None:
+                return (LogicRules.OR_INTRODUCTION_1, (), (sub,))
+            sub = prove(contexto, goal.right, profundidad)
+            if sub is not None:
+                return (LogicRules.OR_INTRODUCTION_2, (), (sub,))
+
+        for disjunction in index.disjunctions():
+            a, b = disjunction.left, disjunction.right
+            if a in contexto or b in contexto:
+                continue
+            sub_or = prove(contexto, disjunction, profundidad)
+            if sub_or is None:
+                continue
+            sub_a = prove(contexto.extend(a), goal, profundidad)
+            if sub_a is None:
+                continue
+            sub_b = prove(contexto.extend(b), goal, profundidad)
+            if sub_b is not None:
+                return (LogicRules.OR_ELIMINATION, (a, b), (sub_or, sub_a, sub_b))
+
+        if goal is not bottom and index.can_reach_bottom():
+            sub = prove(contexto, bottom, profundidad)
+            if sub is not None:
+                return (LogicRules.BOTTOM_ELIMINATION, (), (sub,))
+
+        if self.clasico and goal is not bottom:
+            negated = NEG(goal)
+            if negated not in contexto:
+                sub = prove(contexto.extend(negated), bottom, profundidad)
+                if sub is not None:
+                    return (LogicRules.PBC, (), (sub,))
+        return None
+
+
+def build_resolver(contexto: Iterable[Prop], resolvente: Prop, proof: ProofTree,
+                   modo: LogicMode = LogicMode.CLASSICAL) -> Resolver:
+    """
+    Replays `proof` step by step through `Resolver.aplicarRegla` and returns the
+    resulting (complete) Resolver.
+    """
+    resolver = Resolver(contexto, resolvente, modo=modo)
+    pendientes = [(0, proof)]
+    while pendientes:
+        num_pos, (regla, testigos, hijos) = pendientes.pop()
+        if not resolver.aplicarRegla(num_pos, regla, *testigos):
+            raise RuntimeError(f"proof tree does not replay: rule '{regla.value}' failed at step {num_pos}")
+        pendientes.extend(zip(resolver.pasos.hijos(num_pos), hijos))
+    return resolver
+
+
+def prove(contexto: Iterable[Prop], resolvente: Prop, **opciones) -> Optional[Resolver]:
+    """
+    Convenience wrapper around `Prover(**opciones).prove(contexto, resolvente)`.
+    """
+    return Prover(**opciones).prove(contexto, resolvente)
@@ -0,0 +1,721 @@
+"""
+The Resolver, which builds a proof by applying rules to its open steps, its rule events
+and checkpoints, and the ProofRenderer that displays it.
+"""
+import time
+from array import array
+from collections.abc import Sequence
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, Iterable, List, Set, Tuple, Union
+
+from .contexto import _EMPTY_CONTEXTO, Contexto
+from .formulas import BOTTOM, Prop, pretty_print
+from .parser import getFormula
+from .proof import (REGLAS_CON_TESTIGOS, _NO_RULE, Paso, PasosView, ProofStore, Suggestion,
+                    esReglaAplicable, suggest)
+from .rules import REGLAS_CLASICAS, LogicMode, LogicRules
+
+# --- Rule Events ---
+class RuleOutcome(Enum):
+    APPLIED = "applied"
+    NOT_OPEN = "not_open"                  # el paso ya está resuelto o no existe
+    OUT_OF_RANGE = "out_of_range"
+    NOT_ALLOWED = "not_allowed"            # regla clásica en modo intuicionista
+    NOT_APPLICABLE = "not_applicable"      # la forma del resolvente no encaja
+    MISSING_WITNESSES = "missing_witnesses"
+    FAILED = "failed"                      # p. ej. Axiom con el resolvente fuera del contexto
+
+
+@dataclass(frozen=True)
+class RuleEvent:
+    """
+    One call to `Resolver.aplicarRegla`, as seen by the observers.
+
+    Attributes:
+        regla (LogicRules): The rule that was attempted.
+        num_pos (int): The step it was attempted on.
+        outcome (RuleOutcome): What happened.
+        resolvente (Prop): The resolvent of the step, or None if the step does not exist.
+        formula_size (int): `size` of the resolvent (0 if there is none).
+        context_size (int): Number of assumptions of the step (0 if there is none).
+        nuevos_pasos (int): Number of steps the rule opened.
+        duration (float): Seconds spent in the call.
+    """
+    regla: LogicRules
+    num_pos: int
+    outcome: RuleOutcome
+    resolvente: Union[Prop, None]
+    formula_size: int
+    context_size: int
+    nuevos_pasos: int
+    duration: float
+
+
+class RuleObserver:
+    """
+    Receives a RuleEvent after every rule application of the Resolvers it is
+    subscribed to. The default implementation ignores them.
+    """
+    def on_rule(self, event: RuleEvent) -> None:
+        pass
+
+
+class PrintObserver(RuleObserver):
+    """
+    Prints every rule application as the interactive prompt shows it.
+    """
+    def on_rule(self, event: RuleEvent) -> None:
+        regla = event.regla.value
+        match event.outcome:
+            case RuleOutcome.APPLIED:
+                print(f"Aplicando regla '{regla}' al paso {event.num_pos} (Prop: {pretty_print(event.resolvente)})...")
+            case RuleOutcome.NOT_OPEN:
+                print(f"Error: Paso {event.num_pos} ya está resuelto o no existe como paso a resolver.")
+            case RuleOutcome.OUT_OF_RANGE:
+                print(f"Error: El número de posición {event.num_pos} está fuera de los límites de la lista de pasos.")
+            case RuleOutcome.NOT_ALLOWED:
+                print(f"Error: La regla '{regla}' no está permitida en lógica intuicionista.")
+            case RuleOutcome.NOT_APPLICABLE:
+                print(f"Error: La regla '{regla}' no es estructuralmente aplicable a la proposición {pretty_print(event.resolvente)}.")
+            case RuleOutcome.MISSING_WITNESSES:
+                print(f"Error: La regla '{regla}' necesita {REGLAS_CON_TESTIGOS.get(event.regla, 0)} fórmula(s) testigo.")
+            case RuleOutcome.FAILED:
+                print(f"Error: La regla '{regla}' no se puede aplicar al paso {event.num_pos} (Prop: {pretty_print(event.resolvente)}).")
+
+
+# --- Checkpoints ---
+@dataclass(frozen=True)
+class Checkpoint:
+    """
+    A point of a Resolver's history to go back to with `Resolver.rollback`.
+
+    Attributes:
+        aplicadas (int): Number of rule applications recorded when it was taken.
+        ultima (tuple): The last of those applications, to tell a checkpoint of this
+            history apart from one of a branch that was already rolled back.
+    """
+    aplicadas: int
+    ultima: Union[tuple, None]
+
+
+# --- Resolver Class ---
+class Resolver:
+    """
+    Manages the state of a natural deduction proof. The steps are kept in a
+    ProofStore (`pasos`); `lista_de_pasos` reads them as (Paso, parent_index,
+    rule_applied) tuples.
+    """
+    def __init__(self, contexto_inicial: List[Prop], resolvente_final: Prop,
+                 interactivo: bool = False, modo: LogicMode = LogicMode.CLASSICAL,
+                 observadores: Iterable[RuleObserver] = ()):
+        """
+        Initializes the Resolver with the initial context (axioms/assumptions)
+        and the final proposition to be proven (resolvent).
+        Rule applications are silent: every `observadores` entry receives a RuleEvent
+        for each of them (subscribe a PrintObserver to see them). Only an `interactivo`
+        Resolver asks the user for missing witness formulas. In `LogicMode.INTUITIONISTIC`
+        the rules in REGLAS_CLASICAS are rejected.
+        """
+        # Los pasos viven en un ProofStore; lista_de_pasos los muestra como tuplas
+        # (Paso object, parent_index, rule_applied)
+        initial_goal_paso = Paso(contexto_inicial, resolvente_final)
+        self.contexto_inicial: Contexto = initial_goal_paso.contexto
+        self.resolvente_final: Prop = resolvente_final
+        self.interactivo = interactivo
+        self.modo = modo
+        self.observadores: List[RuleObserver] = list(observadores)
+        self.pasos = ProofStore()
+        self.pasos.append(initial_goal_paso.contexto, resolvente_final, -1)
+        self.lista_de_pasos: Sequence[Tuple[Paso, int, LogicRules]] = PasosView(self.pasos)
+        self.pasos_a_resolver: Set[int] = {0}
+        # Una entrada por regla aplicada: (paso, cantidad de pasos, fórmulas y contextos
+        # antes de aplicarla). Deshacer sólo revierte lo que vino después.
+        self._historial: List[Tuple[int, int, int, int]] = []
+        self._renderer: Union["ProofRenderer", None] = None
+
+    @classmethod
+    def from_store(cls, pasos: ProofStore, modo: LogicMode = LogicMode.CLASSICAL) -> "Resolver":
+        """
+        Wraps an existing ProofStore (for example one loaded from a file) in a
+        Resolver; the steps without a rule are the ones left to resolve.
+        """
+        resolver = cls(pasos.contexto(0), pasos.resolvente(0), modo=modo)
+        resolver.pasos = pasos
+        resolver.lista_de_pasos = PasosView(pasos)
+        resolver.pasos_a_resolver = {idx for idx, code in enumerate(pasos.rule) if code == _NO_RULE}
+        return resolver
+
+    def suggest(self, num_pos: int) -> List[Suggestion]:
+        """
+        Returns the Suggestions for the open step `num_pos` in the logic of this
+        Resolver (none if the step is not open).
+        """
+        if num_pos not in self.pasos_a_resolver:
+            return []
+        return suggest(self.pasos.paso(num_pos), self.modo)
+
+    def subscribe(self, observador: RuleObserver) -> None:
+        self.observadores.append(observador)
+
+    def unsubscribe(self, observador: RuleObserver) -> None:
+        self.observadores.remove(observador)
+
+    def isProofComplete(self) -> bool:
+        """
+        Checks if the proof is complete.
+        A proof is complete if there are no more steps left to resolve.
+        """
+        return len(self.pasos_a_resolver) == 0
+
+    def _expandir(self, num_pos: int, regla: LogicRules, nuevos_pasos: List[Paso]) -> RuleOutcome:
+        """
+        Closes step `num_pos` with `regla` and opens one new step per premise in `nuevos_pasos`.
+        """
+        pasos = self.pasos
+        self._historial.append((num_pos, len(pasos.parent), len(pasos.formulas), len(pasos.contextos)))
+        self.pasos_a_resolver.remove(num_pos)
+        self.pasos_a_resolver.update(pasos.expand(num_pos, regla, nuevos_pasos))
+        return RuleOutcome.APPLIED
+
+    def checkpoint(self) -> Checkpoint:
+        """
+        Returns a token for the current state of the proof. Taking one is O(1) and
+        copies nothing.
+        """
+        historial = self._historial
+        return Checkpoint(len(historial), historial[-1] if historial else None)
+
+    def rollback(self, token: Checkpoint) -> None:
+        """
+        Undoes every rule applied since `token` was taken. The cost is proportional to
+        the number of undone applications and steps; the rest of the proof is not copied.
+
+        Raises:
+            ValueError: If the state of `token` was already rolled back.
+        """
+        historial = self._historial
+        n = token.aplicadas
+        if n > len(historial) or (n and historial[n - 1] is not token.ultima):
+            raise ValueError("the checkpoint does not belong to the current history of this proof")
+        if n == len(historial):
+            return
+        _, longitud, formulas, contextos = historial[n]
+        abiertos = self.pasos_a_resolver
+        # Los pasos posteriores al checkpoint desaparecen; los cerrados después vuelven a abrirse
+        abiertos.difference_update(range(longitud, len(self.pasos.parent)))
+        for num_pos, _, _, _ in historial[n:]:
+            self.pasos.reopen(num_pos)
+            if num_pos < longitud:
+                abiertos.add(num_pos)
+        del historial[n:]
+        self.pasos.truncate(longitud, formulas, contextos)
+
+    def undo(self) -> bool:
+        """
+        Undoes the last rule application. Returns False if there is nothing to undo.
+        """
+        historial = self._historial
+        if not historial:
+            return False
+        self.rollback(Checkpoint(len(historial) - 1, historial[-2] if len(historial) > 1 else None))
+        return True
+
+    def aplicarRegla(self, num_pos: int, regla: LogicRules, *testigos: Prop) -> bool:
+        """
+        Attempts to apply a given rule to the step at `num_pos`.
+        If successful, it updates `pasos_a_resolver` and `lista_de_pasos`.
+
+        Args:
+            num_pos (int): The 0-based index of the step to which the rule is being applied.
+            regla (LogicRules): The rule to attempt to apply.
+            *testigos (Prop): The witness formulas of the rules listed in REGLAS_CON_TESTIGOS:
+                the other conjunct for ∧E1/∧E2, the antecedent τ for →E, the disjuncts for
+                ∨E and the contradicted formula for ¬E. If none are given and the
+                Resolver is interactive they are asked for with `getFormula`.
+
+        Returns:
+            bool: True if the rule was successfully applied, False otherwise.
+        """
+        if not self.observadores:
+            return self._aplicar(num_pos, regla, testigos) is RuleOutcome.APPLIED
+
+        # Los eventos sólo se construyen si alguien los escucha
+        pasos = self.pasos
+        total_pasos = len(pasos)
+        inicio = time.perf_counter()
+        outcome = self._aplicar(num_pos, regla, testigos)
+        duration = time.perf_counter() - inicio
+        if 0 <= num_pos < total_pasos:
+            resolvente = pasos.resolvente(num_pos)
+            formula_size, context_size = resolvente.size, len(pasos.contexto(num_pos))
+        else:
+            resolvente, formula_size, context_size = None, 0, 0
+        event = RuleEvent(regla, num_pos, outcome, resolvente, formula_size, context_size,
+                          len(pasos) - total_pasos, duration)
+        for observador in self.observadores:
+            observador.on_rule(event)
+        return outcome is RuleOutcome.APPLIED
+
+    def _aplicar(self, num_pos: int, regla: LogicRules, testigos: Tuple[Prop, ...]) -> RuleOutcome:
+        if num_pos not in self.pasos_a_resolver:
+            return RuleOutcome.NOT_OPEN
+
+        if num_pos >= len(self.pasos.parent) or num_pos < 0:
+            return RuleOutcome.OUT_OF_RANGE
+
+        if self.modo is LogicMode.INTUITIONISTIC and regla in REGLAS_CLASICAS:
+            return RuleOutcome.NOT_ALLOWED
+
+        current_paso = self.pasos.paso(num_pos)
+
+        if not esReglaAplicable(current_paso, regla):
+            return RuleOutcome.NOT_APPLICABLE
+
+        cantidad_testigos = REGLAS_CON_TESTIGOS.get(regla, 0)
+        if not testigos and self.interactivo:
+            testigos = tuple(getFormula() for _ in range(cantidad_testigos))
+        if len(testigos) != cantidad_testigos or not all(isinstance(t, Prop) for t in testigos):
+            return RuleOutcome.MISSING_WITNESSES
+
+        contexto = current_paso.contexto
+        sigma = current_paso.resolvente
+
+        match regla:
+            case LogicRules.AXIOM:
+                if current_paso.isInTheContext(sigma):
+                    return self._expandir(num_pos, regla, [])
+                else:
+                    return RuleOutcome.FAILED
+
+            case LogicRules.AND_INTRODUCTION:
+                # Γ ⊢ A   Γ ⊢ B  /  Γ ⊢ A ∧ B
+                return self._expandir(num_pos, regla, [
+                    Paso(contexto=contexto, resolvente=sigma.left),
+                    Paso(contexto=contexto, resolvente=sigma.right)])
+
+            case LogicRules.AND_ELIMINATION_1:
+                # Γ ⊢ σ ∧ B  /  Γ ⊢ σ
+                derecha, = testigos
+                return self._expandir(num_pos, regla, [
+                    Paso(contexto=contexto, resolvente=sigma.and_(derecha))])
+
+            case LogicRules.AND_ELIMINATION_2:
+                # Γ ⊢ A ∧ σ  /  Γ ⊢ σ
+                izquierda, = testigos
+                return self._expandir(num_pos, regla, [
+                    Paso(contexto=contexto, resolvente=izquierda.and_(sigma))])
+
+            case LogicRules.IMPLICATION_INTRODUCTION:
+                # Γ, τ ⊢ ρ  /  Γ ⊢ τ → ρ
+                return self._expandir(num_pos, regla, [
+                    Paso(contexto=contexto.extend(sigma.premise), resolvente=sigma.conclusion)])
+
+            case LogicRules.IMPLICATION_ELIMINATION:
+                # Γ ⊢ τ   Γ ⊢ τ → σ  /  Γ ⊢ σ
+                tau, = testigos
+                return self._expandir(num_pos, regla, [
+                    Paso(contexto=contexto, resolvente=tau),
+                    Paso(contexto=contexto, resolvente=tau.impl(sigma))])
+
+            case LogicRules.OR_INTRODUCTION_1:
+                return self._expandir(num_pos, regla, [
+                    Paso(contexto=contexto, resolvente=sigma.left)])
+
+            case LogicRules.OR_INTRODUCTION_2:
+                return self._expandir(num_pos, regla, [
+                    Paso(contexto=contexto, resolvente=sigma.right)])
+
+            case LogicRules.OR_ELIMINATION:
+                # Γ ⊢ a ∨ b   Γ, a ⊢ σ   Γ, b ⊢ σ  /  Γ ⊢ σ
+                a, b = testigos
+                return self._expandir(num_pos, regla, [
+                    Paso(contexto=contexto, resolvente=a.or_(b)),
+                    Paso(contexto=contexto.extend(a), resolvente=sigma),
+                    Paso(contexto=contexto.extend(b), resolvente=sigma)])
+
+            case LogicRules.NEGATION_INTRODUCTION:
+                # Γ, ρ ⊢ ⊥  /  Γ ⊢ ¬ρ
+                return self._expandir(num_pos, regla, [
+                    Paso(contexto=contexto.extend(sigma.prop), resolvente=BOTTOM())])
+
+            case LogicRules.NEGATION_ELIMINATION:
+                # Γ ⊢ a   Γ ⊢ ¬a  /  Γ ⊢ ⊥
+                a, = testigos
+                return self._expandir(num_pos, regla, [
+                    Paso(contexto=contexto, resolvente=a),
+                    Paso(contexto=contexto, resolvente=a.neg())])
+
+            case LogicRules.BOTTOM_ELIMINATION:
+                # Γ ⊢ ⊥  /  Γ ⊢ σ
+                return self._expandir(num_pos, regla, [
+                    Paso(contexto=contexto, resolvente=BOTTOM())])
+
+            case LogicRules.MODUS_TOLLENS:
+                return self._expandir(num_pos, regla, [
+                    Paso(contexto=contexto, resolvente=sigma.prop.impl(BOTTOM()))])
+
+            case LogicRules.NEGATION_NEGATION_INTRODUCTION:
+                # Γ ⊢ ρ  /  Γ ⊢ ¬¬ρ
+                return self._expandir(num_pos, regla, [
+                    Paso(contexto=contexto, resolvente=sigma.prop.prop)])
+
+            case LogicRules.NEGATION_NEGATION_ELIMINATION:
+                # Γ ⊢ ¬¬σ  /  Γ ⊢ σ
+                return self._expandir(num_pos, regla, [
+                    Paso(contexto=contexto, resolvente=sigma.neg().neg())])
+
+            case LogicRules.EXCLUDED_MIDDLE:
+                # Γ ⊢ a ∨ ¬a es un axioma clásico
+                return self._expandir(num_pos, regla, [])
+
+            case LogicRules.PBC:
+                # Γ, ¬σ ⊢ ⊥  /  Γ ⊢ σ
+                return self._expandir(num_pos, regla, [
+                    Paso(contexto=contexto.extend(sigma.neg()), resolvente=BOTTOM())])
+
+            case _:
+                return RuleOutcome.NOT_APPLICABLE
+
+    @property
+    def renderer(self) -> "ProofRenderer":
+        """
+        The ProofRenderer of this proof, created on first use.
+        """
+        if self._renderer is None:
+            self._renderer = ProofRenderer(self)
+        return self._renderer
+
+    def mostrar_prueba(self, solo_cambios: bool = False):
+        """
+        Displays the current state of the proof, showing steps from last to first.
+        With `solo_cambios` only the steps that are new or changed since the previous
+        call are shown. The lines come from `renderer`, which caches them.
+        """
+        renderer = self.renderer
+        cambios = renderer.changes()
+        if solo_cambios:
+            print("\n--- Changed Steps (Last to First) ---")
+            if not cambios:
+                print("No changes.")
+            for idx in reversed(cambios):
+                print(renderer.line(idx))
+        else:
+            print("\n--- Current Proof State (Last to First) ---")
+            if not len(self.pasos):
+                print("No steps in the proof yet.")
+                return
+
+            # Mostrar pasos en orden inverso
+            for line in reversed(renderer.flat()):
+                print(line)
+
+        print("------------------------------------------")
+
+        # Mostrar las fórmulas sin resolver con su representación
+        if self.pasos_a_resolver:
+            print("Steps to resolve:")
+            for idx in sorted(self.pasos_a_resolver):
+                try:
+                    paso, _, _ = self.lista_de_pasos[idx]
+                    formula_str = pretty_print(paso.resolvente)
+                    print(f"  [{idx}]: {formula_str}")
+                except IndexError:
+                    print(f"  [{idx}]: <Invalid index>")
+        else:
+            print("All steps resolved!")
+
+
+# --- Proof Rendering ---
+# Por encima de esta cantidad de reglas nuevas se reconstruye el orden del árbol de una
+# vez en lugar de insertar los hijos de cada paso por separado.
+_TREE_REBUILD_THRESHOLD = 64
+# Pasos por bloque del orden del árbol: insertar cuesta un bloque, ubicar una fila un recorrido de bloques
+_TREE_BLOCK = 256
+
+
+class ProofRenderer:
+    """
+    Renders the steps of a Resolver and keeps what it rendered.
+
+    Each step's line (`[idx]: Γ ⊢ φ by rule`) is built once and reused until a rule is
+    applied to the step or undone, and the text of every context is built from the text
+    of the context it extends. The renderer follows the Resolver through its rule
+    history, so bringing it up to date costs as much as the applications (and undos)
+    since the last time, not the size of the proof. The tree order is kept in blocks of
+    steps, so the children of a step go in without shifting the rest of the order.
+
+    Three views are available, all of them windowed by row (`start`, `stop`):
+
+    - `flat`: one line per step, in step order.
+    - `tree`: the steps indented under the step whose rule opened them.
+    - `fitch`: a Fitch-style layout, with a box per subproof that introduces
+      hypotheses and premises written before the conclusion they justify.
+    """
+    VIEWS = ('flat', 'tree', 'fitch')
+
+    def __init__(self, resolver: "Resolver"):
+        self.resolver = resolver
+        self._lines: List[Union[str, None]] = []
+        self._contexts: Dict[int, Tuple[Contexto, str]] = {}
+        self._seen: List[tuple] = []          # historial ya sincronizado
+        self._pending: Set[int] = set()       # pasos cambiados desde el último changes()
+        self._order: Union[List[List[int]], None] = None  # orden del árbol, en bloques
+        self._block_of: List[List[int]] = []                # paso -> su bloque en _order
+        self._depth = array('i')
+        self._fitch: Union[List[Tuple[int, int, int, Union[Prop, None]]], None] = None
+        self._fitch_rows = array('i')
+        self._sync(initial=True)
+
+    def _sync(self, initial: bool = False) -> None:
+        store = self.resolver.pasos
+        historial = self.resolver._historial
+        seen = self._seen
+        common = min(len(seen), len(historial))
+        while common and seen[common - 1] is not historial[common - 1]:
+            common -= 1
+        if not initial and common == len(seen) == len(historial) and len(self._lines) == len(store):
+            return
+
+        undone, applied = seen[common:], historial[common:]
+        total = len(store)
+        # Lo deshecho trunca el almacén desde el primer paso que existía antes de deshacer
+        cut = min((entrada[1] for entrada in undone), default=len(self._lines))
+        cut = min(cut, len(self._lines), total)
+        changed = {entrada[0] for entrada in undone if entrada[0] < cut}
+        changed.update(entrada[0] for entrada in applied)
+        if cut < len(self._lines):
+            self._pending = {idx for idx in self._pending if idx < cut}
+        del self._lines[cut:]
+        for idx in changed:
+            if idx < cut:
+                self._lines[idx] = None
+        self._lines.extend([None] * (total - cut))
+        self._pending.update(idx for idx in changed if idx < total)
+        self._pending.update(range(cut, total))
+
+        if undone or initial or self._order is None:
+            self._order = None
+            del self._depth[:]
+        elif len(applied) > _TREE_REBUILD_THRESHOLD:
+            self._order = None
+        else:
+            for num_pos, _, _, _ in applied:
+                hijos = store.hijos(num_pos)
+                if hijos:
+                    self._tree_insert(num_pos, hijos)
+        if self._order is not None:
+            depth, parent = self._depth, store.parent
+            for idx in range(len(depth), total):
+                depth.append(depth[parent[idx]] + 1)
+        if changed or undone or total != len(self._fitch_rows):
+            self._fitch = None
+        if undone:
+            # Los textos de contextos que ya no están en el almacén no se vuelven a pedir
+            live = {id(contexto) for contexto in store.contextos}
+            self._contexts = {key: value for key, value in self._contexts.items() if key in live}
+        del seen[common:]
+        seen.extend(applied)
+
+    def changes(self) -> List[int]:
+        """
+        Returns the indices of the steps that are new or whose line changed since the
+        previous call (every step on the first call), in ascending order.
+        """
+        self._sync()
+        pending = sorted(self._pending)
+        self._pending = set()
+        return pending
+
+    def context_text(self, contexto: Contexto) -> str:
+        """
+        Returns the assumptions of `contexto` joined as `Paso.toString` writes them.
+        """
+        cache = self._contexts
+        pending = []
+        cell = contexto
+        while len(cell):
+            cached = cache.get(id(cell))
+            if cached is not None and cached[0] is cell:
+                break
+            pending.append(cell)
+            cell = cell.tail
+        if not pending:
+            return cache[id(cell)][1] if len(cell) else ""
+        pieces = [cache[id(cell)][1]] if len(cell) else []
+        pieces.extend(pretty_print(cell.head) for cell in reversed(pending))
+        # Sólo se guarda el texto de los contextos pedidos, no el de cada celda intermedia
+        text = ", ".join(pieces)
+        cache[id(contexto)] = (contexto, text)
+        return text
+
+    def line(self, idx: int) -> str:
+        """
+        Returns the flat line of step `idx`.
+        """
+        self._sync()
+        return self._line(idx)
+
+    def _line(self, idx: int) -> str:
+        text = self._lines[idx]
+        if text is None:
+            store = self.resolver.pasos
+            regla = store.regla(idx)
+            status = " (UNRESOLVED)" if regla is None else ""
+            regla_str = regla.value if regla else "No rule"
+            text = self._lines[idx] = (f"[{idx}]{status}: {self.context_text(store.contexto(idx))} ⊢ "
+                                       f"{pretty_print(store.resolvente(idx))} by {regla_str}")
+        return text
+
+    def rows(self, view: str = 'flat') -> int:
+        """
+        Number of rows of `view`, to page through it with `render`.
+        """
+        if view == 'fitch':
+            return len(self._fitch_layout())
+        if view in self.VIEWS:
+            self._sync()
+            return len(self._lines)
+        raise ValueError(f"unknown view {view!r}, expected one of {self.VIEWS}")
+
+    def render(self, view: str = 'flat', start: int = 0, stop: Union[int, None] = None) -> List[str]:
+        """
+        Returns the rows `start` to `stop` of `view` ('flat', 'tree' or 'fitch').
+        """
+        if view == 'flat':
+            return self.flat(start, stop)
+        if view == 'tree':
+            return self.tree(start, stop)
+        if view == 'fitch':
+            return self.fitch(start, stop)
+        raise ValueError(f"unknown view {view!r}, expected one of {self.VIEWS}")
+
+    def flat(self, start: int = 0, stop: Union[int, None] = None) -> List[str]:
+        self._sync()
+        return [self._line(idx) for idx in range(*slice(start, stop).indices(len(self._lines)))]
+
+    def _tree_order(self) -> List[List[int]]:
+        self._sync()
+        if self._order is None:
+            store = self.resolver.pasos
+            order, depth = [], array('i', bytes(4 * len(store)))
+            stack = [0] if len(store) else []
+            while stack:
+                idx = stack.pop()
+                order.append(idx)
+                hijos = store.hijos(idx)
+                for hijo in hijos:
+                    depth[hijo] = depth[idx] + 1
+                stack.extend(reversed(hijos))
+            blocks = [order[i:i + _TREE_BLOCK] for i in range(0, len(order), _TREE_BLOCK)]
+            block_of: List[List[int]] = [None] * len(store)
+            for block in blocks:
+                for idx in block:
+                    block_of[idx] = block
+            self._order, self._block_of, self._depth = blocks, block_of, depth
+        return self._order
+
+    def _tree_insert(self, num_pos: int, hijos: List[int]) -> None:
+        # Los hijos van justo después del paso: sólo se toca su bloque, y un bloque que
+        # crece al doble se parte en dos
+        block_of = self._block_of
+        block = block_of[num_pos]
+        position = block.index(num_pos) + 1
+        block[position:position] = hijos
+        missing = max(hijos) + 1 - len(block_of)
+        if missing > 0:
+            block_of.extend([None] * missing)
+        for hijo in hijos:
+            block_of[hijo] = block
+        if len(block) > 2 * _TREE_BLOCK:
+            second = block[_TREE_BLOCK:]
+            del block[_TREE_BLOCK:]
+            for idx in second:
+                block_of[idx] = second
+            blocks = self._order
+            position = next(i for i, other in enumerate(blocks) if other is block)
+            blocks.insert(position + 1, second)
+
+    def tree(self, start: int = 0, stop: Union[int, None] = None) -> List[str]:
+        blocks = self._tree_order()
+        depth = self._depth
+        start, stop, _ = slice(start, stop).indices(len(self._lines))
+        rows, offset = [], 0
+        for block in blocks:
+            if offset >= stop:
+                break
+            end = offset + len(block)
+            if end > start:
+                rows.extend("    " * depth[idx] + self._line(idx)
+                            for idx in block[max(start - offset, 0):stop - offset])
+            offset = end
+        return rows
+
+    def _fitch_layout(self) -> List[Tuple[int, int, int, Union[Prop, None]]]:
+        self._sync()
+        if self._fitch is not None:
+            return self._fitch
+        store = self.resolver.pasos
+        parent, context, contextos = store.parent, store.context, store.contextos
+        first_child, num_children = store.first_child, store.num_children
+        # Filas (número de línea, nivel, paso, hipótesis): paso -1 es una hipótesis y -2
+        # la línea sin número que cierra las hipótesis de una caja. En la pila, ~idx
+        # indica que ya se emitieron las premisas del paso idx.
+        layout: List[Tuple[int, int, int, Union[Prop, None]]] = []
+        append = layout.append
+        number = 0
+        step_rows = array('i', [-1]) * len(store)
+        level = array('i', bytes(4 * len(store)))
+        stack = [0] if len(store) else []
+        while stack:
+            idx = stack.pop()
+            if idx < 0:
+                idx = ~idx
+                number += 1
+                append((number, level[idx], idx, None))
+                step_rows[idx] = number
+                continue
+            padre = parent[idx]
+            if padre >= 0 and context[idx] == context[padre]:
+                level[idx] = nivel = level[padre]
+            else:
+                base = contextos[context[padre]] if padre >= 0 else _EMPTY_CONTEXTO
+                hypotheses = []
+                cell = contextos[context[idx]]
+                while len(cell) > len(base) and cell is not base:
+                    hypotheses.append(cell.head)
+                    cell = cell.tail
+                level[idx] = nivel = 0 if padre < 0 else level[padre] + (1 if hypotheses else 0)
+                for hypothesis in reversed(hypotheses):
+                    number += 1
+                    append((number, nivel, -1, hypothesis))
+                if hypotheses:
+                    append((0, nivel, -2, None))
+            stack.append(~idx)
+            first = first_child[idx]
+            if first >= 0:
+                stack.extend(range(first + num_children[idx] - 1, first - 1, -1))
+        self._fitch, self._fitch_rows = layout, step_rows
+        return layout
+
+    def fitch(self, start: int = 0, stop: Union[int, None] = None) -> List[str]:
+        layout = self._fitch_layout()
+        store = self.resolver.pasos
+        width = len(str(layout[-1][0])) if layout else 1
+        lines = []
+        for number, nivel, idx, hypothesis in layout[start:stop]:
+            if idx == -2:
+                lines.append(f"{'':>{width}} " + "│ " * nivel + "├───")
+                continue
+            if idx == -1:
+                formula, justification = hypothesis, "hyp"
+            else:
+                formula = store.resolvente(idx)
+                regla = store.regla(idx)
+                if regla is None:
+                    justification = f"? [{idx}]"
+                else:
+                    premises = ", ".join(str(self._fitch_rows[hijo]) for hijo in store.hijos(idx))
+                    justification = f"{regla.value} {premises}" if premises else regla.value
+            lines.append(f"{number:>{width}} " + "│ " * (nivel + 1) + f"{pretty_print(formula)}    {justification}")
+        return lines
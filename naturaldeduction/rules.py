@@ -0,0 +1,56 @@
+"""
+The natural deduction rules and the logics (rule sets) they belong to.
+"""
+from enum import Enum
+from typing import List
+
+# --- Logic Rules Enum ---
+class LogicRules(Enum):
+    AXIOM = "Axiom"
+    AND_INTRODUCTION = "∧I"
+    AND_ELIMINATION_1 = "∧E1"
+    AND_ELIMINATION_2 = "∧E2"
+    IMPLICATION_INTRODUCTION = "→I"
+    IMPLICATION_ELIMINATION = "→E"
+    OR_INTRODUCTION_1 = "∨I1"
+    OR_INTRODUCTION_2 = "∨I2"
+    OR_ELIMINATION = "∨E"
+    NEGATION_INTRODUCTION = "¬I"
+    NEGATION_ELIMINATION = "¬E"
+    BOTTOM_ELIMINATION = "⊥E"
+    # Reglas derivadas
+    MODUS_TOLLENS = "MT"
+    NEGATION_NEGATION_INTRODUCTION = "¬¬I"
+
+    # Classical-specific axiom/rule
+    NEGATION_NEGATION_ELIMINATION = "¬¬E"
+    # Reglas Derivadas Comunes
+    EXCLUDED_MIDDLE = "LEM"
+    PBC = "PBC"
+
+
+class LogicMode(Enum):
+    INTUITIONISTIC = "intuitionistic"
+    CLASSICAL = "classical"
+
+
+# Cada regla por su nombre (AND_INTRODUCTION) y por su símbolo (∧I), como se escriben
+# en los scripts de prueba y en los pedidos del servidor
+RULES_BY_TOKEN = {**{regla.name: regla for regla in LogicRules},
+                  **{regla.value: regla for regla in LogicRules}}
+
+# Reglas que sólo valen en lógica clásica (ClassicalRules en main.js)
+REGLAS_CLASICAS = frozenset({
+    LogicRules.NEGATION_NEGATION_ELIMINATION,
+    LogicRules.EXCLUDED_MIDDLE,
+    LogicRules.PBC,
+})
+
+
+def reglasPermitidas(modo: LogicMode) -> List[LogicRules]:
+    """
+    Returns the rules that may be used in proofs of the given logic.
+    """
+    if modo is LogicMode.CLASSICAL:
+        return list(LogicRules)
+    return [regla for regla in LogicRules if regla not in REGLAS_CLASICAS]
@@ -0,0 +1,409 @@
+"""
+Classical entailment through SAT: a Tseitin encoder for `Prop` formulas and a small
+CDCL solver (two watched literals, VSIDS, Luby restarts, first-UIP clause learning).
+
+`contexto ⊢ resolvente` holds classically iff `contexto ∧ ¬resolvente` is unsatisfiable.
+The solver is incremental: clauses can be added between calls and every call may take
+assumption literals, so an `EntailmentChecker` encodes each formula once and answers
+many queries over related contexts without re-encoding them.
+
+Literals are non-zero ints, as in DIMACS: v is the variable v and -v its negation.
+"""
+import heapq
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from .formulas import AND, BOTTOM, IMPLIES, NEG, OR, VAR, Prop
+
+_VAR_DECAY = 0.95
+_RESTART_BASE = 100
+_RESCALE_LIMIT = 1e100
+
+
+def _luby(i: int) -> int:
+    # Secuencia de Luby: 1 1 2 1 1 2 4 1 1 2 ...
+    size, exponent = 1, 0
+    while size < i + 1:
+        exponent += 1
+        size = 2 * size + 1
+    while size - 1 != i:
+        size = (size - 1) // 2
+        exponent -= 1
+        i %= size
+    return 1 << exponent
+
+
+class Solver:
+    """
+    Incremental CDCL SAT solver.
+    """
+    def __init__(self):
+        self.num_vars = 0
+        self.model: Optional[List[bool]] = None
+        self._val: Dict[int, int] = {}            # literal -> 1 (verdadero) / -1 (falso)
+        self._level: List[int] = [0]
+        self._reason: List[Optional[list]] = [None]
+        self._activity: List[float] = [0.0]
+        self._phase: List[bool] = [False]
+        self._watches: Dict[int, List[list]] = {}
+        self._learnts: List[list] = []
+        self._trail: List[int] = []
+        self._trail_lim: List[int] = []
+        self._qhead = 0
+        self._heap: List[tuple] = []
+        self._var_inc = 1.0
+        self._max_learnts = 1000
+        self._ok = True
+
+    def new_var(self) -> int:
+        self.num_vars += 1
+        v = self.num_vars
+        self._level.append(0)
+        self._reason.append(None)
+        self._activity.append(0.0)
+        self._phase.append(False)
+        self._watches[v] = []
+        self._watches[-v] = []
+        heapq.heappush(self._heap, (0.0, v))
+        return v
+
+    def add_clause(self, literals: Iterable[int]) -> bool:
+        """
+        Adds a permanent clause. Returns False if the clause set became unsatisfiable.
+        """
+        if not self._ok:
+            return False
+        self._cancel_until(0)
+        clause = []
+        for lit in dict.fromkeys(literals):
+            if -lit in clause:
+                return True  # tautología
+            value = self._val.get(lit)
+            if value == 1:
+                return True
+            if value is None:
+                clause.append(lit)
+        if not clause:
+            self._ok = False
+        elif len(clause) == 1:
+            self._enqueue(clause[0], None)
+            self._ok = self._propagate() is None
+        else:
+            self._watches[clause[0]].append(clause)
+            self._watches[clause[1]].append(clause)
+        return self._ok
+
+    def solve(self, assumptions: Sequence[int] = ()) -> bool:
+        """
+        Decides the clause set under `assumptions`. When satisfiable, `model[v]` is the
+        value of variable v.
+        """
+        self.model = None
+        if not self._ok:
+            return False
+        self._cancel_until(0)
+        restarts = 0
+        conflicts_left = _luby(0) * _RESTART_BASE
+        while True:
+            conflict = self._propagate()
+            if conflict is not None:
+                if not self._trail_lim:
+                    self._ok = False
+                    return False
+                learnt, backtrack_level = self._analyze(conflict)
+                self._cancel_until(backtrack_level)
+                if len(learnt) == 1:
+                    self._enqueue(learnt[0], None)
+                else:
+                    self._watches[learnt[0]].append(learnt)
+                    self._watches[learnt[1]].append(learnt)
+                    self._learnts.append(learnt)
+                    self._enqueue(learnt[0], learnt)
+                self._var_inc /= _VAR_DECAY
+                conflicts_left -= 1
+                continue
+
+            if conflicts_left <= 0:
+                restarts += 1
+                conflicts_left = _luby(restarts) * _RESTART_BASE
+                self._cancel_until(0)
+                continue
+            if len(self._learnts) - len(self._trail) >= self._max_learnts:
+                self._reduce_learnts()
+
+            level = len(self._trail_lim)
+            if level < len(assumptions):
+                # Cada suposición ocupa su propio nivel de decisión
+                lit = assumptions[level]
+                value = self._val.get(lit)
+                if value == -1:
+                    self._cancel_until(0)
+                    return False
+                self._trail_lim.append(len(self._trail))
+                if value is None:
+                    self._enqueue(lit, None)
+                continue
+
+            lit = self._pick_branch_literal()
+            if lit is None:
+                self.model = [False] + [self._val.get(v) == 1 for v in range(1, self.num_vars + 1)]
+                self._cancel_until(0)
+                return True
+            self._trail_lim.append(len(self._trail))
+            self._enqueue(lit, None)
+
+    def _enqueue(self, lit: int, reason: Optional[list]) -> None:
+        v = abs(lit)
+        self._val[lit] = 1
+        self._val[-lit] = -1
+        self._level[v] = len(self._trail_lim)
+        self._reason[v] = reason
+        self._trail.append(lit)
+
+    def _propagate(self) -> Optional[list]:
+        """
+        Unit propagation with two watched literals; returns a conflicting clause or None.
+        The watched literals of a clause are its first two positions.
+        """
+        val = self._val
+        watches = self._watches
+        trail = self._trail
+        while self._qhead < len(trail):
+            false_lit = -trail[self._qhead]
+            self._qhead += 1
+            watching = watches[false_lit]
+            i = j = 0
+            n = len(watching)
+            while i < n:
+                clause = watching[i]
+                i += 1
+                if clause[0] == false_lit:
+                    clause[0], clause[1] = clause[1], false_lit
+                first = clause[0]
+                if val.get(first) == 1:
+                    watching[j] = clause
+                    j += 1
+                    continue
+                for k in range(2, len(clause)):
+                    candidate = clause[k]
+                    if val.get(candidate) != -1:
+                        clause[1] = candidate
+                        clause[k] = false_lit
+                        watches[candidate].append(clause)
+                        break
+                else:
+                    watching[j] = clause
+                    j += 1
+                    if val.get(first) == -1:
+                        while i < n:
+                            watching[j] = watching[i]
+                            j += 1
+                            i += 1
+                        del watching[j:]
+                        self._qhead = len(trail)
+                        return clause
+                    self._enqueue(first, clause)
+            del watching[j:]
+        return None
+
+    def _analyze(self, conflict: list):
+        """
+        First-UIP conflict analysis. Returns the learnt clause, asserting literal first,
+        and the level to backjump to.
+        """
+        level = self._level
+        reason = self._reason
+        trail = self._trail
+        current_level = len(self._trail_lim)
+        seen = set()
+        learnt = [0]
+        pending = 0
+        index = len(trail) - 1
+        clause = conflict
+        lit = None
+        while True:
+            for q in (clause if lit is None else clause[1:]):
+                v = abs(q)
+                if v not in seen and level[v] > 0:
+                    seen.add(v)
+                    self._bump(v)
+                    if level[v] >= current_level:
+                        pending += 1
+                    else:
+                        learnt.append(q)
+            while abs(trail[index]) not in seen:
+                index -= 1
+            lit = trail[index]
+            index -= 1
+            clause = reason[abs(lit)]
+            pending -= 1
+            if pending == 0:
+                break
+        learnt[0] = -lit
+
+        if len(learnt) == 1:
+            return learnt, 0
+        best = max(range(1, len(learnt)), key=lambda k: level[abs(learnt[k])])
+        learnt[1], learnt[best] = learnt[best], learnt[1]
+        return learnt, level[abs(learnt[1])]
+
+    def _bump(self, v: int) -> None:
+        self._activity[v] += self._var_inc
+        if self._activity[v] > _RESCALE_LIMIT:
+            self._activity = [a / _RESCALE_LIMIT for a in self._activity]
+            self._var_inc /= _RESCALE_LIMIT
+            self._heap = [(-self._activity[u], u) for u in range(1, self.num_vars + 1)]
+            heapq.heapify(self._heap)
+        elif self._val.get(v) is None:
+            heapq.heappush(self._heap, (-self._activity[v], v))
+
+    def _pick_branch_literal(self) -> Optional[int]:
+        heap = self._heap
+        val = self._val
+        if len(heap) > 4 * self.num_vars + 64:
+            # Las entradas viejas se acumulan con cada bump: reconstruir el heap
+            self._heap = heap = [(-self._activity[v], v) for v in range(1, self.num_vars + 1) if v not in val]
+            heapq.heapify(heap)
+        while heap:
+            _, v = heapq.heappop(heap)
+            if v not in val:
+                return v if self._phase[v] else -v
+        return None
+
+    def _cancel_until(self, level: int) -> None:
+        if len(self._trail_lim) <= level:
+            return
+        val = self._val
+        heap = self._heap
+        start = self._trail_lim[level]
+        for lit in reversed(self._trail[start:]):
+            v = abs(lit)
+            del val[lit]
+            del val[-lit]
+            self._reason[v] = None
+            self._phase[v] = lit > 0
+            heapq.heappush(heap, (-self._activity[v], v))
+        del self._trail[start:]
+        del self._trail_lim[level:]
+        self._qhead = len(self._trail)
+
+    def _reduce_learnts(self) -> None:
+        # Se descarta la mitad más larga de las cláusulas aprendidas que no son razón de nada
+        locked = {id(self._reason[abs(lit)]) for lit in self._trail if self._reason[abs(lit)] is not None}
+        self._learnts.sort(key=len)
+        keep = len(self._learnts) // 2
+        removed = {id(c) for c in self._learnts[keep:] if id(c) not in locked and len(c) > 2}
+        self._learnts = [c for c in self._learnts if id(c) not in removed]
+        for watching in self._watches.values():
+            watching[:] = [c for c in watching if id(c) not in removed]
+        self._max_learnts = int(self._max_learnts * 1.1)
+
+
+class CNFEncoder:
+    """
+    Tseitin encoding of formulas into a Solver. Every distinct (interned) subformula gets
+    one literal, defined by clauses equivalent to it, so the definitions stay valid under
+    any later query and can be shared by all of them.
+    """
+    def __init__(self, solver: Optional[Solver] = None):
+        self.solver = solver if solver is not None else Solver()
+        self.variables: Dict[str, int] = {}
+        self._literals: Dict[Prop, int] = {}
+
+    def literal(self, formula: Prop) -> int:
+        """
+        Returns the literal equivalent to `formula`, encoding it first if needed.
+        """
+        literals = self._literals
+        solver = self.solver
+        stack = [formula]
+        while stack:
+            node = stack[-1]
+            if node in literals:
+                stack.pop()
+                continue
+            cls = type(node)
+            if cls is VAR:
+                lit = self.variables.get(node.name)
+                if lit is None:
+                    lit = self.variables[node.name] = solver.new_var()
+            elif cls is BOTTOM:
+                lit = solver.new_var()
+                solver.add_clause([-lit])
+            elif cls is NEG:
+                if node.prop not in literals:
+                    stack.append(node.prop)
+                    continue
+                lit = -literals[node.prop]
+            elif cls in (AND, OR, IMPLIES):
+                left, right = (node.premise, node.conclusion) if cls is IMPLIES else (node.left, node.right)
+                if left not in literals or right not in literals:
+                    stack.append(right)
+                    stack.append(left)
+                    continue
+                a, b = literals[left], literals[right]
+                if cls is IMPLIES:
+                    a = -a  # A → B ≡ ¬A ∨ B
+                lit = solver.new_var()
+                if cls is AND:
+                    solver.add_clause([-lit, a])
+                    solver.add_clause([-lit, b])
+                    solver.add_clause([lit, -a, -b])
+                else:
+                    solver.add_clause([-lit, a, b])
+                    solver.add_clause([lit, -a])
+                    solver.add_clause([lit, -b])
+            else:
+                raise TypeError(f"cannot encode {node!r}")
+            literals[node] = lit
+            stack.pop()
+        return literals[formula]
+
+
+class EntailmentChecker:
+    """
+    Decides classical entailment for many goals over one shared context.
+
+    The formulas of `contexto` are asserted once; every query then only encodes its new
+    subformulas and passes its extra assumptions and the negated goal as solver
+    assumptions.
+    """
+    def __init__(self, contexto: Iterable[Prop] = ()):
+        self.encoder = CNFEncoder()
+        for formula in contexto:
+            self.assume(formula)
+
+    def assume(self, formula: Prop) -> None:
+        """
+        Adds `formula` to the shared context for all later queries.
+        """
+        self.encoder.solver.add_clause([self.encoder.literal(formula)])
+
+    def countermodel(self, resolvente: Prop, extra: Iterable[Prop] = ()) -> Optional[Dict[str, bool]]:
+        """
+        Returns an assignment satisfying the context and `extra` but not `resolvente`,
+        or None if the entailment holds.
+        """
+        literal = self.encoder.literal
+        assumptions = [literal(formula) for formula in extra]
+        assumptions.append(-literal(resolvente))
+        solver = self.encoder.solver
+        if not solver.solve(assumptions):
+            return None
+        return {name: solver.model[v] for name, v in self.encoder.variables.items()}
+
+    def entails(self, resolvente: Prop, extra: Iterable[Prop] = ()) -> bool:
+        return self.countermodel(resolvente, extra) is None
+
+
+def find_countermodel(contexto: Iterable[Prop], resolvente: Prop) -> Optional[Dict[str, bool]]:
+    """
+    Same as `truth_table.find_countermodel`, for sequents with many variables.
+    """
+    return EntailmentChecker(contexto).countermodel(resolvente)
+
+
+def entails(contexto: Iterable[Prop], resolvente: Prop) -> bool:
+    """
+    Returns True if `contexto ⊢ resolvente` holds classically.
+    """
+    return find_countermodel(contexto, resolvente) is None
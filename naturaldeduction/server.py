@@ -0,0 +1,519 @@
+"""
+JSON-lines session server: many interactive proofs served from one process.
+
+Clients connect over TCP or a Unix socket and send one JSON object per line; every
+request gets exactly one reply line with the same "id":
+
+    {"id": 1, "op": "create", "contexto": ["P → Q", "P"], "resolvente": "Q"}
+    {"id": 1, "ok": true, "session": "3f1c9a0b2d4e5f60", "open": [0]}
+
+    {"id": 2, "op": "apply", "session": "3f1c...", "step": 0, "rule": "→E", "witnesses": ["P"]}
+    {"id": 2, "ok": true, "applied": true, "outcome": "applied", "new_steps": [1, 2], ...}
+
+    {"id": 3, "op": "nope"}
+    {"id": 3, "ok": false, "error": "unknown op 'nope'"}
+
+Operations (the session ones take "session"):
+
+    create      contexto, resolvente, modo ('classical' or 'intuitionistic')
+    apply       step, rule (value or name), witnesses
+    undo        undoes the last rule application
+    open        the open goals as sequents
+    suggest     step: the applicable rules with witness candidates
+    render      view ('flat', 'tree' or 'fitch'), start, stop: a page of the proof
+    prove       step (default 0): automatic proof search for that goal
+    valid       step, or contexto and resolvente: classical and intuitionistic validity
+    close       drops the session
+    stats       server counters
+
+Everything but `prove` and `valid` runs on the event loop and takes microseconds to a
+few milliseconds. Those two are CPU-bound, so they run in a process pool with a budget
+of their own, and their replies may overtake the replies of later requests of the same
+connection; match them by "id". The requests of one connection are otherwise handled in
+order.
+
+Sessions live in an LRU: the least recently used ones are evicted when there are more
+than `max_sessions` or when all of them together have more than `max_steps` proof
+steps, and a background sweep drops the ones idle for longer than `idle_timeout`.
+
+Usage:
+    python -m naturaldeduction.server --port 8765
+    python -m naturaldeduction.server --unix /tmp/natural-deduction.sock --workers 4
+"""
+import argparse
+import asyncio
+import json
+import os
+import secrets
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Optional
+
+from .formulas import Prop, pretty_print
+from .g4ip import is_intuitionistically_valid
+from .limits import TaskTimeout, time_limit
+from .parser import parse_formula
+from .proof_script import to_script
+from .prover import ProofSearchTimeout, Prover
+from .resolver import Resolver, RuleEvent, RuleObserver
+from .rules import RULES_BY_TOKEN, LogicMode
+from .sat import find_countermodel as sat_countermodel
+from .truth_table import compile_formulas, evaluate
+
+_MODES = {modo.value: modo for modo in LogicMode}
+
+# Las tablas de verdad son más rápidas que el SAT solver hasta esta cantidad de variables
+_TABLE_MAX_VARIABLES = 16
+# Filas por página de `render` si el cliente no pide otra cosa
+_DEFAULT_PAGE = 100
+_MAX_LINE = 1 << 20
+# Conexiones pendientes de aceptar; con el valor por defecto (100) se pierden ráfagas
+_BACKLOG = 4096
+
+
+class RequestError(Exception):
+    """
+    A request that cannot be served; its message is sent back to the client.
+    """
+
+
+# --- Executor jobs (they run in the worker processes) ---
+def _prove_job(contexto: List[str], resolvente: str, clasico: bool, timeout: float,
+               max_nodes: int, hard_limit: Optional[float]) -> dict:
+    try:
+        with time_limit(hard_limit):
+            prover = Prover(tiempo_max=timeout, max_nodos=max_nodes, clasico=clasico)
+            resolver = prover.prove([parse_formula(f) for f in contexto], parse_formula(resolvente))
+    except (ProofSearchTimeout, TaskTimeout):
+        return {"status": "timeout"}
+    if resolver is None:
+        return {"status": "failed"}
+    return {"status": "proved", "steps": len(resolver.pasos), "script": to_script(resolver)}
+
+
+def _valid_job(contexto: List[str], resolvente: str, hard_limit: Optional[float]) -> dict:
+    formulas = [parse_formula(f) for f in contexto]
+    goal = parse_formula(resolvente)
+    try:
+        with time_limit(hard_limit):
+            program = compile_formulas([*formulas, goal])
+            if len(program.variables) <= _TABLE_MAX_VARIABLES:
+                countermodel = evaluate(program)
+            else:
+                countermodel = sat_countermodel(formulas, goal)
+            result = {"classical": countermodel is None, "countermodel": countermodel}
+            # Sin validez clásica tampoco hay validez intuicionista
+            result["intuitionistic"] = countermodel is None and is_intuitionistically_valid(formulas, goal)
+    except TaskTimeout:
+        return {"status": "timeout"}
+    return {"status": "done", **result}
+
+
+# --- Sessions ---
+class Session(RuleObserver):
+    """
+    One Resolver plus what the server needs to know about it. It observes its own
+    Resolver to report the outcome of every rule application.
+    """
+    __slots__ = ('id', 'resolver', 'last_used', 'steps', 'last_event')
+
+    def __init__(self, session_id: str, resolver: Resolver):
+        self.id = session_id
+        self.resolver = resolver
+        self.last_used = time.monotonic()
+        self.steps = len(resolver.pasos)
+        self.last_event: Optional[RuleEvent] = None
+        resolver.subscribe(self)
+
+    def on_rule(self, event: RuleEvent) -> None:
+        self.last_event = event
+
+
+class SessionStore:
+    """
+    The open sessions, least recently used first.
+
+    Args:
+        max_sessions (int): Sessions kept before evicting the least recently used.
+        max_steps (int): Proof steps kept, over all sessions, before evicting.
+        max_session_steps (int): Steps a single session may grow to.
+        idle_timeout (float): Seconds without requests after which a session is dropped.
+    """
+    def __init__(self, max_sessions: int = 10_000, max_steps: int = 5_000_000,
+                 max_session_steps: int = 200_000, idle_timeout: float = 900.0):
+        self.max_sessions = max_sessions
+        self.max_steps = max_steps
+        self.max_session_steps = max_session_steps
+        self.idle_timeout = idle_timeout
+        self.total_steps = 0
+        self.evicted = 0
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def create(self, resolver: Resolver) -> Session:
+        session_id = secrets.token_hex(8)
+        while session_id in self._sessions:
+            session_id = secrets.token_hex(8)
+        session = self._sessions[session_id] = Session(session_id, resolver)
+        self.total_steps += session.steps
+        self._enforce_caps(keep=session)
+        return session
+
+    def get(self, session_id: str) -> Session:
+        session = self._sessions.get(session_id)
+        if session is None:
+            raise RequestError(f"unknown session {session_id!r} (closed or evicted)")
+        self._sessions.move_to_end(session_id)
+        session.last_used = time.monotonic()
+        return session
+
+    def resized(self, session: Session) -> None:
+        """
+        Accounts for the steps a session gained or lost in the last operation.
+        """
+        steps = len(session.resolver.pasos)
+        self.total_steps += steps - session.steps
+        session.steps = steps
+        self._enforce_caps(keep=session)
+
+    def close(self, session_id: str) -> bool:
+        session = self._sessions.pop(session_id, None)
+        if session is None:
+            return False
+        self.total_steps -= session.steps
+        return True
+
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        """
+        Drops the sessions idle for longer than `idle_timeout`. Only the expired ones
+        are looked at, since the LRU keeps them at the front.
+        """
+        deadline = (time.monotonic() if now is None else now) - self.idle_timeout
+        dropped = 0
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if session.last_used > deadline:
+                break
+            self.close(session.id)
+            dropped += 1
+        self.evicted += dropped
+        return dropped
+
+    def _enforce_caps(self, keep: Session) -> None:
+        while len(self._sessions) > 1 and (len(self._sessions) > self.max_sessions
+                                           or self.total_steps > self.max_steps):
+            oldest = next(iter(self._sessions))
+            if oldest == keep.id:
+                break
+            self.close(oldest)
+            self.evicted += 1
+
+
+# --- Server ---
+class ProofServer:
+    """
+    Serves the JSON-lines protocol. `handle` can also be used directly, without a
+    socket.
+
+    Args:
+        store (SessionStore): Where the sessions live.
+        executor (Executor): Where `prove` and `valid` run. With a process pool they
+            also get a hard time limit.
+        max_jobs (int): Executor jobs in flight; later ones wait their turn.
+        timeout (float): Search budget of `prove`, in seconds.
+        max_nodes (int): Search nodes of `prove`.
+    """
+    def __init__(self, store: SessionStore, executor: Executor, max_jobs: int = 64,
+                 timeout: float = 10.0, max_nodes: int = 200_000):
+        self.store = store
+        self.executor = executor
+        self.timeout = timeout
+        self.max_nodes = max_nodes
+        self.requests = 0
+        self.errors = 0
+        self._hard_limits = isinstance(executor, ProcessPoolExecutor)
+        self._jobs = asyncio.Semaphore(max_jobs)
+        self._handlers = {
+            'create': self._create, 'apply': self._apply, 'undo': self._undo, 'open': self._open,
+            'suggest': self._suggest, 'render': self._render, 'close': self._close,
+            'stats': self._stats,
+        }
+        self._jobs_handlers = {'prove': self._prove, 'valid': self._valid}
+
+    def is_job(self, request: dict) -> bool:
+        return request.get('op') in self._jobs_handlers
+
+    async def handle(self, request: dict) -> dict:
+        """
+        Serves one request and returns its reply.
+        """
+        self.requests += 1
+        request_id = request.get('id')
+        op = request.get('op')
+        try:
+            handler = self._handlers.get(op)
+            if handler is not None:
+                result = handler(request)
+            elif op in self._jobs_handlers:
+                result = await self._jobs_handlers[op](request)
+            else:
+                raise RequestError(f"unknown op {op!r}")
+        except RequestError as e:
+            self.errors += 1
+            return {"id": request_id, "ok": False, "error": str(e)}
+        except (ValueError, KeyError, TypeError) as e:
+            self.errors += 1
+            return {"id": request_id, "ok": False, "error": f"{type(e).__name__}: {e}"}
+        except Exception as e:
+            # Un error inesperado no puede dejar al cliente sin respuesta ni cortar la conexión
+            self.errors += 1
+            return {"id": request_id, "ok": False, "error": f"internal error: {type(e).__name__}: {e}"}
+        return {"id": request_id, "ok": True, **result}
+
+    async def serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        jobs = set()
+        lock = asyncio.Lock()
+
+        async def reply(response: dict) -> None:
+            async with lock:
+                writer.write((json.dumps(response, ensure_ascii=False) + "\n").encode('utf-8'))
+                await writer.drain()
+
+        async def run_job(request: dict) -> None:
+            await reply(await self.handle(request))
+
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    await reply({"id": None, "ok": False, "error": f"line longer than {_MAX_LINE} bytes"})
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("expected a JSON object")
+                except ValueError as e:
+                    self.errors += 1
+                    await reply({"id": None, "ok": False, "error": f"invalid request: {e}"})
+                    continue
+                if self.is_job(request):
+                    # Las búsquedas no frenan al resto de los pedidos de la conexión
+                    job = asyncio.create_task(run_job(request))
+                    jobs.add(job)
+                    job.add_done_callback(jobs.discard)
+                else:
+                    await reply(await self.handle(request))
+            if jobs:
+                await asyncio.gather(*jobs, return_exceptions=True)
+        except ConnectionError:
+            for job in jobs:
+                job.cancel()
+        finally:
+            writer.close()
+
+    async def sweep(self, interval: float) -> None:
+        """
+        Evicts idle sessions every `interval` seconds, forever.
+        """
+        while True:
+            await asyncio.sleep(interval)
+            self.store.evict_idle()
+
+    # --- Operaciones sobre sesiones ---
+    def _session(self, request: dict) -> Session:
+        session_id = request.get('session')
+        if not isinstance(session_id, str):
+            raise RequestError("missing 'session'")
+        return self.store.get(session_id)
+
+    @staticmethod
+    def _step(request: dict, session: Session, default: Optional[int] = None) -> int:
+        step = request.get('step', default)
+        if isinstance(step, bool) or not isinstance(step, int) or not 0 <= step < len(session.resolver.pasos):
+            raise RequestError(f"invalid step {step!r}")
+        return step
+
+    @staticmethod
+    def _formula(request: dict, key: str) -> Prop:
+        if key not in request:
+            raise RequestError(f"missing {key!r}")
+        text = request[key]
+        if not isinstance(text, str):
+            raise RequestError(f"{key!r} must be a formula string, got {text!r}")
+        return parse_formula(text)
+
+    @staticmethod
+    def _formula_list(request: dict, key: str) -> List[Prop]:
+        texts = request.get(key, ())
+        if not isinstance(texts, (list, tuple)) or not all(isinstance(text, str) for text in texts):
+            raise RequestError(f"{key!r} must be a list of formula strings")
+        return [parse_formula(text) for text in texts]
+
+    @staticmethod
+    def _open_goals(resolver: Resolver) -> List[int]:
+        return sorted(resolver.pasos_a_resolver)
+
+    def _create(self, request: dict) -> dict:
+        modo = _MODES.get(request.get('modo', LogicMode.CLASSICAL.value))
+        if modo is None:
+            raise RequestError(f"unknown modo {request.get('modo')!r}, expected one of {sorted(_MODES)}")
+        contexto = self._formula_list(request, 'contexto')
+        resolver = Resolver(contexto, self._formula(request, 'resolvente'), modo=modo)
+        session = self.store.create(resolver)
+        return {"session": session.id, "open": self._open_goals(resolver)}
+
+    def _apply(self, request: dict) -> dict:
+        session = self._session(request)
+        resolver = session.resolver
+        regla = RULES_BY_TOKEN.get(request.get('rule'))
+        if regla is None:
+            raise RequestError(f"unknown rule {request.get('rule')!r}")
+        if session.steps >= self.store.max_session_steps:
+            raise RequestError(f"session reached {self.store.max_session_steps} steps")
+        step = self._step(request, session)
+        testigos = self._formula_list(request, 'witnesses')
+        before = len(resolver.pasos)
+        applied = resolver.aplicarRegla(step, regla, *testigos)
+        self.store.resized(session)
+        return {"applied": applied, "outcome": session.last_event.outcome.value,
+                "new_steps": list(range(before, len(resolver.pasos))),
+                "open": self._open_goals(resolver), "complete": resolver.isProofComplete()}
+
+    def _undo(self, request: dict) -> dict:
+        session = self._session(request)
+        undone = session.resolver.undo()
+        self.store.resized(session)
+        return {"undone": undone, "open": self._open_goals(session.resolver)}
+
+    def _open(self, request: dict) -> dict:
+        session = self._session(request)
+        resolver = session.resolver
+        goals = []
+        for idx in self._open_goals(resolver):
+            goals.append({"step": idx, "sequent": resolver.pasos.paso(idx).toString()})
+        return {"open": goals, "complete": resolver.isProofComplete()}
+
+    def _suggest(self, request: dict) -> dict:
+        session = self._session(request)
+        step = self._step(request, session)
+        return {"suggestions": [
+            {"rule": sugerencia.regla.value,
+             "witnesses": [[pretty_print(t, minimal=True) for t in candidato] for candidato in sugerencia.testigos]}
+            for sugerencia in session.resolver.suggest(step)]}
+
+    def _render(self, request: dict) -> dict:
+        session = self._session(request)
+        renderer = session.resolver.renderer
+        view = request.get('view', 'flat')
+        start = request.get('start', 0)
+        stop = request.get('stop', start + _DEFAULT_PAGE)
+        if not isinstance(start, int) or not isinstance(stop, int):
+            raise RequestError("'start' and 'stop' must be integers")
+        if view not in renderer.VIEWS:
+            raise RequestError(f"unknown view {view!r}, expected one of {list(renderer.VIEWS)}")
+        return {"lines": renderer.render(view, start, stop), "rows": renderer.rows(view)}
+
+    def _close(self, request: dict) -> dict:
+        session_id = request.get('session')
+        return {"closed": isinstance(session_id, str) and self.store.close(session_id)}
+
+    def _stats(self, request: dict) -> dict:
+        store = self.store
+        return {"sessions": len(store), "steps": store.total_steps, "evicted": store.evicted,
+                "requests": self.requests, "errors": self.errors}
+
+    # --- Trabajos en el executor ---
+    def _sequent(self, request: dict, default_step: Optional[int]) -> tuple:
+        if 'session' in request:
+            session = self._session(request)
+            paso = session.resolver.pasos.paso(self._step(request, session, default_step))
+            contexto, resolvente, modo = list(paso.contexto), paso.resolvente, session.resolver.modo
+        else:
+            contexto = self._formula_list(request, 'contexto')
+            resolvente = self._formula(request, 'resolvente')
+            modo = _MODES.get(request.get('modo', LogicMode.CLASSICAL.value), LogicMode.CLASSICAL)
+        # Las fórmulas viajan al worker como texto, que se vuelve a leer allá
+        return [pretty_print(f, minimal=True) for f in contexto], pretty_print(resolvente, minimal=True), modo
+
+    async def _run_job(self, function, *args):
+        async with self._jobs:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, function, *args)
+
+    def _hard_limit(self) -> Optional[float]:
+        return self.timeout * 1.5 if self._hard_limits and self.timeout else None
+
+    async def _prove(self, request: dict) -> dict:
+        contexto, resolvente, modo = self._sequent(request, 0)
+        return await self._run_job(_prove_job, contexto, resolvente, modo is LogicMode.CLASSICAL,
+                                   self.timeout, self.max_nodes, self._hard_limit())
+
+    async def _valid(self, request: dict) -> dict:
+        contexto, resolvente, _ = self._sequent(request, None)
+        return await self._run_job(_valid_job, contexto, resolvente, self._hard_limit())
+
+
+async def serve(server: ProofServer, host: str = '127.0.0.1', port: int = 8765,
+                unix: Optional[str] = None, sweep_interval: float = 30.0) -> None:
+    """
+    Listens on `unix` (a socket path) or on `host`:`port` until cancelled.
+    """
+    if unix is not None:
+        listener = await asyncio.start_unix_server(server.serve_connection, path=unix, limit=_MAX_LINE,
+                                                 backlog=_BACKLOG)
+    else:
+        listener = await asyncio.start_server(server.serve_connection, host, port, limit=_MAX_LINE,
+                                            backlog=_BACKLOG)
+    sweeper = asyncio.create_task(server.sweep(sweep_interval))
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        sweeper.cancel()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve interactive natural deduction sessions over JSON lines.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', help="listen on this Unix socket path instead of TCP")
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 1,
+                        help="worker processes for prove/valid (0 uses a thread in this process)")
+    parser.add_argument('--max-jobs', type=int, default=64, help="prove/valid jobs in flight")
+    parser.add_argument('--timeout', type=float, default=10.0, help="seconds per proof search")
+    parser.add_argument('--max-nodes', type=int, default=200_000, help="search nodes per proof search")
+    parser.add_argument('--max-sessions', type=int, default=10_000)
+    parser.add_argument('--max-steps', type=int, default=5_000_000, help="proof steps kept over all sessions")
+    parser.add_argument('--max-session-steps', type=int, default=200_000)
+    parser.add_argument('--idle-timeout', type=float, default=900.0, help="seconds before an idle session is dropped")
+    args = parser.parse_args(argv)
+
+    store = SessionStore(args.max_sessions, args.max_steps, args.max_session_steps, args.idle_timeout)
+    executor = ProcessPoolExecutor(args.workers) if args.workers > 0 else ThreadPoolExecutor(1)
+
+    async def run() -> None:
+        server = ProofServer(store, executor, args.max_jobs, args.timeout, args.max_nodes)
+        await serve(server, args.host, args.port, args.unix, sweep_interval=min(30.0, args.idle_timeout / 4))
+
+    where = args.unix or f"{args.host}:{args.port}"
+    print(f"Serving natural deduction sessions on {where}", file=sys.stderr)
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        executor.shutdown(cancel_futures=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
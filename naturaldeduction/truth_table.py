@@ -0,0 +1,227 @@
+"""
+Vectorized truth tables, used as a fast classical validity pre-check.
+
+A formula (or a whole sequent) is compiled into a flat list of instructions over its
+distinct subformulas, which is then evaluated for 64 assignments per machine word:
+with NumPy over arrays of uint64 words when it is installed, otherwise over Python
+integers used as bit vectors. The 2^n assignments are processed in chunks of
+2^CHUNK_BITS, so memory stays bounded for any number of variables.
+
+A sequent that is not classically valid has no proof in any of the rule sets of
+`LogicRules`, which is what the prover uses to prune subgoals.
+"""
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .formulas import AND, BOTTOM, IMPLIES, NEG, OR, VAR, Prop
+
+OP_VAR, OP_BOTTOM, OP_NEG, OP_AND, OP_OR, OP_IMPLIES = range(6)
+_BINARY_OPCODES = {AND: OP_AND, OR: OP_OR, IMPLIES: OP_IMPLIES}
+
+CHUNK_BITS = 20      # asignaciones por bloque: 2^20
+_WORD_BITS = 6       # 64 asignaciones por palabra
+_WORD_MASK = (1 << 64) - 1
+_NUMPY_MIN_VARIABLES = 12
+
+# Patrón de las 6 primeras variables dentro de una palabra de 64 asignaciones
+_LOW_PATTERNS = (0xAAAAAAAAAAAAAAAA, 0xCCCCCCCCCCCCCCCC, 0xF0F0F0F0F0F0F0F0,
+                 0xFF00FF00FF00FF00, 0xFFFF0000FFFF0000, 0xFFFFFFFF00000000)
+
+
+class Program:
+    """
+    A compiled set of formulas. Instruction i computes slot i; `roots` are the slots of
+    the compiled formulas and `variables` the variable names, by index.
+    """
+    __slots__ = ('instructions', 'roots', 'variables')
+
+    def __init__(self, instructions: List[Tuple[int, int, int]], roots: List[int], variables: List[str]):
+        self.instructions = instructions
+        self.roots = roots
+        self.variables = variables
+
+
+def compile_formulas(formulas: Iterable[Prop]) -> Program:
+    """
+    Compiles `formulas` into one Program. Shared subformulas (the same interned node)
+    are computed once. The traversal uses an explicit stack.
+    """
+    slots: Dict[Prop, int] = {}
+    variables: Dict[str, int] = {}
+    instructions: List[Tuple[int, int, int]] = []
+    roots = []
+    for formula in formulas:
+        stack = [(formula, False)]
+        while stack:
+            node, children_done = stack.pop()
+            if node in slots:
+                continue
+            cls = type(node)
+            if cls is VAR:
+                instruction = (OP_VAR, variables.setdefault(node.name, len(variables)), 0)
+            elif cls is BOTTOM:
+                instruction = (OP_BOTTOM, 0, 0)
+            elif cls is NEG:
+                if not children_done:
+                    stack.append((node, True))
+                    stack.append((node.prop, False))
+                    continue
+                instruction = (OP_NEG, slots[node.prop], 0)
+            elif cls in _BINARY_OPCODES:
+                left, right = (node.premise, node.conclusion) if cls is IMPLIES else (node.left, node.right)
+                if not children_done:
+                    stack.append((node, True))
+                    stack.append((right, False))
+                    stack.append((left, False))
+                    continue
+                instruction = (_BINARY_OPCODES[cls], slots[left], slots[right])
+            else:
+                raise TypeError(f"cannot evaluate {node!r}")
+            slots[node] = len(instructions)
+            instructions.append(instruction)
+        roots.append(slots[formula])
+    return Program(instructions, roots, list(variables))
+
+
+@lru_cache(maxsize=32)
+def _int_patterns(chunk_bits: int) -> Tuple[int, Tuple[int, ...]]:
+    # Variable i dentro de un bloque de 2^chunk_bits asignaciones, como entero de Python
+    size = 1 << chunk_bits
+    full = (1 << size) - 1
+    patterns = []
+    for i in range(chunk_bits):
+        half = 1 << i
+        period_ones = (1 << (2 * half)) - 1
+        repeat = full // period_ones
+        patterns.append(repeat * (((1 << half) - 1) << half))
+    return full, tuple(patterns)
+
+
+@lru_cache(maxsize=None)
+def _numpy():
+    # NumPy es opcional (sin él se usan enteros de Python como vectores de bits) y se
+    # importa recién cuando una tabla es lo bastante grande para usarlo
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+@lru_cache(maxsize=32)
+def _numpy_patterns(chunk_bits: int) -> Tuple[object, Tuple[object, ...]]:
+    # Variable i dentro de un bloque, como arreglo de palabras uint64
+    np = _numpy()
+    words = 1 << (chunk_bits - _WORD_BITS)
+    full = np.full(words, _WORD_MASK, dtype=np.uint64)
+    index = np.arange(words, dtype=np.uint64)
+    patterns = [np.full(words, pattern, dtype=np.uint64) for pattern in _LOW_PATTERNS]
+    for i in range(_WORD_BITS, chunk_bits):
+        bit = ((index >> np.uint64(i - _WORD_BITS)) & np.uint64(1)).astype(bool)
+        patterns.append(np.where(bit, np.uint64(_WORD_MASK), np.uint64(0)))
+    return full, tuple(patterns)
+
+
+def _run(program: Program, columns: List[object], zero: object, full: object) -> List[object]:
+    values: List[object] = []
+    append = values.append
+    for opcode, a, b in program.instructions:
+        if opcode == OP_VAR:
+            append(columns[a])
+        elif opcode == OP_BOTTOM:
+            append(zero)
+        elif opcode == OP_NEG:
+            append(full ^ values[a])
+        elif opcode == OP_AND:
+            append(values[a] & values[b])
+        elif opcode == OP_OR:
+            append(values[a] | values[b])
+        else:
+            append((full ^ values[a]) | values[b])
+    return values
+
+
+def _first_failure(program: Program, use_numpy: bool) -> Optional[int]:
+    """
+    Returns the index of the first assignment that makes every root but the last one
+    true and the last one false, or None if there is no such assignment. Bit i of the
+    index is the value of variable i.
+    """
+    n = len(program.variables)
+    chunk_bits = min(max(n, _WORD_BITS), CHUNK_BITS)
+    *premises, conclusion = program.roots
+    if use_numpy:
+        np = _numpy()
+        full, patterns = _numpy_patterns(chunk_bits)
+        zero = np.zeros_like(full)
+    else:
+        full, patterns = _int_patterns(chunk_bits)
+        zero = 0
+    # Las asignaciones que sobran cuando hay menos de 6 variables se ignoran
+    valid = (1 << (1 << n)) - 1 if n < _WORD_BITS else None
+
+    for chunk in range(1 << max(n - chunk_bits, 0)):
+        columns = list(patterns[:min(n, chunk_bits)])
+        for i in range(chunk_bits, n):
+            columns.append(full if (chunk >> (i - chunk_bits)) & 1 else zero)
+        values = _run(program, columns, zero, full)
+        bad = full ^ values[conclusion]
+        for root in premises:
+            bad = bad & values[root]
+        if use_numpy:
+            nonzero = np.flatnonzero(bad)
+            if not len(nonzero):
+                continue
+            word_index = int(nonzero[0])
+            word = int(bad[word_index])
+        else:
+            word_index, word = 0, bad
+        if valid is not None:
+            # Con menos de 6 variables hay una sola palabra
+            word &= valid
+        if word:
+            bit = (word & -word).bit_length() - 1
+            return (chunk << chunk_bits) | (word_index << _WORD_BITS) | bit
+    return None
+
+
+def _assignment(program: Program, index: int) -> Dict[str, bool]:
+    return {name: bool((index >> i) & 1) for i, name in enumerate(program.variables)}
+
+
+def evaluate(program: Program, use_numpy: Optional[bool] = None) -> Optional[Dict[str, bool]]:
+    """
+    Reads a compiled Program as a sequent (its last root is the resolvent, the others
+    the context) and returns a countermodel, or None if the sequent is valid.
+    `use_numpy` forces a backend; by default NumPy is used, when available, for tables
+    large enough to amortize its per-operation overhead.
+    """
+    if use_numpy is None:
+        use_numpy = len(program.variables) >= _NUMPY_MIN_VARIABLES and _numpy() is not None
+    index = _first_failure(program, use_numpy)
+    return None if index is None else _assignment(program, index)
+
+
+def find_countermodel(contexto: Iterable[Prop], resolvente: Prop,
+                      use_numpy: Optional[bool] = None) -> Optional[Dict[str, bool]]:
+    """
+    Returns an assignment (variable name -> bool) that makes every formula of
+    `contexto` true and `resolvente` false, or None if `contexto ⊢ resolvente` is
+    classically valid.
+    """
+    return evaluate(compile_formulas([*contexto, resolvente]), use_numpy)
+
+
+def is_classically_valid(contexto: Iterable[Prop], resolvente: Prop) -> bool:
+    """
+    Returns True if every assignment that satisfies `contexto` satisfies `resolvente`.
+    """
+    return find_countermodel(contexto, resolvente) is None
+
+
+def check_validity(formula: Prop) -> Tuple[bool, Optional[Dict[str, bool]]]:
+    """
+    Returns (True, None) if `formula` is a tautology and (False, counterexample) otherwise.
+    """
+    countermodel = find_countermodel((), formula)
+    return countermodel is None, countermodel
@@ -0,0 +1,61 @@
+import random
+
+import pytest
+
+from naturaldeduction.formulas import AND, BOTTOM, IMPLIES, NEG, OR, VAR
+
+
+def _random_formula(rnd: random.Random, depth: int, atoms: str):
+    if depth == 0 or rnd.random() < 0.2:
+        return BOTTOM() if rnd.random() < 0.05 else VAR(rnd.choice(atoms))
+    kind = rnd.randrange(4)
+    if kind == 0:
+        return NEG(_random_formula(rnd, depth - 1, atoms))
+    cls = (AND, OR, IMPLIES)[kind - 1]
+    return cls(_random_formula(rnd, depth - 1, atoms), _random_formula(rnd, depth - 1, atoms))
+
+
+@pytest.fixture
+def random_formulas():
+    """
+    random_formulas(count, depth=4, atoms="PQR", seed=0): a reproducible list of formulas.
+    """
+    def generate(count: int, depth: int = 4, atoms: str = "PQR", seed: int = 0):
+        rnd = random.Random(seed)
+        return [_random_formula(rnd, depth, atoms) for _ in range(count)]
+    return generate
+
+
+def _holds(formula, model) -> bool:
+    cls = type(formula)
+    if cls is VAR:
+        return model.get(formula.name, False)
+    if cls is BOTTOM:
+        return False
+    if cls is NEG:
+        return not _holds(formula.prop, model)
+    if cls is AND:
+        return _holds(formula.left, model) and _holds(formula.right, model)
+    if cls is OR:
+        return _holds(formula.left, model) or _holds(formula.right, model)
+    return not _holds(formula.premise, model) or _holds(formula.conclusion, model)
+
+
+@pytest.fixture
+def holds():
+    """
+    holds(formula, model): the classical truth value of `formula` under `model`.
+    """
+    return _holds
+
+
+@pytest.fixture
+def assert_countermodel():
+    """
+    assert_countermodel(contexto, resolvente, model): checks that `model` satisfies the
+    context and falsifies the resolvent.
+    """
+    def check(contexto, resolvente, model):
+        assert all(_holds(f, model) for f in contexto) and not _holds(resolvente, model)
+    return check
+
@@ -0,0 +1,54 @@
+import io
+import json
+
+import pytest
+
+from naturaldeduction.batch import run_batch
+
+LINES = [
+    '{"contexto": ["P → Q", "P"], "resolvente": "Q"}',
+    '[1, 2]',
+    '"x"',
+    '{"contexto": [1], "resolvente": "P"}',
+    'not json',
+    '',
+    '{"resolvente": "P ∨ ¬P"}',
+    '{"resolvente": "P"}',
+]
+
+
+def run(mode, lines, **opciones):
+    sink = io.StringIO()
+    totals = run_batch(mode, lines, sink, **opciones)
+    results = {r["line"]: r for r in map(json.loads, sink.getvalue().splitlines())}
+    return totals, results
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_bad_lines_become_error_records(workers):
+    totals, results = run('prove', LINES, workers=workers, chunk_size=2, timeout=5.0)
+    assert totals == {"proved": 2, "failed": 1, "timeout": 0, "error": 4}
+    assert sorted(results) == [1, 2, 3, 4, 5, 7, 8]
+    assert [results[n]["status"] for n in (2, 3, 4, 5)] == ["error"] * 4
+    assert results[7]["status"] == "proved" and results[8]["status"] == "failed"
+
+
+def test_check_replays_scripts():
+    scripts = [json.dumps({"script": "P → Q, P ⊢ Q\n0 →E P\n1 Axiom\n2 Axiom\n"}),
+               json.dumps({"script": "P ⊢ Q\n"}),
+               json.dumps({"script": 5})]
+    totals, results = run('check', scripts)
+    assert [results[n]["status"] for n in (1, 2, 3)] == ["proved", "failed", "error"]
+    assert results[3]["error"] == "TypeError: 'script' must be a string, got int"
+
+
+@pytest.mark.parametrize("record, message", [
+    ({"resolvente": 5}, "'resolvente' must be a string, got int"),
+    ({"resolvente": ["P"]}, "'resolvente' must be a string, got list"),
+    ({"contexto": "P", "resolvente": "P"}, "'contexto' must be a list of strings"),
+    ({"contexto": ["P", None], "resolvente": "P"}, "'contexto' must be a list of strings"),
+])
+def test_mistyped_fields_are_reported(record, message):
+    totals, results = run('prove', [json.dumps(record)])
+    assert totals["error"] == 1
+    assert results[1]["error"] == f"TypeError: {message}"
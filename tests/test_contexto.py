@@ -0,0 +1,29 @@
+import pytest
+
+from naturaldeduction.contexto import Contexto
+from naturaldeduction.formulas import AND, VAR
+
+P, Q, R = VAR("P"), VAR("Q"), VAR("R")
+
+
+def test_add_extends_in_order():
+    contexto = Contexto([P]) + [Q, P, R]
+    assert list(contexto) == [P, Q, R]
+
+
+def test_radd_puts_the_left_formulas_first():
+    contexto = [Q, P] + Contexto([P, R])
+    assert isinstance(contexto, Contexto)
+    assert list(contexto) == [Q, P, R]
+    assert contexto == Contexto([P, Q, R])
+    assert list((AND(P, Q),) + Contexto([P])) == [AND(P, Q), P]
+
+
+def test_radd_with_nothing_on_the_left():
+    contexto = Contexto([P, Q])
+    assert list([] + contexto) == [P, Q]
+
+
+def test_radd_validates_the_formulas():
+    with pytest.raises(TypeError):
+        ["P"] + Contexto([Q])
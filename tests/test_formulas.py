@@ -0,0 +1,238 @@
+import copy
+import gc
+import io
+import pickle
+import threading
+import weakref
+from dataclasses import FrozenInstanceError
+
+import pytest
+
+from naturaldeduction.bench import deep_and, deep_or, right_implications
+from naturaldeduction import formulas
+from naturaldeduction.formulas import (AND, BOTTOM, IMPLIES, NEG, OR, VAR, clear_render_cache, formula_table_size,
+                                       pretty_print, write_formula)
+from naturaldeduction.parser import parse_formula, parse_many, parse_sequent
+
+P, Q = VAR("P"), VAR("Q")
+
+
+def _rebuild(formula):
+    # Una copia estructural, construida nodo por nodo desde las hojas
+    if type(formula) is VAR:
+        return VAR(formula.name)
+    return type(formula)(*(_rebuild(getattr(formula, field)) for field in formula._fields))
+
+
+def test_equal_formulas_are_the_same_object(random_formulas):
+    assert VAR("P") is P and BOTTOM() is BOTTOM()
+    assert AND(P, Q) is AND(P, Q) and AND(P, Q) is not AND(Q, P)
+    assert OR(P, Q) is not AND(P, Q)
+    for formula in random_formulas(300, depth=6):
+        copy_ = _rebuild(formula)
+        assert copy_ is formula and copy_ == formula and hash(copy_) == hash(formula)
+
+
+def test_hash_is_cached_and_structural():
+    formula = IMPLIES(NEG(P), AND(P, Q))
+    assert hash(formula) == formula._hash
+    assert {formula: 1}[IMPLIES(NEG(VAR("P")), AND(P, VAR("Q")))] == 1
+    assert formula != IMPLIES(NEG(Q), AND(P, Q))
+
+
+def test_keyword_and_positional_construction():
+    assert IMPLIES(premise=P, conclusion=Q) is IMPLIES(P, Q)
+    assert AND(P, right=Q) is AND(P, Q)
+    assert NEG(prop=P).prop is P
+    with pytest.raises(TypeError):
+        AND(P)
+    with pytest.raises(TypeError):
+        AND(P, Q, P)
+    with pytest.raises(TypeError):
+        NEG(P, other=Q)
+    with pytest.raises(TypeError):
+        AND(P, "Q")
+
+
+def test_nodes_are_immutable():
+    formula = AND(P, Q)
+    with pytest.raises(FrozenInstanceError):
+        formula.left = Q
+    with pytest.raises(FrozenInstanceError):
+        del formula.right
+    with pytest.raises(AttributeError):
+        formula.__dict__
+
+
+def test_copy_and_pickle_keep_identity():
+    formula = OR(NEG(P), IMPLIES(Q, BOTTOM()))
+    assert copy.copy(formula) is formula
+    assert copy.deepcopy([formula])[0] is formula
+    assert pickle.loads(pickle.dumps(formula)) is formula
+
+
+def test_unused_formulas_leave_the_table():
+    gc.collect()
+    before = formula_table_size()
+    formula = AND(VAR("unused_1"), NEG(VAR("unused_2")))
+    assert formula_table_size() == before + 4
+    ref = weakref.ref(formula)
+    del formula
+    gc.collect()
+    assert ref() is None
+    assert formula_table_size() == before
+
+
+def test_concurrent_construction_interns_once():
+    results = []
+    barrier = threading.Barrier(8)
+
+    def build():
+        barrier.wait()
+        results.append([AND(VAR(f"T{i}"), VAR(f"U{i}")) for i in range(500)])
+
+    threads = [threading.Thread(target=build) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    first = results[0]
+    assert all(all(a is b for a, b in zip(first, other)) for other in results[1:])
+
+
+# --- Parser ---
+R = VAR("R")
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("P", P),
+    ("⊥", BOTTOM()),
+    ("¬P", NEG(P)),
+    ("~P", NEG(P)),
+    ("P ∧ Q ∨ R", OR(AND(P, Q), R)),
+    ("P & Q | R", OR(AND(P, Q), R)),
+    ("P → Q → R", IMPLIES(P, IMPLIES(Q, R))),
+    ("P -> Q => R", IMPLIES(P, IMPLIES(Q, R))),
+    ("P ∧ Q ∧ R", AND(AND(P, Q), R)),
+    ("¬P ∧ Q", AND(NEG(P), Q)),
+    ("¬(P → ⊥)", NEG(IMPLIES(P, BOTTOM()))),
+    ('IMPLIES(VAR("P"), VAR("Q"))', IMPLIES(P, Q)),
+    ('AND(P → Q, NEG(BOTTOM()))', AND(IMPLIES(P, Q), NEG(BOTTOM()))),
+])
+def test_parse(text, expected):
+    assert parse_formula(text) is expected
+
+
+@pytest.mark.parametrize("text", ["", "P ∧", "(P", "P)", "P Q", "→ P", 'AND(VAR("P"))', "P $ Q", "NEG(P, Q)"])
+def test_parse_rejects_malformed_input(text):
+    with pytest.raises(ValueError):
+        parse_formula(text)
+
+
+def test_parse_sequent():
+    assert parse_sequent("P → Q, P ⊢ Q") == ([IMPLIES(P, Q), P], Q)
+    assert parse_sequent("|- P ∨ ¬P") == ([], OR(P, NEG(P)))
+
+
+def test_parse_deep_formulas_without_recursion():
+    n = 20_000
+    names = [f"A{i}" for i in range(n)]
+    conjunction = parse_formula(" ∧ ".join(names))
+    implication = parse_formula(" → ".join(names))
+    negation = parse_formula("¬" * n + "P")
+    nested = parse_formula("(" * n + "P" + ")" * n)
+    assert type(conjunction) is AND and conjunction.right is VAR(names[-1])
+    assert type(implication) is IMPLIES and implication.premise is VAR(names[0])
+    assert nested is P
+    for _ in range(n):
+        negation = negation.prop
+    assert negation is P
+
+
+def test_round_trip(random_formulas):
+    for formula in random_formulas(500, depth=6):
+        assert parse_formula(pretty_print(formula)) is formula
+
+
+def test_parse_many(tmp_path):
+    lines = ["P ∧ Q", "", "# comentario", "¬R"]
+    assert list(parse_many(lines)) == [AND(P, Q), NEG(R)]
+    path = tmp_path / "formulas.txt"
+    path.write_text("\n".join(lines), encoding="utf-8")
+    assert list(parse_many(str(path))) == [AND(P, Q), NEG(R)]
+    with pytest.raises(ValueError, match="line 2"):
+        list(parse_many(["P", "P ∧"]))
+
+
+# --- Pretty printing ---
+def test_pretty_print_output():
+    formula = IMPLIES(AND(P, NEG(Q)), OR(BOTTOM(), R))
+    assert pretty_print(formula) == "((P ∧ ¬(Q)) → (⊥ ∨ R))"
+    assert pretty_print(formula, minimal=True) == "P ∧ ¬Q → ⊥ ∨ R"
+    assert pretty_print(IMPLIES(IMPLIES(P, Q), R), minimal=True) == "(P → Q) → R"
+    assert pretty_print(AND(P, AND(Q, R)), minimal=True) == "P ∧ (Q ∧ R)"
+
+
+def test_minimal_round_trip(random_formulas):
+    for formula in random_formulas(500, depth=6):
+        assert parse_formula(pretty_print(formula, minimal=True)) is formula
+
+
+@pytest.mark.parametrize("family", [deep_and, deep_or, right_implications])
+@pytest.mark.parametrize("minimal", [False, True])
+def test_round_trip_deep(family, minimal):
+    formula = family(20_000)
+    assert parse_formula(pretty_print(formula, minimal)) is formula
+
+
+def test_round_trip_deep_negations():
+    formula = P
+    for _ in range(20_000):
+        formula = NEG(formula)
+    assert parse_formula(pretty_print(formula)) is formula
+    assert parse_formula(pretty_print(formula, minimal=True)) is formula
+
+
+def test_write_formula_matches_pretty_print(random_formulas):
+    for formula in random_formulas(50, depth=6) + [deep_or(5_000)]:
+        for minimal in (False, True):
+            sink = io.StringIO()
+            write_formula(formula, sink, minimal, chunk_size=64)
+            assert sink.getvalue() == pretty_print(formula, minimal)
+
+
+def test_printing_caches_subformulas():
+    clear_render_cache()
+    inner = OR(NEG(P), VAR("cached_sub"))
+    formula = IMPLIES(AND(P, inner), inner)
+    assert pretty_print(formula) == "((P ∧ (¬(P) ∨ cached_sub)) → (¬(P) ∨ cached_sub))"
+    assert formulas._render_cache[(id(inner), False)][1] == "(¬(P) ∨ cached_sub)"
+    assert pretty_print(inner) == "(¬(P) ∨ cached_sub)"
+    assert pretty_print(inner, minimal=True) == "¬P ∨ cached_sub"
+
+
+def test_printed_formulas_leave_the_table():
+    clear_render_cache()
+    gc.collect()
+    before = formula_table_size()
+    formula = AND(VAR("printed_1"), NEG(VAR("printed_2")))
+    pretty_print(formula)
+    pretty_print(formula, minimal=True)
+    ref = weakref.ref(formula)
+    del formula
+    gc.collect()
+    assert ref() is None
+    assert formula_table_size() == before
+
+
+def test_render_cache_is_capped_by_characters(monkeypatch):
+    clear_render_cache()
+    monkeypatch.setattr(formulas, "_RENDER_CACHE_CHARS", 1_000)
+    kept = [AND(deep_and(50), VAR(f"cap{i}")) for i in range(20)]
+    for formula in kept:
+        assert parse_formula(pretty_print(formula)) is formula
+        assert 0 < formulas._render_cache_chars <= 1_000
+    assert formulas._render_cache_chars == sum(len(text) for _, text in formulas._render_cache.values())
+    clear_render_cache()
+    assert formulas._render_cache_chars == 0
+    assert not formulas._render_cache
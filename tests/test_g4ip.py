@@ -0,0 +1,82 @@
+import pytest
+
+from naturaldeduction.bench import de_bruijn
+from naturaldeduction.g4ip import IntuitionisticDecider, is_intuitionistically_valid
+from naturaldeduction.parser import parse_formula, parse_sequent
+from naturaldeduction.prover import Prover
+from naturaldeduction.truth_table import is_classically_valid
+
+INTUITIONISTIC = [
+    "A → A",
+    "A → ¬¬A",
+    "¬¬¬A → ¬A",
+    "¬¬(A ∨ ¬A)",
+    "(A → B) → (¬B → ¬A)",
+    "(A ∧ B → C) → (A → B → C)",
+    "(A ∨ B) ∧ ¬A → B",
+    "¬(A ∨ B) → ¬A ∧ ¬B",
+    "((A → B) → C) → (B → C)",
+    "⊥ → A",
+]
+
+CLASSICAL_ONLY = [
+    "A ∨ ¬A",
+    "¬¬A → A",
+    "((A → B) → A) → A",
+    "(¬B → ¬A) → (A → B)",
+    "¬(A ∧ B) → ¬A ∨ ¬B",
+    "(A → B) ∨ (B → A)",
+]
+
+INVALID = ["A", "A → B", "A ∨ B → A", "¬A → A", "(A → B) → A"]
+
+
+@pytest.mark.parametrize("text", INTUITIONISTIC)
+def test_intuitionistic_theorems(text):
+    assert is_intuitionistically_valid([], parse_formula(text))
+
+
+@pytest.mark.parametrize("text", CLASSICAL_ONLY)
+def test_classical_only_theorems(text):
+    formula = parse_formula(text)
+    assert is_classically_valid([], formula)
+    assert not is_intuitionistically_valid([], formula)
+
+
+@pytest.mark.parametrize("text", INVALID)
+def test_non_theorems(text):
+    assert not is_intuitionistically_valid([], parse_formula(text))
+
+
+@pytest.mark.parametrize("sequent, valid", [
+    ("A → B, B → C, A ⊢ C", True),
+    ("A ∨ B, ¬A ⊢ B", True),
+    ("¬¬A ⊢ A", False),
+    ("¬A → B, ¬B ⊢ A", False),
+    ("⊥ ∧ A ⊢ C", True),
+])
+def test_sequents(sequent, valid):
+    assert is_intuitionistically_valid(*parse_sequent(sequent)) is valid
+
+
+def test_de_bruijn():
+    assert is_intuitionistically_valid([], de_bruijn(2))
+
+
+def test_decider_reuse():
+    decider = IntuitionisticDecider()
+    for text in INTUITIONISTIC:
+        assert decider.is_provable([], parse_formula(text))
+    for text in CLASSICAL_ONLY:
+        assert not decider.is_provable([], parse_formula(text))
+
+
+def test_consistent_with_classical_logic_and_the_prover(random_formulas):
+    prover = Prover(clasico=False, tiempo_max=None, max_nodos=20_000)
+    for formula in random_formulas(200, depth=4, seed=3):
+        valid = is_intuitionistically_valid([], formula)
+        if valid:
+            assert is_classically_valid([], formula)
+        # Lo que el prover intuicionista encuentra tiene que ser válido para G4ip
+        if prover.prove([], formula) is not None:
+            assert valid
@@ -0,0 +1,123 @@
+import pytest
+
+from naturaldeduction.bench import right_implications
+from naturaldeduction.contexto import Contexto
+from naturaldeduction.formulas import IMPLIES, VAR
+from naturaldeduction.normalize import (LemmaCache, dag_size, normalize, normalize_resolver, proof_tree,
+                                        tree_size, uses_classical_rules)
+from naturaldeduction.parser import parse_sequent
+from naturaldeduction.proof_script import check, to_script
+from naturaldeduction.prover import Prover, build_resolver
+from naturaldeduction.resolver import Resolver
+from naturaldeduction.rules import LogicMode, LogicRules as R
+
+SEQUENTS = [
+    "P → Q, P ⊢ Q",
+    "P ∨ Q ⊢ Q ∨ P",
+    "P → Q, Q → R ⊢ P → R",
+    "P ∨ Q, ¬P ⊢ Q",
+    "⊢ ¬(P ∨ Q) → ¬P ∧ ¬Q",
+    "⊢ (P → Q → R) → (P ∧ Q → R)",
+]
+
+# Desvíos que se pueden poner sobre cualquier prueba `t` de la meta `g`: una
+# introducción seguida de la eliminación que la deshace
+DETOURS = {
+    'and1': lambda t, g: (R.AND_ELIMINATION_1, (g,), ((R.AND_INTRODUCTION, (), (t, t)),)),
+    'and2': lambda t, g: (R.AND_ELIMINATION_2, (g,), ((R.AND_INTRODUCTION, (), (t, t)),)),
+    'implies': lambda t, g: (R.IMPLICATION_ELIMINATION, (g,), (t, (R.IMPLICATION_INTRODUCTION, (), (t,)))),
+    'or': lambda t, g: (R.OR_ELIMINATION, (g, g), ((R.OR_INTRODUCTION_2, (), (t,)), t, t)),
+}
+
+
+def _search(sequent, clasico=True):
+    contexto, resolvente = parse_sequent(sequent)
+    return contexto, resolvente, Prover(clasico=clasico).search(Contexto(contexto), resolvente)
+
+
+@pytest.mark.parametrize("sequent", SEQUENTS)
+@pytest.mark.parametrize("detour", sorted(DETOURS))
+def test_normalize_removes_detours(sequent, detour):
+    contexto, resolvente, clean = _search(sequent)
+    wrapped = clean
+    for _ in range(3):
+        wrapped = DETOURS[detour](wrapped, resolvente)
+    assert build_resolver(contexto, resolvente, wrapped).isProofComplete()
+    normal = normalize(contexto, resolvente, wrapped)
+    assert build_resolver(contexto, resolvente, normal).isProofComplete()
+    assert tree_size(normal) <= tree_size(clean)
+
+
+@pytest.mark.parametrize("sequent", SEQUENTS)
+def test_normalize_keeps_intuitionistic_proofs_intuitionistic(sequent):
+    contexto, resolvente, clean = _search(sequent, clasico=False)
+    wrapped = DETOURS['implies'](DETOURS['or'](clean, resolvente), resolvente)
+    normal = normalize(contexto, resolvente, wrapped)
+    assert not uses_classical_rules(normal)
+    resolver = build_resolver(contexto, resolvente, normal, LogicMode.INTUITIONISTIC)
+    assert check(to_script(resolver), LogicMode.INTUITIONISTIC)
+
+
+def test_normalize_double_negation_detour():
+    contexto, resolvente, clean = _search("P ∧ Q ⊢ Q ∧ P")
+    wrapped = (R.NEGATION_NEGATION_ELIMINATION, (), ((R.NEGATION_NEGATION_INTRODUCTION, (), (clean,)),))
+    normal = normalize(contexto, resolvente, wrapped)
+    assert not uses_classical_rules(normal)
+    assert tree_size(normal) == tree_size(clean)
+
+
+def test_normalize_shared_subproofs():
+    # Cada →I va dentro de un desvío ∧E1/∧I con las dos premisas compartidas: 2^n pasos
+    # como árbol, 3n nodos como DAG
+    n = 200
+    resolvente = right_implications(n)
+    contexto = [VAR(f"A{n - 1}")]
+    metas = []
+    goal = resolvente
+    while type(goal) is IMPLIES:
+        metas.append(goal)
+        goal = goal.conclusion
+    proof = (R.AXIOM, (), ())
+    for meta in reversed(metas):
+        proof = (R.IMPLICATION_INTRODUCTION, (), (proof,))
+        proof = (R.AND_ELIMINATION_1, (meta,), ((R.AND_INTRODUCTION, (), (proof, proof)),))
+    assert dag_size(proof) == 3 * (n - 1) + 1
+    normal = normalize(contexto, resolvente, proof)
+    assert tree_size(normal) == n
+    assert build_resolver(contexto, resolvente, normal).isProofComplete()
+
+
+def test_normalize_resolver():
+    contexto, resolvente, clean = _search("P ∨ Q ⊢ Q ∨ P")
+    resolver = build_resolver(contexto, resolvente, DETOURS['and1'](clean, resolvente))
+    normal = normalize_resolver(resolver)
+    assert normal.isProofComplete() and len(normal.pasos) == tree_size(clean)
+    assert proof_tree(normal) == normalize(contexto, resolvente, proof_tree(resolver))
+    unfinished = Resolver(contexto, resolvente)
+    assert unfinished.aplicarRegla(0, R.OR_ELIMINATION, contexto[0].left, contexto[0].right)
+    with pytest.raises(ValueError):
+        normalize_resolver(unfinished)
+
+
+def test_lemma_cache(tmp_path):
+    path = str(tmp_path / "lemmas.jsonl")
+    contexto, resolvente, proof = _search("P ∨ Q ⊢ Q ∨ P")
+    with LemmaCache(path) as cache:
+        cache.add(contexto, resolvente, DETOURS['and2'](proof, resolvente))
+        assert len(cache) == 1
+        classical = _search("⊢ ((P → Q) → P) → P")
+        cache.add([], classical[1], classical[2])
+
+    with LemmaCache(path) as cache:
+        assert len(cache) == 2
+        # Un lema también prueba la misma meta con más asunciones
+        larger = contexto + [VAR("R")]
+        lemma = cache.lookup(larger, resolvente)
+        assert lemma is not None and tree_size(lemma) == tree_size(proof)
+        assert build_resolver(larger, resolvente, lemma).isProofComplete()
+        assert cache.lookup([], resolvente) is None
+        assert cache.lookup([], classical[1]) is not None
+        assert cache.lookup([], classical[1], clasico=False) is None
+
+        resolver = Prover(lemas=cache).prove(larger, resolvente)
+        assert resolver.isProofComplete() and cache.hits
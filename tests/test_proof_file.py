@@ -0,0 +1,75 @@
+import pytest
+
+from naturaldeduction.formulas import VAR
+from naturaldeduction.parser import parse_sequent
+from naturaldeduction.proof_file import load, save
+from naturaldeduction.proof_script import to_script
+from naturaldeduction.prover import Prover
+from naturaldeduction.resolver import Resolver
+from naturaldeduction.rules import LogicMode, LogicRules
+
+SEQUENTS = ["P ∨ Q ⊢ Q ∨ P", "P → Q, Q → R ⊢ P → R", "⊢ ((P → Q) → P) → P", "⊢ ¬(P ∨ Q) → ¬P ∧ ¬Q"]
+
+
+def _steps(proof):
+    return [(paso.toString(), padre, regla) for paso, padre, regla in proof]
+
+
+@pytest.fixture
+def resolvers():
+    proved = [Prover().prove(*parse_sequent(sequent)) for sequent in SEQUENTS]
+    open_proof = Resolver(*parse_sequent("P ∧ Q ⊢ Q ∧ P"), modo=LogicMode.INTUITIONISTIC)
+    open_proof.aplicarRegla(0, LogicRules.AND_INTRODUCTION)
+    return proved + [open_proof]
+
+
+def test_save_and_load(tmp_path, resolvers):
+    path = tmp_path / "proofs.ndp"
+    names = [f"proof{i}" for i in range(len(resolvers))]
+    save(path, resolvers, names)
+    with load(path) as library:
+        assert len(library) == len(resolvers)
+        for stored, resolver, name in zip(library, resolvers, names):
+            assert stored.name == name
+            assert stored.modo is resolver.modo
+            assert _steps(stored) == _steps(resolver.lista_de_pasos)
+            assert stored.isProofComplete() == resolver.isProofComplete()
+            for idx in range(len(stored)):
+                assert stored.resolvente(idx) is resolver.pasos.resolvente(idx)
+                assert list(stored.hijos(idx)) == list(resolver.pasos.hijos(idx))
+        assert library.find("proof1") is library[1]
+        assert library.find("missing") is None
+
+
+def test_loaded_proofs_can_be_continued(tmp_path, resolvers):
+    path = tmp_path / "proofs.ndp"
+    save(path, resolvers)
+    with load(path) as library:
+        assert library[0].name is None
+        complete = library[0].to_resolver()
+        assert complete.isProofComplete() and to_script(complete) == to_script(resolvers[0])
+        unfinished = library[len(resolvers) - 1].to_resolver()
+    assert sorted(unfinished.pasos_a_resolver) == [1, 2]
+    # P ∧ Q ⊢ Q por ∧E2 y P ∧ Q ⊢ P por ∧E1; después sólo quedan axiomas
+    assert unfinished.aplicarRegla(1, LogicRules.AND_ELIMINATION_2, VAR("P"))
+    assert unfinished.aplicarRegla(2, LogicRules.AND_ELIMINATION_1, VAR("Q"))
+    for idx in sorted(unfinished.pasos_a_resolver):
+        assert unfinished.aplicarRegla(idx, LogicRules.AXIOM)
+    assert unfinished.isProofComplete()
+
+
+def test_single_resolver_and_name_mismatch(tmp_path, resolvers):
+    path = tmp_path / "one.ndp"
+    save(path, resolvers[0])
+    with load(path) as library:
+        assert len(library) == 1
+    with pytest.raises(ValueError):
+        save(path, resolvers, ["only one name"])
+
+
+@pytest.mark.parametrize("content", [b"", b"short", b"NOTAPROOFLIBRARY" * 8])
+def test_rejects_other_files(tmp_path, content):
+    path = tmp_path / "bad.ndp"
+    path.write_bytes(content)
+    with pytest.raises(ValueError):
+        load(path)
@@ -0,0 +1,115 @@
+import pytest
+
+from naturaldeduction.bench import pigeonhole
+from naturaldeduction.contexto import Contexto
+from naturaldeduction.formulas import AND, BOTTOM, IMPLIES, OR, VAR
+from naturaldeduction.g4ip import is_intuitionistically_valid
+from naturaldeduction.parser import parse_sequent
+from naturaldeduction import proof_script
+from naturaldeduction.proof_script import check, replay, to_script
+from naturaldeduction.prover import ProofSearchTimeout, Prover, build_resolver
+from naturaldeduction.rules import LogicMode, LogicRules
+
+A, C = VAR("A"), VAR("C")
+
+
+@pytest.mark.parametrize("contexto, resolvente", [
+    ([AND(BOTTOM(), BOTTOM())], C),
+    ([], IMPLIES(AND(BOTTOM(), IMPLIES(A, A)), A)),
+    ([AND(BOTTOM(), AND(A, A))], C),
+])
+def test_bottom_reachable_through_conjunctions(contexto, resolvente):
+    # ⊥ sólo se alcanza proyectando conjunciones: ⊥E tiene que intentarse igual
+    assert is_intuitionistically_valid(contexto, resolvente)
+    resolver = Prover(clasico=False).prove(contexto, resolvente)
+    assert resolver is not None and resolver.isProofComplete()
+
+SEQUENTS = [
+    "P → Q, P ⊢ Q",
+    "P ∨ Q ⊢ Q ∨ P",
+    "P ∧ Q ⊢ Q ∧ P",
+    "P → Q, Q → R ⊢ P → R",
+    "¬Q, P → Q ⊢ ¬P",
+    "P ∨ Q, ¬P ⊢ Q",
+    "⊢ (P → Q → R) → (P ∧ Q → R)",
+    "⊢ ¬(P ∨ Q) → ¬P ∧ ¬Q",
+    "⊢ P → ¬¬P",
+]
+CLASSICAL_SEQUENTS = [
+    "⊢ P ∨ ¬P",
+    "¬¬P ⊢ P",
+    "⊢ ((P → Q) → P) → P",
+    "¬(P ∧ Q) ⊢ ¬P ∨ ¬Q",
+]
+
+
+@pytest.mark.parametrize("sequent", SEQUENTS + CLASSICAL_SEQUENTS)
+def test_proofs_replay_through_scripts(sequent):
+    contexto, resolvente = parse_sequent(sequent)
+    resolver = Prover().prove(contexto, resolvente)
+    assert resolver is not None and resolver.isProofComplete()
+    script = to_script(resolver)
+    replayed = replay(script)
+    assert replayed.isProofComplete()
+    assert list(replayed.lista_de_pasos[0][0].contexto) == list(resolver.lista_de_pasos[0][0].contexto)
+    assert replayed.lista_de_pasos[0][0].resolvente is resolvente
+    assert to_script(replayed) == script
+
+
+@pytest.mark.parametrize("regla, resolvente, testigos", [
+    (LogicRules.AND_ELIMINATION_1, AND(A, C), (C,)),
+    (LogicRules.AND_ELIMINATION_2, AND(A, C), (A,)),
+    (LogicRules.OR_ELIMINATION, OR(A, C), (A, C)),
+    (LogicRules.IMPLICATION_ELIMINATION, A, (A,)),
+    (LogicRules.NEGATION_ELIMINATION, A, (A,)),
+    (LogicRules.AXIOM, A, ()),
+])
+def test_witnesses_are_recovered_from_the_first_child(regla, resolvente, testigos):
+    # Importada como atributo: pytest tomaría `testigos_for` por un test
+    assert proof_script.testigos_for(regla, resolvente) == testigos
+
+
+@pytest.mark.parametrize("sequent", SEQUENTS)
+def test_intuitionistic_proofs_replay_without_classical_rules(sequent):
+    resolver = Prover(clasico=False).prove(*parse_sequent(sequent))
+    assert resolver is not None
+    assert check(to_script(resolver), LogicMode.INTUITIONISTIC)
+
+
+@pytest.mark.parametrize("sequent", CLASSICAL_SEQUENTS)
+def test_classical_sequents_have_no_intuitionistic_proof(sequent):
+    assert Prover(clasico=False).prove(*parse_sequent(sequent)) is None
+
+
+@pytest.mark.parametrize("sequent", ["P ⊢ Q", "P ∨ Q ⊢ P", "⊢ P → ¬P"])
+def test_invalid_sequents_are_not_proved(sequent):
+    assert Prover(tiempo_max=None).prove(*parse_sequent(sequent)) is None
+
+
+@pytest.mark.parametrize("sequent", ["P ⊢ Q", "P ∨ Q ⊢ P"])
+def test_countermodels_stop_the_search(sequent):
+    prover = Prover(poda_semantica=True)
+    assert prover.prove(*parse_sequent(sequent)) is None and prover.nodos == 0
+    prover = Prover(poda_semantica=False)
+    assert prover.prove(*parse_sequent(sequent)) is None and prover.nodos > 0
+
+
+def test_large_countermodels_come_from_sat():
+    # Más variables que las que se filtran con tablas de verdad
+    prover = Prover()
+    assert prover.prove([VAR(f"A{i}") for i in range(20)], VAR("Q")) is None
+    assert prover.nodos == 0
+
+
+def test_search_budget():
+    contexto, resolvente = pigeonhole(4)
+    with pytest.raises(ProofSearchTimeout):
+        Prover(max_nodos=50).prove(contexto, resolvente)
+
+
+def test_build_resolver_replays_search_trees():
+    contexto, resolvente = parse_sequent("P ∨ Q, P → R, Q → R ⊢ R")
+    tree = Prover().search(Contexto(contexto), resolvente)
+    resolver = build_resolver(contexto, resolvente, tree)
+    assert resolver.isProofComplete()
+    assert not check("P ⊢ Q\n0 Axiom\n")
@@ -0,0 +1,127 @@
+import pytest
+
+import naturaldeduction.resolver as resolver_module
+from naturaldeduction.formulas import AND, IMPLIES, VAR
+from naturaldeduction.resolver import ProofRenderer, Resolver
+from naturaldeduction.rules import LogicRules
+
+
+def _goal(n):
+    # (A0 → A0 ∧ A0) ∧ ... : ∧I abre ramas, →I las alarga
+    formula = None
+    for i in range(n):
+        a = VAR(f"A{i}")
+        branch = IMPLIES(a, AND(a, a))
+        formula = branch if formula is None else AND(formula, branch)
+    return formula
+
+
+def _next_rule(resolver, idx):
+    paso = resolver.pasos.paso(idx)
+    if paso.isInTheContext(paso.resolvente):
+        return LogicRules.AXIOM
+    if type(paso.resolvente) is AND:
+        return LogicRules.AND_INTRODUCTION
+    return LogicRules.IMPLICATION_INTRODUCTION
+
+
+@pytest.mark.parametrize("view", ProofRenderer.VIEWS)
+def test_views_follow_applications_and_undos(view):
+    resolver = Resolver([], _goal(4))
+    renderer = resolver.renderer
+    renderer.render(view)
+
+    def check():
+        expected = ProofRenderer(resolver).render(view)
+        assert renderer.render(view) == expected
+        for start in range(0, len(expected), 3):
+            assert renderer.render(view, start, start + 4) == expected[start:start + 4]
+
+    while resolver.pasos_a_resolver:
+        idx = min(resolver.pasos_a_resolver)
+        assert resolver.aplicarRegla(idx, _next_rule(resolver, idx))
+        check()
+    for _ in range(5):
+        resolver.undo()
+        check()
+
+
+@pytest.mark.parametrize("block", [1, 2, 256])
+def test_tree_view_follows_applications_and_undos(monkeypatch, block):
+    monkeypatch.setattr(resolver_module, '_TREE_BLOCK', block)
+    resolver = Resolver([], _goal(6))
+    renderer = resolver.renderer
+    renderer.render('tree')
+
+    def check():
+        expected = ProofRenderer(resolver).tree()
+        assert renderer.render('tree') == expected
+        for start in range(0, len(expected), 3):
+            assert renderer.render('tree', start, start + 4) == expected[start:start + 4]
+        assert renderer.render('tree', -3) == expected[-3:]
+
+    while resolver.pasos_a_resolver:
+        idx = min(resolver.pasos_a_resolver)
+        assert resolver.aplicarRegla(idx, _next_rule(resolver, idx))
+        check()
+    for _ in range(5):
+        resolver.undo()
+        check()
+    assert resolver.isProofComplete() is False
+
+
+def _snapshot(resolver):
+    return (ProofRenderer(resolver).flat(), sorted(resolver.pasos_a_resolver), len(resolver.pasos))
+
+
+def _prove_step_by_step(resolver):
+    while resolver.pasos_a_resolver:
+        idx = min(resolver.pasos_a_resolver)
+        assert resolver.aplicarRegla(idx, _next_rule(resolver, idx))
+        yield idx
+
+
+def test_undo_restores_every_previous_state():
+    resolver = Resolver([], _goal(3))
+    states = [_snapshot(resolver)]
+    for _ in _prove_step_by_step(resolver):
+        states.append(_snapshot(resolver))
+    assert resolver.isProofComplete()
+    for state in reversed(states[:-1]):
+        assert resolver.undo()
+        assert _snapshot(resolver) == state
+    assert not resolver.undo()
+
+
+def test_rollback_to_checkpoints():
+    resolver = Resolver([], _goal(4))
+    checkpoints = [(resolver.checkpoint(), _snapshot(resolver))]
+    for i, _ in enumerate(_prove_step_by_step(resolver)):
+        if i % 3 == 0:
+            checkpoints.append((resolver.checkpoint(), _snapshot(resolver)))
+    for token, state in reversed(checkpoints):
+        resolver.rollback(token)
+        assert _snapshot(resolver) == state
+
+
+def test_rollback_rejects_abandoned_branches():
+    resolver = Resolver([], _goal(2))
+    start = resolver.checkpoint()
+    resolver.aplicarRegla(0, LogicRules.AND_INTRODUCTION)
+    branch = resolver.checkpoint()
+    resolver.rollback(start)
+    resolver.aplicarRegla(0, LogicRules.AND_INTRODUCTION)
+    # Mismo largo de historial, pero de otra rama
+    with pytest.raises(ValueError):
+        resolver.rollback(branch)
+    resolver.rollback(start)
+    assert _snapshot(resolver) == _snapshot(Resolver([], _goal(2)))
+
+
+def test_failed_applications_leave_no_history():
+    resolver = Resolver([VAR("P")], VAR("Q"))
+    before = _snapshot(resolver)
+    assert not resolver.aplicarRegla(0, LogicRules.AXIOM)
+    assert not resolver.aplicarRegla(0, LogicRules.AND_INTRODUCTION)
+    assert _snapshot(resolver) == before
+    assert not resolver.undo()
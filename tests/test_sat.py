@@ -0,0 +1,33 @@
+from naturaldeduction import sat, truth_table
+from naturaldeduction.bench import pigeonhole
+from naturaldeduction.formulas import IMPLIES, VAR
+
+
+def test_sat_and_truth_tables_agree(random_formulas, assert_countermodel):
+    formulas = random_formulas(600, depth=4, atoms="PQRS", seed=1)
+    for i in range(0, len(formulas), 3):
+        *contexto, resolvente = formulas[i:i + 3]
+        by_sat = sat.find_countermodel(contexto, resolvente)
+        by_table = truth_table.find_countermodel(contexto, resolvente)
+        assert (by_sat is None) == (by_table is None)
+        if by_sat is not None:
+            assert_countermodel(contexto, resolvente, by_sat)
+
+
+def test_pigeonhole_is_inconsistent():
+    contexto, bottom = pigeonhole(4)
+    assert sat.entails(contexto, bottom)
+    assert not sat.entails(contexto[1:], bottom)
+
+
+def test_entailment_checker_is_incremental(assert_countermodel):
+    p, q, r = VAR("P"), VAR("Q"), VAR("R")
+    checker = sat.EntailmentChecker()
+    checker.assume(IMPLIES(p, q))
+    assert not checker.entails(q)
+    assert checker.entails(q, extra=[p])
+    # Lo asumido en `extra` no queda en el checker
+    assert not checker.entails(q)
+    checker.assume(p)
+    assert checker.entails(q) and not checker.entails(r)
+    assert_countermodel([IMPLIES(p, q), p], r, checker.countermodel(r))
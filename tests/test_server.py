@@ -0,0 +1,85 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from naturaldeduction.server import ProofServer, SessionStore
+
+
+@pytest.fixture
+def server():
+    with ThreadPoolExecutor(1) as executor:
+        yield ProofServer(SessionStore(), executor, timeout=5.0)
+
+
+def handle(server, request):
+    return asyncio.run(server.handle(request))
+
+
+def test_session_round_trip(server):
+    created = handle(server, {"id": 1, "op": "create", "contexto": ["P", "Q"], "resolvente": "P ∧ Q"})
+    assert created["ok"] and created["open"] == [0]
+    session = created["session"]
+    applied = handle(server, {"op": "apply", "session": session, "step": 0, "rule": "∧I"})
+    assert applied["applied"] and applied["open"] == [1, 2]
+    for step in (1, 2):
+        handle(server, {"op": "apply", "session": session, "step": step, "rule": "Axiom"})
+    assert handle(server, {"op": "open", "session": session})["complete"]
+    assert handle(server, {"op": "undo", "session": session})["open"] == [2]
+
+
+@pytest.mark.parametrize("request_", [
+    {"op": "create", "contexto": [1], "resolvente": "P"},
+    {"op": "create", "contexto": "P", "resolvente": "P"},
+    {"op": "create", "resolvente": 3},
+    {"op": "create"},
+    {"op": "valid", "contexto": [1], "resolvente": "P"},
+    {"op": "prove", "resolvente": ["P"]},
+])
+def test_malformed_formulas_get_an_error_reply(server, request_):
+    response = handle(server, {"id": "x", **request_})
+    assert response["id"] == "x" and not response["ok"]
+
+
+@pytest.mark.parametrize("step", ["x", None, -1, 7, 1.5, True, False])
+def test_apply_validates_the_step(server, step):
+    session = handle(server, {"op": "create", "resolvente": "P → P"})["session"]
+    response = handle(server, {"op": "apply", "session": session, "step": step, "rule": "→I"})
+    assert response == {"id": None, "ok": False, "error": f"invalid step {step!r}"}
+
+
+def test_prove_and_valid(server):
+    proved = handle(server, {"op": "prove", "contexto": ["P ∨ Q"], "resolvente": "Q ∨ P"})
+    assert proved["status"] == "proved"
+    valid = handle(server, {"op": "valid", "resolvente": "P ∨ ¬P"})
+    assert valid["classical"] and not valid["intuitionistic"]
+
+
+def test_bad_request_keeps_the_connection_open(server):
+    async def exchange():
+        reader = asyncio.StreamReader()
+        reader.feed_data(b'{"id": 1, "op": "create", "contexto": [1], "resolvente": "P"}\n')
+        reader.feed_data(b'{"id": 2, "op": "valid", "contexto": [1], "resolvente": "P"}\n')
+        reader.feed_data(b'{"id": 3, "op": "stats"}\n')
+        reader.feed_eof()
+        writer = _Writer()
+        await server.serve_connection(reader, writer)
+        return [json.loads(line) for line in writer.data.decode().splitlines()]
+
+    responses = {response["id"]: response for response in asyncio.run(exchange())}
+    assert not responses[1]["ok"] and not responses[2]["ok"] and responses[3]["ok"]
+
+
+class _Writer:
+    def __init__(self):
+        self.data = b""
+
+    def write(self, data: bytes) -> None:
+        self.data += data
+
+    async def drain(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
@@ -0,0 +1,39 @@
+from itertools import product
+
+import pytest
+
+from naturaldeduction import truth_table
+from naturaldeduction.formulas import IMPLIES, NEG, OR, VAR
+
+
+def test_matches_enumeration(random_formulas, holds, assert_countermodel):
+    formulas = random_formulas(300, depth=4, atoms="PQRS", seed=1)
+    models = [dict(zip("PQRS", values)) for values in product((False, True), repeat=4)]
+    for i in range(0, len(formulas), 3):
+        *contexto, resolvente = formulas[i:i + 3]
+        valid = all(holds(resolvente, m) for m in models if all(holds(f, m) for f in contexto))
+        model = truth_table.find_countermodel(contexto, resolvente)
+        assert (model is None) == valid
+        if model is not None:
+            assert_countermodel(contexto, resolvente, model)
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_backends_agree(random_formulas, assert_countermodel, use_numpy):
+    if use_numpy and truth_table._numpy() is None:
+        pytest.skip("NumPy is not installed")
+    # Más variables que una palabra de 64 asignaciones, para pasar por los bloques
+    for formula in random_formulas(40, depth=6, atoms="ABCDEFGHIJKLMN", seed=2):
+        program = truth_table.compile_formulas([formula])
+        model = truth_table.evaluate(program, use_numpy)
+        assert (model is None) == (truth_table.evaluate(program, not use_numpy) is None)
+        if model is not None:
+            assert_countermodel([], formula, model)
+
+
+def test_tautologies():
+    p = VAR("P")
+    assert truth_table.check_validity(OR(p, NEG(p))) == (True, None)
+    valid, model = truth_table.check_validity(IMPLIES(p, NEG(p)))
+    assert not valid and model == {"P": True}
+    assert truth_table.is_classically_valid([IMPLIES(p, VAR("Q")), p], VAR("Q"))